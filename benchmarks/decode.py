@@ -0,0 +1,101 @@
+"""Measure the CPU time spent decoding one poll, without any network.
+
+Records the response datagrams and the raw values of a steady-state poll of
+a simulated printer, then times decoding them over and over: the BER
+messages alone, and the post-processing of ``async_update`` that turns raw
+values into a ``PrinterState``.
+
+    python benchmarks/decode.py --model dell-c1760nw --repeat 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+
+from dell_printer_snmp import DellPrinterSnmp, ber
+from dell_printer_snmp.simulator import PrinterSimulator, available_walks
+
+HOST = "127.0.0.1"
+
+
+async def record(model: str) -> tuple[list[bytes], Any, DellPrinterSnmp]:
+    """Poll a simulated printer, return its responses, raw data and printer."""
+    simulator = PrinterSimulator.from_model(model)
+    port = await simulator.async_start(HOST)
+    printer = DellPrinterSnmp(HOST, port, fast_path=True)
+    # the first poll learns the profile, the second one is a steady state
+    await printer.async_update()
+
+    responses: list[bytes] = []
+    respond = simulator.respond
+
+    def recording_respond(request: ber.Response) -> bytes | None:
+        if (response := respond(request)) is not None:
+            responses.append(response)
+        return response
+
+    simulator.respond = recording_respond  # type: ignore[assignment]
+    raw = await printer._get_all_data()  # pylint: disable=protected-access
+    simulator.close()
+    printer.shutdown()
+    return responses, raw, printer
+
+
+def time_per_call(function: Any, repeat: int) -> float:
+    """Return microseconds per call of function."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def run(model: str, repeat: int) -> dict[str, Any]:
+    """Run the benchmark for one model."""
+    responses, raw, printer = await record(model)
+
+    def decode_messages() -> None:
+        for response in responses:
+            ber.decode_message(response)
+
+    async def recorded_data(*_: Any) -> Any:
+        return raw
+
+    printer._get_all_data = recorded_data  # type: ignore[assignment]
+    update = printer._async_update  # pylint: disable=protected-access
+
+    async def post_process(count: int) -> float:
+        start = time.perf_counter()
+        for _ in range(count):
+            await update()
+        return (time.perf_counter() - start) / count * 1e6
+
+    await post_process(min(repeat, 100))
+    return {
+        "benchmark": "decode",
+        "model": model,
+        "repeat": repeat,
+        "responses": len(responses),
+        "response_octets": sum(len(response) for response in responses),
+        "ber_decode_us": round(time_per_call(decode_messages, repeat), 2),
+        "post_process_us": round(await post_process(repeat), 2),
+    }
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="dell-c1760nw", choices=available_walks())
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+    # a walk may hold an unknown status, do not time writing warnings
+    logging.getLogger("dell_printer_snmp").setLevel(logging.ERROR)
+    print(json.dumps(await run(args.model, args.repeat)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""Compare poll throughput of pysnmp and the BER fast path.
+
+Polls a local simulated printer, first one poll at a time, then from many
+printer objects at once, and reports polls per second of both paths.
+
+    python benchmarks/fastpath.py --polls 500 --printers 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import pysnmp.hlapi.asyncio as hlapi
+
+from dell_printer_snmp import DellPrinterSnmp
+from dell_printer_snmp.ber import BerClient
+from dell_printer_snmp.simulator import PrinterSimulator
+
+HOST = "127.0.0.1"
+
+
+async def sequential(port: int, polls: int, fast_path: bool) -> float:
+    """Return polls per second of one printer polled in a loop."""
+    printer = DellPrinterSnmp(HOST, port, fast_path=fast_path)
+    # learn the profile first, the steady state is what a fleet runs in
+    await printer.async_update()
+    start = time.perf_counter()
+    for _ in range(polls):
+        await printer.async_update()
+    elapsed = time.perf_counter() - start
+    printer.shutdown()
+    return polls / elapsed
+
+
+async def concurrent(port: int, printers: int, polls: int, fast_path: bool) -> float:
+    """Return polls per second of many printers polled concurrently."""
+    snmp_engine = None if fast_path else hlapi.SnmpEngine()
+    client = BerClient() if fast_path else False
+    group = [
+        DellPrinterSnmp(HOST, port, snmp_engine=snmp_engine, fast_path=client)
+        for _ in range(printers)
+    ]
+    for printer in group:
+        await printer.async_update()
+    rounds = max(polls // printers, 1)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(printer.async_update() for printer in group))
+    elapsed = time.perf_counter() - start
+    for printer in group:
+        printer.shutdown()
+    if client:
+        client.close()
+    if snmp_engine and snmp_engine.transportDispatcher:
+        snmp_engine.transportDispatcher.closeDispatcher()
+    return rounds * printers / elapsed
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=500)
+    parser.add_argument("--printers", type=int, default=50)
+    args = parser.parse_args()
+
+    simulator = PrinterSimulator.from_model("dell-c1760nw")
+    port = await simulator.async_start(HOST)
+    results = {"benchmark": "fastpath", "polls": args.polls, "printers": args.printers}
+    for name, fast_path in (("pysnmp", False), ("ber", True)):
+        results[f"{name}_sequential_polls_per_second"] = round(
+            await sequential(port, args.polls, fast_path)
+        )
+        results[f"{name}_concurrent_polls_per_second"] = round(
+            await concurrent(port, args.printers, args.polls, fast_path)
+        )
+    simulator.close()
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
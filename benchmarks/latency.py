@@ -0,0 +1,82 @@
+"""Measure the latency of polling one printer against a local agent.
+
+Times every steady-state poll of a simulated printer, on pysnmp and on the
+BER fast path, and reports the distribution in milliseconds.  The agent
+answers right away unless ``--latency`` adds a round-trip delay.
+
+    python benchmarks/latency.py --polls 1000 --latency 0.002
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from typing import Any
+
+from dell_printer_snmp import DellPrinterSnmp
+from dell_printer_snmp.simulator import PrinterSimulator, available_walks
+
+HOST = "127.0.0.1"
+
+
+def percentile(samples: list[float], share: float) -> float:
+    """Return the sample below which share of the sorted samples lie."""
+    return samples[min(int(len(samples) * share), len(samples) - 1)]
+
+
+async def poll_latencies(port: int, polls: int, fast_path: bool) -> dict[str, Any]:
+    """Return the first poll and the distribution of later polls in ms."""
+    printer = DellPrinterSnmp(HOST, port, fast_path=fast_path)
+    start = time.perf_counter()
+    await printer.async_update()
+    first = (time.perf_counter() - start) * 1000
+    samples = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        await printer.async_update()
+        samples.append((time.perf_counter() - start) * 1000)
+    printer.shutdown()
+    samples.sort()
+    return {
+        "first_ms": round(first, 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(percentile(samples, 0.5), 3),
+        "p90_ms": round(percentile(samples, 0.9), 3),
+        "p99_ms": round(percentile(samples, 0.99), 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+async def run(model: str, polls: int, latency: float) -> dict[str, Any]:
+    """Run the benchmark for one model."""
+    simulator = PrinterSimulator.from_model(model, latency=latency)
+    port = await simulator.async_start(HOST)
+    results: dict[str, Any] = {
+        "benchmark": "latency",
+        "model": model,
+        "polls": polls,
+        "agent_latency_ms": latency * 1000,
+    }
+    for name, fast_path in (("pysnmp", False), ("ber", True)):
+        results[name] = await poll_latencies(port, polls, fast_path)
+    simulator.close()
+    return results
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="dell-c1760nw", choices=available_walks())
+    parser.add_argument("--polls", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    args = parser.parse_args()
+    logging.getLogger("dell_printer_snmp").setLevel(logging.ERROR)
+    print(json.dumps(await run(args.model, args.polls, args.latency)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
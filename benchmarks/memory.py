@@ -0,0 +1,137 @@
+"""Measure the memory held by decoded printer states.
+
+Compares the dicts of strings that earlier versions returned with the
+slotted records, for a fleet of printers that share a model.
+
+    python benchmarks/memory.py --printers 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from dell_printer_snmp import DictToObj
+from dell_printer_snmp.decoder import COLUMN_INDEX, decode_tables
+from dell_printer_snmp.model import PrinterState
+
+# raw table values of one C1760nw poll
+ROWS: dict[str, list[dict[str, Any]]] = {
+    "supplies": [
+        {"name": f"{color.title()} Toner Cartridge", "color": color, "capacity": 100, "level": level}
+        for color, level in (("cyan", 80), ("magenta", 60), ("yellow", 40), ("black", 15))
+    ],
+    "cover": [
+        {"name": "Front Cover", "status": 4},
+        {"name": "Rear Cover", "status": 4},
+    ],
+    "output_tray": [
+        {"name": "Tray1", "type": 4, "capacity": 150, "status": 0, "media": "Plain"},
+        {"name": "Manual Feeder", "type": 5, "capacity": 1, "status": 0, "media": "Plain"},
+    ],
+    "input_tray": [
+        {"name": "Center Tray", "type": 3, "capacity": 100, "status": 0, "page_delivery": 4},
+    ],
+}
+
+
+def _fresh(value: Any) -> Any:
+    """Return an equal value that is a new object, as every poll decodes one."""
+    return "".join(list(value)) if isinstance(value, str) else value
+
+
+def legacy_state(index: int) -> DictToObj:
+    """Build a state the way earlier versions did: dicts of strings."""
+    data = DictToObj(
+        {
+            "model": _fresh("Dell C1760nw Color Printer"),
+            "serial": f"CN{index:010d}",
+            "printer_status": _fresh("1"),
+            "device_status": _fresh("2"),
+            "status": "idle",
+            "printer_status_paper": "ok",
+            "printer_status_toner": "ok",
+            "uptime": datetime(2022, 1, 1, tzinfo=timezone.utc),
+            "page_counter": 12345 + index,
+        }
+    )
+    decoders = _decoders()
+    for key, rows in ROWS.items():
+        data[key] = [
+            {attr: str(decoders[key, attr](_fresh(value))) for attr, value in row.items()}
+            for row in rows
+        ]
+    return data
+
+
+def state(index: int) -> PrinterState:
+    """Build a state through the table decoder into slotted records."""
+    cells: dict[str, list[list[tuple[str, str, Callable]]]] = {key: [] for key in ROWS}
+    values = {}
+    decoders = _decoders()
+    for key, rows in ROWS.items():
+        for row_index, row in enumerate(rows):
+            cells[key].append([])
+            for attr, value in row.items():
+                oid = f"{key}.{row_index}.{attr}"
+                values[oid] = _fresh(value)
+                cells[key][-1].append((oid, attr, decoders[key, attr]))
+    return PrinterState(
+        model=_fresh("Dell C1760nw Color Printer"),
+        serial=f"CN{index:010d}",
+        printer_status=_fresh("1"),
+        device_status=_fresh("2"),
+        status="idle",
+        printer_status_paper="ok",
+        printer_status_toner="ok",
+        uptime=datetime(2022, 1, 1, tzinfo=timezone.utc),
+        page_counter=12345 + index,
+        **decode_tables(cells, values),
+    )
+
+
+def _decoders() -> dict[tuple[str, str], Callable]:
+    """Return the decoder of every table attribute."""
+    return {(key, attr): decode for key, attr, decode in COLUMN_INDEX.values()}
+
+
+def measure(build: Callable[[int], Any], printers: int) -> float:
+    """Return the bytes allocated per printer state."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    states = [build(index) for index in range(printers)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del states
+    return size / printers
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--printers", type=int, default=2000)
+    args = parser.parse_args()
+
+    # warm up interned strings and caches before measuring
+    legacy_state(0), state(0)
+    legacy = measure(legacy_state, args.printers)
+    slotted = measure(state, args.printers)
+    print(
+        json.dumps(
+            {
+                "benchmark": "memory",
+                "printers": args.printers,
+                "bytes_per_state_dict": round(legacy),
+                "bytes_per_state_slotted": round(slotted),
+                "ratio": round(slotted / legacy, 3),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Run the benchmark suite and write the results as one JSON document.
+
+Every benchmark runs in a process of its own and prints one JSON object; the
+document adds the interpreter, platform and commit the results belong to, so
+runs can be compared over time.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --quick decode latency
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+# benchmark -> arguments of a full run and of a quick run
+BENCHMARKS: dict[str, tuple[list[str], list[str]]] = {
+    "decode": ([], ["--repeat", "2000"]),
+    "latency": ([], ["--polls", "200"]),
+    "fastpath": ([], ["--polls", "200", "--printers", "20"]),
+    "memory": ([], ["--printers", "500"]),
+    "sweep": ([], ["--sizes", "10", "100", "--sweeps", "1"]),
+}
+
+
+def commit() -> str | None:
+    """Return the commit of the working tree, if it is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BENCHMARKS_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(name: str, quick: bool) -> dict[str, Any]:
+    """Run one benchmark and return its results."""
+    full, short = BENCHMARKS[name]
+    # the library of this checkout, installed or not
+    path = os.environ.get("PYTHONPATH")
+    env = {
+        **os.environ,
+        "PYTHONPATH": REPO_DIR if not path else os.pathsep.join((REPO_DIR, path)),
+    }
+    output = subprocess.run(
+        [sys.executable, os.path.join(BENCHMARKS_DIR, f"{name}.py")]
+        + (short if quick else full),
+        env=env,
+        stdout=subprocess.PIPE,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "benchmarks", nargs="*", metavar="benchmark", help=", ".join(BENCHMARKS)
+    )
+    parser.add_argument("--quick", action="store_true", help="smaller runs")
+    parser.add_argument("--output", help="file to write, standard output if unset")
+    args = parser.parse_args()
+    if unknown := set(args.benchmarks) - set(BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    document = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "quick": args.quick,
+        "results": [run(name, args.quick) for name in args.benchmarks or BENCHMARKS],
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+            file.write("\n")
+    else:
+        print(json.dumps(document, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Measure fleet sweep time and peak memory at growing fleet sizes.
+
+Every fleet size runs in a fresh poller process, so its peak resident set
+size is its own, against simulated printers served from another process.
+Each printer listens on an address of its own in 127.0.0.0/8, which Linux
+routes to the loopback interface, so the fleet polls them like real hosts.
+The first sweep learns the device profiles, the steady sweeps after it are
+what a fleet runs in.  With ``--processes`` the fleet is a ``ShardedFleet``
+of that many worker processes.
+
+    python benchmarks/sweep.py --sizes 10 100 1000 10000 --paths ber pysnmp
+    python benchmarks/sweep.py --sizes 10000 --processes 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import logging
+import resource
+import subprocess
+import sys
+import time
+from typing import Any
+
+from dell_printer_snmp.fleet import DEFAULT_MAX_CONCURRENCY, DellPrinterFleet
+from dell_printer_snmp.sharding import ShardedFleet
+from dell_printer_snmp.simulator import PrinterSimulator, Walk, available_walks
+
+FIRST_HOST = ipaddress.IPv4Address("127.1.0.1")
+
+
+def hosts(devices: int) -> list[str]:
+    """Return the loopback addresses of a fleet."""
+    return [str(FIRST_HOST + index) for index in range(devices)]
+
+
+def raise_file_limit() -> None:
+    """Allow as many open sockets as the hard limit does."""
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def peak_rss_kib() -> int:
+    """Return the peak resident set size of this process in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+async def serve(model: str, devices: int, port: int) -> None:
+    """Serve a simulated printer on every fleet address until killed."""
+    raise_file_limit()
+    walk = Walk.from_model(model)
+    simulators = [PrinterSimulator(walk) for _ in range(devices)]
+    for simulator, host in zip(simulators, hosts(devices)):
+        await simulator.async_start(host, port)
+    print("ready", flush=True)
+    await asyncio.Event().wait()
+
+
+async def sweep(fleet: DellPrinterFleet | ShardedFleet) -> tuple[float, int]:
+    """Return the time of one sweep and the number of failed polls."""
+    start = time.perf_counter()
+    errors = sum([result.error is not None async for result in fleet.async_poll()])
+    return time.perf_counter() - start, errors
+
+
+async def poll(args: argparse.Namespace) -> dict[str, Any]:
+    """Poll the served fleet and return timings and memory."""
+    raise_file_limit()
+    rss_start = peak_rss_kib()
+    start = time.perf_counter()
+    fleet: DellPrinterFleet | ShardedFleet
+    if args.processes:
+        fleet = ShardedFleet(
+            hosts(args.devices),
+            args.port,
+            args.processes,
+            max_concurrency=args.concurrency,
+            fast_path=args.path == "ber",
+        )
+    else:
+        fleet = DellPrinterFleet(
+            hosts(args.devices),
+            args.port,
+            max_concurrency=args.concurrency,
+            fast_path=args.path == "ber",
+        )
+    setup = time.perf_counter() - start
+    first, first_errors = await sweep(fleet)
+    steady = [await sweep(fleet) for _ in range(args.sweeps)]
+    fleet.shutdown()
+    steady_time = min(elapsed for elapsed, _ in steady)
+    return {
+        "devices": args.devices,
+        "path": args.path,
+        "concurrency": args.concurrency,
+        "processes": args.processes,
+        "setup_s": round(setup, 3),
+        "first_sweep_s": round(first, 3),
+        "first_sweep_errors": first_errors,
+        "steady_sweep_s": round(steady_time, 3),
+        "steady_sweep_errors": max(errors for _, errors in steady),
+        "steady_polls_per_second": round(args.devices / steady_time),
+        "rss_start_kib": rss_start,
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+def run_size(args: argparse.Namespace, devices: int, path: str) -> dict[str, Any]:
+    """Run one fleet size in fresh agent and poller processes."""
+    common = [
+        f"--model={args.model}",
+        f"--port={args.port}",
+        f"--devices={devices}",
+    ]
+    with subprocess.Popen(
+        [sys.executable, __file__, "--serve", *common],
+        stdout=subprocess.PIPE,
+        text=True,
+    ) as agent:
+        try:
+            assert agent.stdout is not None
+            if agent.stdout.readline().strip() != "ready":
+                raise RuntimeError("The simulated printers did not start")
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--poll",
+                    *common,
+                    f"--path={path}",
+                    f"--concurrency={args.concurrency}",
+                    f"--sweeps={args.sweeps}",
+                    f"--processes={args.processes}",
+                ],
+                stdout=subprocess.PIPE,
+                check=True,
+                text=True,
+            ).stdout
+        finally:
+            agent.kill()
+    return json.loads(output)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="dell-c1760nw", choices=available_walks())
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--paths", nargs="+", default=["ber"], choices=["ber", "pysnmp"])
+    parser.add_argument("--port", type=int, default=16161)
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY
+    )
+    parser.add_argument("--sweeps", type=int, default=3, help="steady sweeps")
+    parser.add_argument(
+        "--processes", type=int, default=0, help="worker processes, 0 for none"
+    )
+    # internal: run as agent or poller of one fleet size
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--poll", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--devices", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.getLogger("dell_printer_snmp").setLevel(logging.ERROR)
+
+    if args.serve:
+        asyncio.run(serve(args.model, args.devices, args.port))
+    elif args.poll:
+        print(json.dumps(asyncio.run(poll(args))))
+    else:
+        runs = [
+            run_size(args, devices, path)
+            for devices in args.sizes
+            for path in args.paths
+        ]
+        print(json.dumps({"benchmark": "sweep", "model": args.model, "runs": runs}))
+
+
+if __name__ == "__main__":
+    main()
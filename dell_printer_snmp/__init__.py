@@ -2,21 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections.abc import Generator, Iterable
-from contextlib import suppress
+import sys
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator, Iterable
+from contextlib import nullcontext, suppress
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
-from typing import Any, cast
+from typing import Any, ContextManager, cast
 
-import pysnmp.hlapi as hlapi
+import pysnmp.hlapi.asyncio as hlapi
 from pysnmp.error import PySnmpError
-from pysnmp.entity.rfc3413.oneliner import cmdgen as lcd
+from pysnmp.hlapi.asyncio.cmdgen import lcd
+from pysnmp.proto.errind import RequestTimedOut
+from pysnmp.proto.rfc1905 import endOfMibView
+from pysnmp.proto.rfc1902 import Null, ObjectName
 
 from .const import (
+    ATTR_CONDITIONS,
     ATTR_COVER,
     ATTR_INPUT_TRAY,
     ATTR_OUTPUT_TRAY,
-    ATTR_PAGE_DELIVERY,
     ATTR_STATUS,
     ATTR_MODEL,
     ATTR_PAGE_COUNT,
@@ -28,30 +35,68 @@ from .const import (
     ATTR_PRINTER_STATUS,
     ATTR_STATUS,
     ATTR_SUPPLIES,
-    ATTR_TYPE,
     ATTR_UPTIME,
-    COVER_MAP,
+    CIRCUIT_CLOSED,
+    CONFIG_CHANGES_OID,
     COVERS_OIDS,
-    OUTPUT_TYPE_MAP,
-    PAGE_DELIVERY_MAP,
-    SUBUNIT_STATUS_MAP,
+    DEFAULT_LEVEL_THRESHOLDS,
+    DEFAULT_MAX_MESSAGE_SIZE,
+    DEFAULT_MAX_REPETITIONS,
+    GET_MESSAGE_OVERHEAD,
+    GROUP_COVERS,
+    GROUP_STATUS,
+    GROUP_SUPPLIES,
+    GROUP_TRAYS,
+    STATIC_OIDS,
+    STATIC_TABLE_OIDS,
     INPUT_TRAYS_OIDS,
-    INPUT_TYPE_MAP,
+    MIN_MESSAGE_SIZE,
     OIDS,
     OUTPUT_TRAYS_OIDS,
-    PRINTER_STATUS_CRITICAL_MAP,
-    PRINTER_STATUS_PAPER_MAP,
-    PRINTER_STATUS_TONER_MAP,
+    PHASE_DECODE,
+    PHASE_PROBE,
+    PHASE_RESOLVE,
+    PHASE_SCALARS,
+    PHASE_VOLATILE,
+    PHASE_WALK,
+    POLL_GROUPS,
     STATUS_MAP,
     SUPPLIES_OIDS,
-    VAL_PRINTER_STATUS_PAPER_OK,
-    VAL_PRINTER_STATUS_TONER_OK,
+    TABLE_GROUPS,
     VAL_STATUS_CRITICAL,
     VAL_STATUS_UNKNOWN,
 )
+from . import ber
+from .ber import BerClient
+from .circuit import CircuitBreaker
+from .decoder import TABLES, decode_error_state, decode_tables, lookup_column
+from .metrics import PollMetrics
+# the records of a state are public along with it
+from .model import (  # noqa: F401
+    Change,
+    Cover,
+    InputTray,
+    OutputTray,
+    PrinterState,
+    Supply,
+    diff_states,
+)
+from .transport import (
+    COMMUNITY_DATA,
+    CONTEXT_DATA,
+    async_resolve,
+    get_estimator,
+    get_target,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# metrics of the poll running in the current task, as polls of different
+# groups of one printer may run at the same time
+_POLL_METRICS: ContextVar[PollMetrics | None] = ContextVar(
+    "poll_metrics", default=None
+)
+
 
 class DictToObj(dict):
     """Dictionary to object class."""
@@ -72,39 +117,357 @@ class DellPrinterSnmp:
         port: int = 161,
         snmp_engine: hlapi.SnmpEngine = None,
         model: str | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        max_repetitions: int = DEFAULT_MAX_REPETITIONS,
+        max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+        circuit_breaker: CircuitBreaker | bool = False,
+        fast_path: BerClient | bool = False,
+        metrics: Callable[[PollMetrics], None] | None = None,
     ) -> None:
         """Initialize."""
         if model:
             _LOGGER.debug("model: %s", model)
 
-        self.model = None
-        self.serial = None
+        self.model: str | None = None
+        self.serial: str | None = None
         self._host = host
         self._port = port
         self._last_uptime: datetime | None = None
         self._snmp_engine = snmp_engine
+        self._own_snmp_engine = snmp_engine is None
+        self._timeout = timeout
+        self._retries = retries
+        self._max_repetitions = max_repetitions
+        # None until the first table walk found out whether GETBULK works
+        self._bulk_supported: bool | None = None if max_repetitions else False
         self._oids = tuple(self._iterate_oids(OIDS.values()))
-        self._supplies_oids = tuple(self._iterate_oids(SUPPLIES_OIDS.values()))
-        self._cover_oids = tuple(self._iterate_oids(COVERS_OIDS.values()))
-        self._input_trays_oids = tuple(self._iterate_oids(INPUT_TRAYS_OIDS.values()))
-        self._output_trays_oids = tuple(self._iterate_oids(OUTPUT_TRAYS_OIDS.values()))
+        self._supplies_oids = tuple(SUPPLIES_OIDS.values())
+        self._cover_oids = tuple(COVERS_OIDS.values())
+        self._input_trays_oids = tuple(INPUT_TRAYS_OIDS.values())
+        self._output_trays_oids = tuple(OUTPUT_TRAYS_OIDS.values())
+        self._table_oids = {
+            ATTR_SUPPLIES: self._supplies_oids,
+            ATTR_COVER: self._cover_oids,
+            ATTR_INPUT_TRAY: self._input_trays_oids,
+            ATTR_OUTPUT_TRAY: self._output_trays_oids,
+        }
+        self._max_message_size = max_message_size
+        self._profile: DeviceProfile | None = None
+        self._state: PrinterState | None = None
+        # monotonic time of the last successful poll of each group
+        self._updated: dict[str, float] = {}
+        # polls in flight by their groups, and how many callers await each
+        self._polls: dict[frozenset[str], asyncio.Future[PrinterState]] = {}
+        self._poll_waiters: dict[asyncio.Future[PrinterState], int] = {}
+        # GET requests of the volatile values by the groups they poll
+        self._get_requests: dict[
+            frozenset[str], list[list[tuple[ObjectName, Null]]]
+        ] = {}
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker()
+        self._circuit_breaker = circuit_breaker or None
+        # the fast path bypasses pysnmp, its client may be shared like the engine
+        self._own_ber_client = fast_path is True
+        self._ber_client = BerClient() if fast_path is True else fast_path or None
+        # called with the measurements of every poll, if set
+        self._metrics_callback = metrics
 
         _LOGGER.debug("Using host: %s", host)
 
-    async def async_update(self) -> DictToObj:
-        """Update data from printer."""
-        if not (raw_data := await self._get_data()):
-            raise SnmpError("The printer did not return data")
+    @property
+    def host(self) -> str:
+        """Return the host name or address of the printer."""
+        return self._host
+
+    @property
+    def port(self) -> int:
+        """Return the SNMP port of the printer."""
+        return self._port
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """Return the circuit breaker, if enabled."""
+        return self._circuit_breaker
+
+    @property
+    def profile(self) -> DeviceProfile | None:
+        """Return the static device profile, if already learned."""
+        return self._profile
+
+    @property
+    def state(self) -> PrinterState | None:
+        """Return the last known state, if the printer was polled."""
+        return self._state
+
+    async def async_update_profile(self) -> DeviceProfile:
+        """Walk the printer and learn its static device profile."""
+        await self._get_full_data()
+        assert self._profile is not None
+        return self._profile
+
+    async def async_update(
+        self,
+        deadline: float | None = None,
+        groups: Iterable[str] | None = None,
+        max_age: float | None = None,
+    ) -> PrinterState:
+        """Update data from printer.
+
+        With a deadline in seconds, give up on a poll that takes longer.
+        With groups, a subset of ``status``, ``supplies``, ``covers`` and
+        ``trays``, only their values are fetched and decoded, and merged into
+        the last known state.  The first poll always fetches everything.
+        With max_age in seconds, return the last known state without a poll
+        if its groups were all polled at most that long ago.
+
+        Concurrent calls share one poll: a call while a poll of all its
+        groups is in flight waits for that poll's result.
+        """
+        if groups is None:
+            groups = POLL_GROUPS
+        else:
+            groups = frozenset(groups)
+            if unknown := groups - POLL_GROUPS:
+                raise ValueError(f"Unknown groups: {', '.join(sorted(unknown))}")
+
+        if max_age is not None and self._state is not None:
+            now = time.monotonic()
+            if all(
+                group in self._updated and now - self._updated[group] <= max_age
+                for group in groups
+            ):
+                return self._state
+
+        poll = next(
+            (
+                poll
+                for polled, poll in self._polls.items()
+                if groups <= polled and not poll.done()
+            ),
+            None,
+        )
+        if poll is None:
+            poll = self._start_poll(deadline, groups)
+        elif deadline is not None:
+            # the shared poll runs to the deadline of the caller that started it
+            try:
+                return await self._async_await_poll(
+                    asyncio.wait_for(asyncio.shield(poll), deadline), poll
+                )
+            except asyncio.TimeoutError as err:
+                raise SnmpError(
+                    f"No data within the deadline of {deadline} seconds"
+                ) from err
+        return await self._async_await_poll(asyncio.shield(poll), poll)
+
+    def _start_poll(
+        self, deadline: float | None, groups: frozenset[str]
+    ) -> asyncio.Future[PrinterState]:
+        """Start a poll that concurrent callers can share."""
+        poll = asyncio.ensure_future(self._async_poll(deadline, groups))
+        self._polls[groups] = poll
+        self._poll_waiters[poll] = 0
+
+        def done(_: asyncio.Future) -> None:
+            if self._polls.get(groups) is poll:
+                del self._polls[groups]
+
+        poll.add_done_callback(done)
+        return poll
+
+    async def _async_await_poll(
+        self, awaitable: Awaitable[PrinterState], poll: asyncio.Future[PrinterState]
+    ) -> PrinterState:
+        """Wait for a shared poll, cancel it once no caller waits any more."""
+        self._poll_waiters[poll] += 1
+        try:
+            return await awaitable
+        finally:
+            self._poll_waiters[poll] -= 1
+            if not self._poll_waiters[poll]:
+                del self._poll_waiters[poll]
+                poll.cancel()
+
+    async def _async_poll(
+        self, deadline: float | None, groups: frozenset[str]
+    ) -> PrinterState:
+        """Poll the printer once and report its metrics.
+
+        Every poll runs in a task of its own, so the metrics set here count
+        the requests of this poll only.
+        """
+        if self._metrics_callback is None:
+            _POLL_METRICS.set(None)
+            return await self._async_update_checked(deadline, groups)
+
+        metrics = PollMetrics(self._host, self._port)
+        _POLL_METRICS.set(metrics)
+        start = time.perf_counter()
+        try:
+            return await self._async_update_checked(deadline, groups)
+        except Exception as err:
+            metrics.error = type(err).__name__
+            raise
+        finally:
+            metrics.duration = time.perf_counter() - start
+            self._metrics_callback(metrics)
+
+    async def async_update_status(self, deadline: float | None = None) -> PrinterState:
+        """Update status, uptime and page counter only."""
+        return await self.async_update(deadline, (GROUP_STATUS,))
+
+    async def async_update_supplies(
+        self, deadline: float | None = None
+    ) -> PrinterState:
+        """Update supplies only."""
+        return await self.async_update(deadline, (GROUP_SUPPLIES,))
+
+    async def async_update_covers(self, deadline: float | None = None) -> PrinterState:
+        """Update covers only."""
+        return await self.async_update(deadline, (GROUP_COVERS,))
+
+    async def async_update_trays(self, deadline: float | None = None) -> PrinterState:
+        """Update input and output trays only."""
+        return await self.async_update(deadline, (GROUP_TRAYS,))
+
+    async def watch(
+        self,
+        interval: float,
+        groups: Iterable[str] | None = None,
+        thresholds: Iterable[int] | None = DEFAULT_LEVEL_THRESHOLDS,
+        deadline: float | None = None,
+    ) -> AsyncGenerator[Change, None]:
+        """Poll every interval seconds and yield what changed since the last poll.
+
+        Changes are compared with the last known state; if the printer was
+        not polled yet, the first poll only sets that state.  Supply levels
+        are reported when they cross one of thresholds, in percent of the
+        capacity, or on every change with thresholds None.  An error of a
+        poll ends the generator.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if thresholds is not None:
+            thresholds = tuple(thresholds)
+        loop = asyncio.get_running_loop()
+        state = self._state
+        next_poll = loop.time()
+        while True:
+            previous, state = state, await self.async_update(deadline, groups)
+            if previous is not None:
+                for change in diff_states(previous, state, thresholds):
+                    yield change
+            next_poll = max(next_poll + interval, loop.time())
+            await asyncio.sleep(next_poll - loop.time())
+
+    async def _async_update_checked(
+        self, deadline: float | None, groups: frozenset[str]
+    ) -> PrinterState:
+        """Update data from printer through the circuit breaker."""
+        if self._circuit_breaker:
+            await self._async_check_circuit(self._circuit_breaker)
+
+        try:
+            if deadline is None:
+                data = await self._async_update(groups)
+            else:
+                try:
+                    data = await asyncio.wait_for(self._async_update(groups), deadline)
+                except asyncio.TimeoutError as err:
+                    raise SnmpError(
+                        f"No data within the deadline of {deadline} seconds"
+                    ) from err
+        except (ConnectionError, SnmpError):
+            if self._circuit_breaker:
+                self._circuit_breaker.record_failure()
+            raise
 
+        if self._circuit_breaker:
+            self._circuit_breaker.record_success()
+        return data
+
+    async def _async_check_circuit(self, circuit_breaker: CircuitBreaker) -> None:
+        """Fail fast while the circuit is open, probe once it may recover."""
+        if circuit_breaker.state == CIRCUIT_CLOSED:
+            return
+        if not circuit_breaker.allow_probe():
+            raise CircuitOpenError(
+                "Printer unreachable, next probe in "
+                f"{circuit_breaker.retry_in:.0f} seconds"
+            )
+
+        try:
+            with self._phase(PHASE_PROBE):
+                await self._get_var_binds(
+                    [(ObjectName(OIDS[ATTR_UPTIME]), Null(""))], probe=True
+                )
+        except (ConnectionError, SnmpError) as err:
+            circuit_breaker.record_failure()
+            raise CircuitOpenError(f"Printer still unreachable: {err}") from err
+        except BaseException:
+            # such as a cancelled poll, the circuit must not stay half-open
+            circuit_breaker.cancel_probe()
+            raise
+        circuit_breaker.record_success()
+
+    @property
+    def _metrics(self) -> PollMetrics | None:
+        """Return the metrics of the poll running in this task, if collected."""
+        return _POLL_METRICS.get()
+
+    def _phase(self, name: str) -> ContextManager:
+        """Time a phase of the poll if metrics are collected."""
+        return self._metrics.phase(name) if self._metrics else nullcontext()
+
+    async def _async_update(self, groups: frozenset[str] = POLL_GROUPS) -> PrinterState:
+        """Retrieve and decode data from printer."""
+        if self._state is None:
+            # there is nothing to merge into yet
+            groups = POLL_GROUPS
+        raw_data, values, groups = await self._get_all_data(groups)
+        with self._phase(PHASE_DECODE):
+            return self._decode(raw_data, values, groups)
+
+    def _decode(
+        self,
+        raw_data: dict[str, Any],
+        values: dict[str, Any],
+        groups: frozenset[str] = POLL_GROUPS,
+    ) -> PrinterState:
+        """Decode the groups' scalars and table cells into the printer state.
+
+        Groups that were not polled keep their last known data.
+        """
+        data = self._decode_status(raw_data) if GROUP_STATUS in groups else {}
+
+        # get supplies, covers and trays
+        assert self._profile is not None
+        table_rows = self._profile.table_rows
+        if groups != POLL_GROUPS:
+            table_rows = {
+                key: rows
+                for key, rows in table_rows.items()
+                if TABLE_GROUPS[key] in groups
+            }
+        data.update(decode_tables(table_rows, values))
+        if groups != POLL_GROUPS and self._state is not None:
+            data = {**self._state, **data}
+        self._state = PrinterState(**data)
+        self._updated.update(dict.fromkeys(groups, time.monotonic()))
+        return self._state
+
+    def _decode_status(self, raw_data: dict[str, Any]) -> dict[str, Any]:
+        """Decode model, serial number, status, uptime and page counter."""
         _LOGGER.debug("RAW data: %s", raw_data)
 
-        data = DictToObj({})
+        data: dict[str, Any] = {}
 
         # get basic model and serial number information
         try:
-            self.model = raw_data[OIDS[ATTR_MODEL]]
+            self.model = sys.intern(raw_data[OIDS[ATTR_MODEL]])
             data[ATTR_MODEL] = self.model
-            self.serial = raw_data[OIDS[ATTR_SERIAL]]
+            self.serial = sys.intern(raw_data[OIDS[ATTR_SERIAL]])
             data[ATTR_SERIAL] = self.serial
         except (TypeError, AttributeError) as err:
             raise UnsupportedModel(
@@ -113,9 +476,9 @@ class DellPrinterSnmp:
 
         # retrieve printer and device status
         try:
-            printer_status = raw_data[OIDS[ATTR_PRINTER_STATUS]]
+            printer_status = sys.intern(raw_data[OIDS[ATTR_PRINTER_STATUS]])
             data[ATTR_PRINTER_STATUS] = printer_status
-            device_status = raw_data[OIDS[ATTR_DEVICE_STATUS]]
+            device_status = sys.intern(raw_data[OIDS[ATTR_DEVICE_STATUS]])
             data[ATTR_DEVICE_STATUS] = device_status
         except (AttributeError, TypeError):
             _LOGGER.debug("Incomplete data from printer")
@@ -126,29 +489,19 @@ class DellPrinterSnmp:
             _LOGGER.warn(f"Unknown status: device = {device_status}, printer = {printer_status}")
             data[ATTR_STATUS] = VAL_STATUS_UNKNOWN
         
-        # retrieve status messages
-        printer_error_message_raw = raw_data[OIDS[ATTR_PRINTER_DETECTED_ERROR_STATE]]
-        printer_error_message_int = int.from_bytes(printer_error_message_raw.encode(), byteorder="big")
+        # retrieve status messages, text of the octets in ISO 8859-1
+        error_state = decode_error_state(
+            raw_data.get(OIDS[ATTR_PRINTER_DETECTED_ERROR_STATE]) or ""
+        )
 
         # if machine is jammed, we can turn the critical status into something more specific
-        if (data[ATTR_STATUS] == VAL_STATUS_CRITICAL):
-            for critical_status in PRINTER_STATUS_CRITICAL_MAP:
-                if printer_error_message_int & critical_status:
-                    data[ATTR_STATUS] = PRINTER_STATUS_CRITICAL_MAP[critical_status]
-
-        # get paper status
-        data[ATTR_PRINTER_STATUS_PAPER] = VAL_PRINTER_STATUS_PAPER_OK
-        for paper_status in PRINTER_STATUS_PAPER_MAP:
-            if printer_error_message_int & paper_status:
-                data[ATTR_PRINTER_STATUS_PAPER] = PRINTER_STATUS_PAPER_MAP[paper_status]
-                break
-
-        # get toner status
-        data[ATTR_PRINTER_STATUS_TONER] = VAL_PRINTER_STATUS_TONER_OK
-        for toner_status in PRINTER_STATUS_TONER_MAP:
-            if printer_error_message_int & toner_status:
-                data[ATTR_PRINTER_STATUS_TONER] = PRINTER_STATUS_TONER_MAP[toner_status]
-                break
+        if data[ATTR_STATUS] == VAL_STATUS_CRITICAL and error_state.critical:
+            data[ATTR_STATUS] = error_state.critical
+
+        # get paper and toner status
+        data[ATTR_PRINTER_STATUS_PAPER] = error_state.paper
+        data[ATTR_PRINTER_STATUS_TONER] = error_state.toner
+        data[ATTR_CONDITIONS] = error_state.conditions
 
         # get uptime
         try:
@@ -177,122 +530,154 @@ class DellPrinterSnmp:
                 )
 
         _LOGGER.debug("Data: %s", data)
-
-        # get supplies
-        if not (raw_data_table := await self._get_data_table(self._supplies_oids)):
-            raise SnmpError("The printer did not return data")
-
-        _LOGGER.debug("RAW data table: %s", raw_data_table)
-       
-        data_table = []
-        for cover in raw_data_table:
-            data_item = {}
-            for oid, value in cover.items():
-                for attr in SUPPLIES_OIDS.keys():
-                    if oid.startswith(SUPPLIES_OIDS[attr] + "."):
-                        data_item[attr] = str(value)
-            data_table.append(data_item)
-            
-        data[ATTR_SUPPLIES] = data_table
-
-        # get covers
-        if not (raw_data_table := await self._get_data_table(self._cover_oids)):
-            raise SnmpError("The printer did not return data")
-
-        _LOGGER.debug("RAW data table: %s", raw_data_table)
-       
-        data_table = []
-        for cover in raw_data_table:
-            data_item = {}
-            for oid, value in cover.items():
-                value = str(value)
-                for attr in COVERS_OIDS.keys():
-                    if oid.startswith(COVERS_OIDS[attr] + "."):
-                        if attr == ATTR_STATUS:
-                            data_item[attr] = COVER_MAP[value]
-                        else:
-                            data_item[attr] = value
-            data_table.append(data_item)
-            
-        data[ATTR_COVER] = data_table
-
-        # get input trays
-        if not (raw_data_table := await self._get_data_table(self._input_trays_oids)):
-            raise SnmpError("The printer did not return data")
-
-        _LOGGER.debug("RAW data table: %s", raw_data_table)
-       
-        data_table = []
-        for input_tray in raw_data_table:
-            data_item = {}
-            for oid, value in input_tray.items():
-                value = str(value)
-                for attr in INPUT_TRAYS_OIDS.keys():
-                    if oid.startswith(INPUT_TRAYS_OIDS[attr] + "."):
-                        if attr == ATTR_TYPE:
-                            data_item[attr] = INPUT_TYPE_MAP[value]
-                        elif attr == ATTR_STATUS:
-                            if value not in SUBUNIT_STATUS_MAP.keys():
-                                # go to the next smallest power of 2
-                                value = str(1<<(int(value)-1).bit_length())
-                            data_item[attr] = SUBUNIT_STATUS_MAP[value]
-                        else:
-                            data_item[attr] = value
-            data_table.append(data_item)
-            
-        data[ATTR_OUTPUT_TRAY] = data_table
-
-        # get output trays
-        if not (raw_data_table := await self._get_data_table(self._output_trays_oids)):
-            raise SnmpError("The printer did not return data")
-
-        _LOGGER.debug("RAW data table: %s", raw_data_table)
-       
-        data_table = []
-        for output_tray in raw_data_table:
-            data_item = {}
-            for oid, value in output_tray.items():
-                value = str(value)
-                for attr in OUTPUT_TRAYS_OIDS.keys():
-                    if oid.startswith(OUTPUT_TRAYS_OIDS[attr] + "."):
-                        if attr == ATTR_TYPE:
-                            data_item[attr] = OUTPUT_TYPE_MAP[value]
-                        elif attr == ATTR_STATUS:
-                            if value not in SUBUNIT_STATUS_MAP.keys():
-                                # go to the next smallest power of 2
-                                value = str(1<<(int(value)-1).bit_length())
-                            data_item[attr] = SUBUNIT_STATUS_MAP[value]
-                        elif attr == ATTR_PAGE_DELIVERY:
-                            data_item[attr] = PAGE_DELIVERY_MAP[value]
-                        else:
-                            data_item[attr] = value
-            data_table.append(data_item)
-            
-        data[ATTR_INPUT_TRAY] = data_table
         return data
 
+    async def _get_all_data(
+        self, groups: frozenset[str] = POLL_GROUPS
+    ) -> tuple[dict[str, Any], dict[str, Any], frozenset[str]]:
+        """Retrieve scalars and table cells of groups from printer.
+
+        The first poll walks every table and learns the device profile.
+        Later polls only fetch the volatile scalars and table cells, in as few
+        GET requests as fit into the agent's message size, sent in parallel.
+        sysUpTime and prtGeneralConfigChanges lead the first request; the
+        cover and tray structure is only walked again when they show a reboot
+        or configuration change, or when a table cell has vanished.  Return
+        the groups retrieved, which are all of them after a walk.
+        """
+        if self._profile:
+            if (result := await self._get_volatile_data(groups)) is not None:
+                return (*result, groups)
+            _LOGGER.debug("Printer rebooted or changed, learning profile again")
+            self._profile = None
+
+        return (*await self._get_full_data(), POLL_GROUPS)
+
+    async def _get_full_data(self) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Retrieve all scalars and walk all tables, then learn the profile."""
+        with self._phase(PHASE_SCALARS):
+            if not (raw_data := await self._get_data()):
+                raise SnmpError("The printer did not return data")
+
+            # not every agent implements prtGeneralConfigChanges
+            config_changes = None
+            if response := await self._get_var_binds(
+                [(ObjectName(CONFIG_CHANGES_OID), Null(""))]
+            ):
+                config_changes = response[0][1]
+
+        raw_data_tables = {}
+        for group, oids in self._table_oids.items():
+            with self._phase(PHASE_WALK + group):
+                raw_data_table = await self._get_data_table(oids)
+            if not raw_data_table:
+                raise SnmpError("The printer did not return data")
+            raw_data_tables[group] = raw_data_table
+
+        self._profile = DeviceProfile(raw_data, raw_data_tables, config_changes)
+        self._get_requests = {}
+        values = {
+            oid: value
+            for raw_data_table in raw_data_tables.values()
+            for row in raw_data_table
+            for oid, value in row.items()
+            if value is not endOfMibView
+        }
+        return raw_data, values
+
+    def _plan_get_requests(
+        self, groups: frozenset[str]
+    ) -> list[list[tuple[ObjectName, Null]]]:
+        """Pack the groups' volatile scalars and table cells into GET requests.
+
+        The values that show a reboot or configuration change are part of
+        every plan.
+        """
+        if (requests := self._get_requests.get(groups)) is not None:
+            return requests
+        profile = self._profile
+        assert profile is not None
+        requests = [[]]
+        size = GET_MESSAGE_OVERHEAD
+        for oid, var_bind_size in profile.volatile_oids.items():
+            group = profile.volatile_groups[oid]
+            if group is not None and group not in groups:
+                continue
+            if requests[-1] and size + var_bind_size > self._max_message_size:
+                requests.append([])
+                size = GET_MESSAGE_OVERHEAD
+            requests[-1].append((ObjectName(oid), Null("")))
+            size += var_bind_size
+        self._get_requests[groups] = requests
+        return requests
+
+    async def _get_volatile_data(
+        self, groups: frozenset[str] = POLL_GROUPS
+    ) -> tuple[dict[str, Any], dict[str, Any]] | None:
+        """Retrieve the groups' volatile values and merge them with the profile.
+
+        Return None when the printer rebooted, its configuration changed or
+        it does not know a cell any more.
+        """
+        profile = self._profile
+        assert profile is not None
+        try:
+            with self._phase(PHASE_VOLATILE):
+                responses = await asyncio.gather(
+                    *(
+                        self._get_var_binds(var_binds)
+                        for var_binds in self._plan_get_requests(groups)
+                    )
+                )
+        except _TooBig:
+            if self._max_message_size <= MIN_MESSAGE_SIZE:
+                raise SnmpError("tooBig") from None
+            self._max_message_size = max(MIN_MESSAGE_SIZE, self._max_message_size // 2)
+            _LOGGER.debug(
+                "Response too big, limiting requests to %s bytes",
+                self._max_message_size,
+            )
+            self._get_requests = {}
+            return await self._get_volatile_data(groups)
+        if None in responses:
+            return None
+
+        values = dict(profile.static_values)
+        values.update(
+            (str(name), value)
+            for response in cast("list[list]", responses)
+            for name, value in response
+        )
+        if profile.has_changed(values):
+            return None
+
+        raw_data = {oid: str(values[oid]) for oid in OIDS.values() if oid in values}
+        return raw_data, values
+
+    async def _get_var_binds(self, var_binds: list, probe: bool = False) -> list | None:
+        """Send one GET request, return None if a variable does not exist."""
+        errindication, errstatus, errindex, restable = await self._async_request(
+            hlapi.getCmd, *var_binds, probe=probe
+        )
+        if errindication:
+            raise SnmpError(errindication)
+        if errstatus:
+            if int(errstatus) == 1:
+                raise _TooBig
+            if int(errstatus) == 2:
+                return None
+            raise SnmpError(f"{errstatus}, {errindex}")
+        if any(isinstance(value, Null) for _, value in restable):
+            return None
+        return cast(list, restable)
 
     async def _get_data(self) -> dict[str, Any]:
         """Retrieve data from printer."""
         raw_data = {}
 
-        if not self._snmp_engine:
-            self._snmp_engine = hlapi.SnmpEngine()
-
-        try:
-            request_args = [
-                self._snmp_engine,
-                hlapi.CommunityData("public", mpModel=0),
-                hlapi.UdpTransportTarget(
-                    (self._host, self._port), timeout=2, retries=10
-                ),
-                hlapi.ContextData(),
-            ]
-            errindication, errstatus, errindex, restable = next(hlapi.getCmd(
-                *request_args, *self._oids,
-            ))
-        except PySnmpError as err:
-            raise ConnectionError(err) from err
+        errindication, errstatus, errindex, restable = await self._async_request(
+            hlapi.getCmd, *self._oids
+        )
         if errindication:
             raise SnmpError(errindication)
         if errstatus:
@@ -302,54 +687,401 @@ class DellPrinterSnmp:
             raw_data[str(resrow[0])] = str(resrow[-1])
         return raw_data
 
-
     async def _get_data_table(self, oids) -> list[dict[str, Any]]:
         """Retrieve data from printer."""
-        raw_data = {}
+        data = []
 
-        if not self._snmp_engine:
-            self._snmp_engine = hlapi.SnmpEngine()
+        if self._bulk_supported is not False:
+            try:
+                async for varBinds in self._bulk_walk(oids):
+                    data.append(self._table_row(varBinds))
+            except SnmpError as err:
+                if self._bulk_supported:
+                    raise
+                _LOGGER.debug("GETBULK not supported, falling back to GETNEXT: %s", err)
+                self._bulk_supported = False
+                data = []
+            else:
+                self._bulk_supported = True
+                return data
 
-        try:
-            request_args = [
-                self._snmp_engine,
-                hlapi.CommunityData("public", mpModel=0),
-                hlapi.UdpTransportTarget(
-                    (self._host, self._port), timeout=2, retries=10
-                ),
-                hlapi.ContextData(),
-            ]
-
-            iterator = hlapi.nextCmd(
-                *request_args,
-                *oids,
-                lexicographicMode=False
+        async for varBinds in self._walk(oids):
+            data.append(self._table_row(varBinds))
+
+        return data
+
+    @staticmethod
+    def _table_row(varBinds: list) -> dict[str, Any]:
+        """Convert walked variable bindings to a table row."""
+        result: dict[str, Any] = {}
+        for varBind in varBinds:
+            result.update([(str(varBind[0]), varBind[-1])])
+        return result
+
+    async def _walk(self, oids: Iterable[str]) -> AsyncGenerator:
+        """Walk table columns with GETNEXT, yielding one row per round trip.
+
+        Mirrors the blocking ``nextCmd(lexicographicMode=False)``: a column
+        that has left its subtree is reported as ``endOfMibView`` against its
+        last OID and is no longer requested, the walk stops once every column
+        has ended.
+        """
+        initial = [ObjectName(oid) for oid in oids]
+        var_binds = [(name, Null("")) for name in initial]
+        active = list(range(len(var_binds)))
+
+        while active:
+            errindication, errstatus, errindex, restable = await self._async_request(
+                hlapi.nextCmd, *((var_binds[col][0], Null("")) for col in active)
             )
-        except PySnmpError as err:
-            raise ConnectionError(err) from err
+            if errindication:
+                raise SnmpError(errindication)
+            if errstatus:
+                if int(errstatus) == 2:
+                    # SNMPv1 agents report the end of the MIB as noSuchName
+                    return
+                raise SnmpError(f"{errstatus}, {errindex}")
 
-        data = []
+            still_active = []
+            for col, (name, value) in zip(active, restable[0]):
+                if isinstance(value, Null) or not initial[col].isPrefixOf(name):
+                    var_binds[col] = (var_binds[col][0], endOfMibView)
+                else:
+                    var_binds[col] = (name, value)
+                    still_active.append(col)
+
+            if not still_active:
+                return
+            active = still_active
+            yield list(var_binds)
+
+    async def _bulk_walk(self, oids: Iterable[str]) -> AsyncGenerator:
+        """Walk table columns with SNMPv2c GETBULK.
 
-        for errindication, errstatus, errindex, varBinds in iterator:
+        Yields the same rows as ``_walk`` but fetches up to
+        ``max_repetitions`` of them per round trip.  While it is unknown
+        whether the printer speaks SNMPv2c the request is not retried, so a
+        v1-only agent that drops it costs a single timeout.
+        """
+        initial = [ObjectName(oid) for oid in oids]
+        var_binds = [(name, Null("")) for name in initial]
+        active = list(range(len(var_binds)))
 
-            result = {}
+        while active:
+            errindication, errstatus, errindex, restable = await self._async_request(
+                hlapi.bulkCmd,
+                0,
+                self._max_repetitions,
+                *((var_binds[col][0], Null("")) for col in active),
+                mp_model=1,
+                probe=not self._bulk_supported,
+            )
             if errindication:
                 raise SnmpError(errindication)
-            elif errstatus:
+            if errstatus:
                 raise SnmpError(f"{errstatus}, {errindex}")
-            else:
-                for varBind in varBinds:
-                    result.update([(str(varBind[0]), varBind[-1])])
-            data.append(result)
+            if not restable:
+                raise SnmpError("Empty GETBULK response")
 
-        return data
+            requested = active
+            for row in restable:
+                still_active = []
+                for col, (name, value) in zip(requested, row):
+                    if col not in active:
+                        continue
+                    if isinstance(value, Null) or not initial[col].isPrefixOf(name):
+                        var_binds[col] = (var_binds[col][0], endOfMibView)
+                    else:
+                        var_binds[col] = (name, value)
+                        still_active.append(col)
+
+                if not still_active:
+                    return
+                active = still_active
+                yield list(var_binds)
 
+    def shutdown(self) -> None:
+        """Unconfigure SNMP engine."""
+        if self._own_ber_client and self._ber_client:
+            self._ber_client.close()
+        if not self._snmp_engine:
+            return
+        lcd.unconfigure(self._snmp_engine, None)
+        if self._own_snmp_engine and self._snmp_engine.transportDispatcher:
+            self._snmp_engine.transportDispatcher.closeDispatcher()
+            self._snmp_engine = None
+
+    async def _async_request(
+        self, command: Callable, *args: Any, mp_model: int = 0, probe: bool = False
+    ) -> tuple:
+        """Send one request and feed its round-trip time to the estimator."""
+        if self._ber_client:
+            target = await self._async_target(probe)
+            start = time.monotonic()
+            result = await self._async_ber_request(target, command, args, mp_model)
+        else:
+            try:
+                request_args = await self._async_request_args(mp_model, probe)
+                target = request_args[2]
+                start = time.monotonic()
+                result = await command(*request_args, *args, lookupMib=False)
+            except PySnmpError as err:
+                raise ConnectionError(err) from err
+
+        elapsed = time.monotonic() - start
+        estimator = get_estimator(*target.transportAddr)
+        timed_out = isinstance(result[0], RequestTimedOut)
+        if timed_out:
+            estimator.backoff()
+        elif elapsed < target.timeout:
+            # Karn's algorithm: an answer after a retransmission is ambiguous
+            estimator.sample(elapsed)
+        if self._metrics:
+            self._count_request(
+                self._metrics,
+                target,
+                command,
+                args,
+                mp_model,
+                result,
+                elapsed,
+                timed_out,
+            )
+        return result
+
+    def _count_request(
+        self,
+        metrics: PollMetrics,
+        target: hlapi.UdpTransportTarget,
+        command: Callable,
+        args: tuple,
+        mp_model: int,
+        result: tuple,
+        elapsed: float,
+        timed_out: bool,
+    ) -> None:
+        """Add a request to the metrics of the poll.
+
+        Retransmissions follow each other after the timeout, so their number
+        is inferred from the time the answer took.
+        """
+        template = self._request_template(command, args, mp_model)[0]
+        if timed_out:
+            retries = target.retries
+            metrics.timeouts += 1
+        else:
+            retries = min(int(elapsed / target.timeout), target.retries)
+        metrics.round_trips += 1
+        metrics.retries += retries
+        metrics.bytes_sent += (len(template[0]) + 4 + len(template[1])) * (retries + 1)
+        # GETNEXT and GETBULK results are rows of variable bindings
+        var_binds = [
+            var_bind
+            for item in result[3]
+            for var_bind in (item if isinstance(item, list) else (item,))
+        ]
+        metrics.var_binds += len(var_binds)
+        if not self._ber_client and not timed_out:
+            metrics.bytes_received += GET_MESSAGE_OVERHEAD + sum(
+                _encoded_size(str(name), value) for name, value in var_binds
+            )
+
+    async def _async_ber_request(
+        self,
+        target: hlapi.UdpTransportTarget,
+        command: Callable,
+        args: tuple,
+        mp_model: int,
+    ) -> tuple:
+        """Send a GET, GETNEXT or GETBULK request through the fast path.
+
+        The result has the shape of the pysnmp command's result.
+        """
+        assert self._ber_client is not None
+        template, pdu_type, width = self._request_template(command, args, mp_model)
+        response = await self._ber_client.async_request(
+            target.transportAddr, template, target.timeout, target.retries
+        )
+        if response is None:
+            return RequestTimedOut(), 0, 0, []
+        if self._metrics:
+            self._metrics.bytes_received += response.size
+        var_binds = response.var_binds
+        if pdu_type == ber.GET or response.error_status:
+            return None, response.error_status, response.error_index, var_binds
+        # GETNEXT and GETBULK responses come as rows of the requested columns;
+        # an agent may cut a GETBULK response mid-row, the walk goes on from
+        # the last full row as pysnmp's does
+        rows = [
+            var_binds[index : index + width]
+            for index in range(0, len(var_binds) - width + 1, width)
+        ]
+        return None, 0, 0, rows
+
+    @staticmethod
+    def _request_template(
+        command: Callable, args: tuple, mp_model: int
+    ) -> tuple[ber.Template, int, int]:
+        """Return the encoded template, PDU type and number of variables."""
+        non_repeaters = max_repetitions = 0
+        if command is hlapi.getCmd:
+            pdu_type = ber.GET
+        elif command is hlapi.nextCmd:
+            pdu_type = ber.GETNEXT
+        else:
+            pdu_type = ber.GETBULK
+            non_repeaters, max_repetitions, *args = args  # type: ignore[assignment]
+        names = tuple(tuple(name) for name, _ in args)
+        template = ber.request_template(
+            mp_model, pdu_type, names, non_repeaters, max_repetitions
+        )
+        return template, pdu_type, len(names)
+
+    async def _async_request_args(self, mp_model: int = 0, probe: bool = False) -> list:
+        """Return engine, credentials, target and context for a request.
+
+        Credentials and context are shared constants.
+        """
+        if not self._snmp_engine:
+            self._snmp_engine = hlapi.SnmpEngine()
+
+        return [
+            self._snmp_engine,
+            COMMUNITY_DATA[mp_model],
+            await self._async_target(probe),
+            CONTEXT_DATA,
+        ]
+
+    async def _async_target(self, probe: bool = False) -> hlapi.UdpTransportTarget:
+        """Return the transport target for a request.
+
+        Transport targets are shared by all printers at the same address.
+        Unless fixed by the caller, timeout and retries follow the printer's
+        round-trip time.  A probe is never retried.
+        """
+        with self._phase(PHASE_RESOLVE):
+            address = await async_resolve(self._host, self._port)
+        if self._metrics:
+            self._metrics.address = address
+        estimator = get_estimator(address, self._port)
+        timeout = self._timeout if self._timeout is not None else estimator.timeout
+        if probe:
+            retries = 0
+        elif self._retries is not None:
+            retries = self._retries
+        else:
+            retries = estimator.retries
+
+        return get_target(address, self._port, timeout, retries)
 
     @classmethod
     def _iterate_oids(cls, oids: Iterable) -> Generator:
         """Iterate OIDS to retrieve from printer."""
         for oid in oids:
-            yield hlapi.ObjectType(hlapi.ObjectIdentity(oid))
+            yield ObjectName(oid), Null("")
+
+
+class DeviceProfile:
+    """Static part of a printer's data, learned by walking its tables."""
+
+    def __init__(
+        self,
+        raw_data: dict[str, Any],
+        raw_data_tables: dict[str, list[dict[str, Any]]],
+        config_changes: Any = None,
+    ) -> None:
+        """Initialize."""
+        self.model = raw_data.get(OIDS[ATTR_MODEL])
+        self.serial = raw_data.get(OIDS[ATTR_SERIAL])
+        self.uptime = self._ticks(raw_data.get(OIDS[ATTR_UPTIME]))
+        self.config_changes = self._ticks(config_changes)
+        # table rows as (oid, attribute, decoder) cells by data key, resolved
+        # once through the column index; a cell without OID is a column that
+        # ended before the others
+        self.table_rows: dict[str, list[list[tuple[str | None, str, Callable]]]] = {
+            key: [] for key in TABLES
+        }
+        for raw_data_table in raw_data_tables.values():
+            for row in raw_data_table:
+                cells: dict[str, list[tuple[str | None, str, Callable]]] = {}
+                for oid, value in row.items():
+                    if (column := lookup_column(ObjectName(oid))) is None:
+                        continue
+                    key, attr, decode = column
+                    cells.setdefault(key, []).append(
+                        (oid if value is not endOfMibView else None, attr, decode)
+                    )
+                for key, cell_row in cells.items():
+                    self.table_rows[key].append(cell_row)
+        self.static_values: dict[str, Any] = {}
+        # volatile OIDs with the estimated size of their variable binding,
+        # change detection first
+        self.volatile_oids: dict[str, int] = {
+            OIDS[ATTR_UPTIME]: _encoded_size(OIDS[ATTR_UPTIME], 0),
+        }
+        if self.config_changes is not None:
+            self.volatile_oids[CONFIG_CHANGES_OID] = _encoded_size(
+                CONFIG_CHANGES_OID, 0
+            )
+        # poll group of each volatile OID, None for change detection
+        self.volatile_groups: dict[str, str | None] = dict.fromkeys(self.volatile_oids)
+
+        for oid, value in raw_data.items():
+            if oid in STATIC_OIDS:
+                self.static_values[oid] = value
+            elif oid not in self.volatile_oids:
+                # scalars are not measured, assume a short display string
+                self.volatile_oids[oid] = _encoded_size(oid, None)
+                self.volatile_groups[oid] = GROUP_STATUS
+        for group, raw_data_table in raw_data_tables.items():
+            for row in raw_data_table:
+                for oid, value in row.items():
+                    if value is endOfMibView:
+                        continue
+                    if oid.startswith(_STATIC_TABLE_PREFIXES):
+                        self.static_values[oid] = value
+                    else:
+                        self.volatile_oids[oid] = _encoded_size(oid, value)
+                        self.volatile_groups[oid] = TABLE_GROUPS[group]
+
+    def has_changed(self, values: dict[str, Any]) -> bool:
+        """Return True if the printer rebooted or its configuration changed."""
+        uptime = self._ticks(values.get(OIDS[ATTR_UPTIME]))
+        config_changes = self._ticks(values.get(CONFIG_CHANGES_OID))
+        rebooted = (
+            uptime is not None and self.uptime is not None and uptime < self.uptime
+        )
+        reconfigured = config_changes != self.config_changes
+        if uptime is not None:
+            self.uptime = uptime
+        return rebooted or reconfigured
+
+    @staticmethod
+    def _ticks(value: Any) -> int | None:
+        """Convert a counter or time ticks value to int."""
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+
+def _encoded_size(oid: str, value: Any) -> int:
+    """Estimate the encoded size of a variable binding in a response."""
+    if value is None:
+        value_size = 32
+    elif hasattr(value, "asOctets"):
+        value_size = len(value.asOctets())
+    else:
+        value_size = 5
+    # sub-identifiers up to 127 take one octet, plus tag and length octets
+    return len(oid.split(".")) + value_size + 8
+
+
+_STATIC_TABLE_PREFIXES = tuple(oid + "." for oid in STATIC_TABLE_OIDS)
+
+
+class _TooBig(Exception):
+    """Raised when the response to a GET would exceed the agent's message size."""
 
 
 class SnmpError(Exception):
@@ -361,6 +1093,10 @@ class SnmpError(Exception):
         self.status = status
 
 
+class CircuitOpenError(SnmpError):
+    """Raised when a poll is refused because the printer keeps failing."""
+
+
 class UnsupportedModel(Exception):
     """Raised when no model, serial no data."""
 
@@ -0,0 +1,622 @@
+"""Minimal SNMP message codec and UDP client for the fixed OID set.
+
+pysnmp builds every request from MIB objects through pyasn1 and a chain of
+message and security processors.  The requests of this library only ever
+carry ``public`` community names and NULL values for a known set of OIDs,
+so their encoding is computed once per OID list and cached as a template
+with a placeholder for the request id.  Responses are decoded straight
+into ints, ``Octets`` and ``Oid`` values.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import random
+from typing import Any, NamedTuple, Optional, Tuple, Union, cast
+
+from pysnmp.proto.rfc1902 import Null
+from pysnmp.proto.rfc1905 import endOfMibView, noSuchInstance, noSuchObject
+
+from .const import (
+    COMMUNITY,
+    MAX_REQUEST_ID,
+    MIN_REQUEST_ID,
+    TEMPLATE_CACHE_SIZE,
+    WHEEL_RESOLUTION,
+    WHEEL_SLOTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_COMMUNITY = COMMUNITY.encode()
+
+SEQUENCE = 0x30
+INTEGER = 0x02
+OCTET_STRING = 0x04
+NULL = 0x05
+OBJECT_IDENTIFIER = 0x06
+IP_ADDRESS = 0x40
+COUNTER32 = 0x41
+GAUGE32 = 0x42
+TIME_TICKS = 0x43
+OPAQUE = 0x44
+COUNTER64 = 0x46
+NO_SUCH_OBJECT = 0x80
+NO_SUCH_INSTANCE = 0x81
+END_OF_MIB_VIEW = 0x82
+
+GET = 0xA0
+GETNEXT = 0xA1
+RESPONSE = 0xA2
+TRAP = 0xA4
+GETBULK = 0xA5
+TRAP_V2 = 0xA7
+
+# sysUpTime.0 and snmpTrapOID.0, the first variables of an SNMPv2 trap
+SYS_UPTIME = (1, 3, 6, 1, 2, 1, 1, 3, 0)
+SNMP_TRAP_OID = (1, 3, 6, 1, 6, 3, 1, 1, 4, 1, 0)
+# generic trap of SNMPv1 traps defined by an enterprise
+_ENTERPRISE_SPECIFIC = 6
+
+_UNSIGNED = frozenset((COUNTER32, GAUGE32, TIME_TICKS, COUNTER64))
+_OCTETS = frozenset((OCTET_STRING, IP_ADDRESS, OPAQUE))
+# NULL and exception values decode to shared pysnmp instances, so the rest of
+# the library tells them apart as it does with pysnmp's own responses
+_NULLS = {
+    NULL: Null(""),
+    NO_SUCH_OBJECT: noSuchObject,
+    NO_SUCH_INSTANCE: noSuchInstance,
+    END_OF_MIB_VIEW: endOfMibView,
+}
+
+Template = Tuple[bytes, bytes]
+
+
+class Oid(tuple):
+    """Object identifier as a tuple of sub-identifiers."""
+
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        """Return the dotted notation."""
+        return ".".join(map(str, self))
+
+
+class Octets(bytes):
+    """OCTET STRING value that converts to text like pysnmp's OctetString."""
+
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        """Return the octets as ISO 8859-1 text."""
+        return self.decode("iso-8859-1")
+
+    def asOctets(self) -> bytes:  # pylint: disable=invalid-name
+        """Return the octets."""
+        return bytes(self)
+
+
+Value = Union[int, Octets, Oid, Null]
+
+
+class Response(NamedTuple):
+    """Decoded SNMP message."""
+
+    version: int
+    pdu_type: int
+    request_id: int
+    error_status: int
+    error_index: int
+    var_binds: list[tuple[Oid, Value]]
+    # octets of the encoded message
+    size: int = 0
+
+
+class Trap(NamedTuple):
+    """Decoded SNMPv1 or SNMPv2 trap.
+
+    SNMPv1 traps are translated as in RFC 3584: an enterprise specific trap
+    is identified by the enterprise OID, a zero and the specific trap number.
+    """
+
+    version: int
+    community: bytes
+    oid: Oid
+    uptime: int
+    # agent-addr of SNMPv1 traps
+    agent_address: str | None
+    var_binds: list[tuple[Oid, Value]]
+
+
+def _encode_length(length: int) -> bytes:
+    """Encode a definite length."""
+    if length < 0x80:
+        return bytes((length,))
+    octets = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((0x80 | len(octets),)) + octets
+
+
+def _tlv(tag: int, content: bytes) -> bytes:
+    """Encode tag, length and content."""
+    return bytes((tag,)) + _encode_length(len(content)) + content
+
+
+def _encode_integer(value: int, signed: bool = True) -> bytes:
+    """Encode the content of an integer in as few octets as possible."""
+    bits = (value + (value < 0)).bit_length() if signed else value.bit_length()
+    return value.to_bytes(bits // 8 + 1, "big", signed=signed)
+
+
+def _encode_oid(oid: tuple[int, ...]) -> bytes:
+    """Encode the content of an object identifier."""
+    content = bytearray()
+    for sub_id in (oid[0] * 40 + oid[1], *oid[2:]):
+        chunk = [sub_id & 0x7F]
+        sub_id >>= 7
+        while sub_id:
+            chunk.append(0x80 | (sub_id & 0x7F))
+            sub_id >>= 7
+        content.extend(reversed(chunk))
+    return bytes(content)
+
+
+def parse_oid(oid: str | tuple[int, ...]) -> Oid:
+    """Return an object identifier from its dotted notation or sub-identifiers."""
+    if isinstance(oid, str):
+        return Oid(int(sub_id) for sub_id in oid.strip(".").split("."))
+    return Oid(oid)
+
+
+def encode_value(tag: int, value: Any) -> bytes:
+    """Encode a value of the given tag, as an agent puts it in a response."""
+    if tag == INTEGER:
+        return _tlv(tag, _encode_integer(int(value)))
+    if tag in _UNSIGNED:
+        return _tlv(tag, _encode_integer(int(value), signed=False))
+    if tag == OBJECT_IDENTIFIER:
+        return _tlv(tag, _encode_oid(parse_oid(value)))
+    if tag in _OCTETS:
+        if isinstance(value, str):
+            value = value.encode("iso-8859-1")
+        return _tlv(tag, bytes(value))
+    if tag in _NULLS:
+        return bytes((tag, 0))
+    raise ValueError(f"Unsupported tag: {tag:#x}")
+
+
+def encode_message(
+    version: int,
+    pdu_type: int,
+    request_id: int,
+    error_status: int,
+    error_index: int,
+    var_binds: list[tuple[tuple[int, ...], bytes]],
+    community: bytes = _COMMUNITY,
+) -> bytes:
+    """Encode a message from variable bindings with encoded values."""
+    encoded_var_binds = b"".join(
+        _tlv(SEQUENCE, _tlv(OBJECT_IDENTIFIER, _encode_oid(name)) + value)
+        for name, value in var_binds
+    )
+    pdu = _tlv(
+        pdu_type,
+        _tlv(INTEGER, _encode_integer(request_id))
+        + _tlv(INTEGER, _encode_integer(error_status))
+        + _tlv(INTEGER, _encode_integer(error_index))
+        + _tlv(SEQUENCE, encoded_var_binds),
+    )
+    return _tlv(
+        SEQUENCE,
+        _tlv(INTEGER, _encode_integer(version)) + _tlv(OCTET_STRING, community) + pdu,
+    )
+
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def request_template(
+    version: int,
+    pdu_type: int,
+    names: tuple[tuple[int, ...], ...],
+    non_repeaters: int = 0,
+    max_repetitions: int = 0,
+) -> Template:
+    """Return a request as the octets before and after its request id.
+
+    Request ids are always encoded in four octets, so lengths do not depend
+    on them and a request is the concatenation of both parts and the id.
+    """
+    after_id = (
+        _tlv(INTEGER, _encode_integer(non_repeaters))
+        + _tlv(INTEGER, _encode_integer(max_repetitions))
+        + _tlv(
+            SEQUENCE,
+            b"".join(
+                _tlv(SEQUENCE, _tlv(OBJECT_IDENTIFIER, _encode_oid(name)) + b"\x05\x00")
+                for name in names
+            ),
+        )
+    )
+    before_id = (
+        _tlv(INTEGER, _encode_integer(version))
+        + _tlv(OCTET_STRING, _COMMUNITY)
+        + bytes((pdu_type,))
+        + _encode_length(6 + len(after_id))
+        + b"\x02\x04"
+    )
+    length = len(before_id) + 4 + len(after_id)
+    return bytes((SEQUENCE,)) + _encode_length(length) + before_id, after_id
+
+
+def encode_request(template: Template, request_id: int) -> bytes:
+    """Fill a request template with a request id."""
+    return template[0] + request_id.to_bytes(4, "big") + template[1]
+
+
+def _read_header(data: bytes, index: int) -> tuple[int, int, int]:
+    """Return tag, content start and content end of the element at index."""
+    tag = data[index]
+    length = data[index + 1]
+    index += 2
+    if length & 0x80:
+        count = length & 0x7F
+        length = int.from_bytes(data[index : index + count], "big")
+        index += count
+    end = index + length
+    if end > len(data):
+        raise ValueError("Truncated message")
+    return tag, index, end
+
+
+def _read_integer(data: bytes, index: int) -> tuple[int, int]:
+    """Return an INTEGER and the index after it."""
+    tag, start, end = _read_header(data, index)
+    if tag != INTEGER:
+        raise ValueError(f"Expected INTEGER, got tag {tag:#x}")
+    return int.from_bytes(data[start:end], "big", signed=True), end
+
+
+def _decode_oid(content: bytes) -> Oid:
+    """Decode the content of an object identifier."""
+    sub_ids = []
+    value = 0
+    for octet in content:
+        value = (value << 7) | (octet & 0x7F)
+        if not octet & 0x80:
+            sub_ids.append(value)
+            value = 0
+    first = sub_ids[0]
+    if first < 80:
+        return Oid((first // 40, first % 40, *sub_ids[1:]))
+    return Oid((2, first - 80, *sub_ids[1:]))
+
+
+def _decode_value(tag: int, content: bytes) -> Value:
+    """Decode the content of a value."""
+    if tag == INTEGER:
+        return int.from_bytes(content, "big", signed=True)
+    if tag in _UNSIGNED:
+        return int.from_bytes(content, "big")
+    if tag in _OCTETS:
+        return Octets(content)
+    if tag == OBJECT_IDENTIFIER:
+        return _decode_oid(content)
+    if tag in _NULLS:
+        return _NULLS[tag]
+    raise ValueError(f"Unsupported tag: {tag:#x}")
+
+
+def decode_message(data: bytes) -> Response:
+    """Decode a message, raising ValueError if it is malformed."""
+    try:
+        tag, index, _ = _read_header(data, 0)
+        if tag != SEQUENCE:
+            raise ValueError("Not an SNMP message")
+        version, index = _read_integer(data, index)
+        _, _, index = _read_header(data, index)  # community
+        pdu_type, index, _ = _read_header(data, index)
+        request_id, index = _read_integer(data, index)
+        error_status, index = _read_integer(data, index)
+        error_index, index = _read_integer(data, index)
+        var_binds = _read_var_binds(data, index)
+    except IndexError as err:
+        raise ValueError("Truncated message") from err
+    return Response(
+        version, pdu_type, request_id, error_status, error_index, var_binds, len(data)
+    )
+
+
+def encode_trap(
+    version: int,
+    oid: tuple[int, ...],
+    uptime: int,
+    var_binds: list[tuple[tuple[int, ...], bytes]],
+    agent_address: str = "0.0.0.0",
+    request_id: int = 0,
+    community: bytes = _COMMUNITY,
+) -> bytes:
+    """Encode an enterprise specific trap, as SNMPv1 trap with version 0."""
+    if version:
+        return encode_message(
+            version,
+            TRAP_V2,
+            request_id,
+            0,
+            0,
+            [
+                (SYS_UPTIME, encode_value(TIME_TICKS, uptime)),
+                (SNMP_TRAP_OID, encode_value(OBJECT_IDENTIFIER, oid)),
+                *var_binds,
+            ],
+            community,
+        )
+    if len(oid) < 3 or oid[-2] != 0:
+        raise ValueError(f"Not an enterprise specific trap: {parse_oid(oid)}")
+    encoded_var_binds = b"".join(
+        _tlv(SEQUENCE, _tlv(OBJECT_IDENTIFIER, _encode_oid(name)) + value)
+        for name, value in var_binds
+    )
+    pdu = _tlv(
+        TRAP,
+        _tlv(OBJECT_IDENTIFIER, _encode_oid(oid[:-2]))
+        + _tlv(IP_ADDRESS, bytes(int(octet) for octet in agent_address.split(".")))
+        + _tlv(INTEGER, _encode_integer(_ENTERPRISE_SPECIFIC))
+        + _tlv(INTEGER, _encode_integer(oid[-1]))
+        + encode_value(TIME_TICKS, uptime)
+        + _tlv(SEQUENCE, encoded_var_binds),
+    )
+    return _tlv(
+        SEQUENCE,
+        _tlv(INTEGER, _encode_integer(0)) + _tlv(OCTET_STRING, community) + pdu,
+    )
+
+
+def _read_var_binds(data: bytes, index: int) -> list[tuple[Oid, Value]]:
+    """Return the variable bindings of the sequence at index."""
+    _, index, end = _read_header(data, index)
+    var_binds = []
+    while index < end:
+        _, index, next_index = _read_header(data, index)
+        _, start, index = _read_header(data, index)
+        name = _decode_oid(data[start:index])
+        tag, start, index = _read_header(data, index)
+        var_binds.append((name, _decode_value(tag, data[start:index])))
+        index = next_index
+    return var_binds
+
+
+def decode_trap(data: bytes) -> Trap:
+    """Decode an SNMPv1 or SNMPv2 trap, raising ValueError if it is none."""
+    try:
+        tag, index, _ = _read_header(data, 0)
+        if tag != SEQUENCE:
+            raise ValueError("Not an SNMP message")
+        version, index = _read_integer(data, index)
+        _, start, index = _read_header(data, index)
+        community = data[start:index]
+        pdu_type, index, _ = _read_header(data, index)
+        if pdu_type == TRAP:
+            _, start, index = _read_header(data, index)
+            enterprise = _decode_oid(data[start:index])
+            _, start, index = _read_header(data, index)
+            agent_address = ".".join(map(str, data[start:index]))
+            generic, index = _read_integer(data, index)
+            specific, index = _read_integer(data, index)
+            _, start, index = _read_header(data, index)
+            uptime = int.from_bytes(data[start:index], "big")
+            if generic == _ENTERPRISE_SPECIFIC:
+                oid = Oid((*enterprise, 0, specific))
+            else:
+                # the generic traps, such as coldStart, are snmpTraps.1 to 6
+                oid = Oid((1, 3, 6, 1, 6, 3, 1, 1, 5, generic + 1))
+            return Trap(
+                version, community, oid, uptime, agent_address, _read_var_binds(data, index)
+            )
+        if pdu_type != TRAP_V2:
+            raise ValueError(f"Not a trap: PDU type {pdu_type:#x}")
+        for _ in range(3):  # request id, error status and error index
+            _, _, index = _read_header(data, index)
+        var_binds = _read_var_binds(data, index)
+    except IndexError as err:
+        raise ValueError("Truncated message") from err
+    if (
+        len(var_binds) < 2
+        or var_binds[0][0] != SYS_UPTIME
+        or var_binds[1][0] != SNMP_TRAP_OID
+    ):
+        raise ValueError("Trap without sysUpTime and snmpTrapOID")
+    return Trap(
+        version,
+        community,
+        cast(Oid, var_binds[1][1]),
+        cast(int, var_binds[0][1]),
+        None,
+        var_binds[2:],
+    )
+
+
+class _Request:
+    """Request of the fast path waiting for its response."""
+
+    __slots__ = ("address", "message", "future", "timeout", "retries", "deadline")
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        message: bytes,
+        future: asyncio.Future,
+        timeout: float,
+        retries: int,
+    ) -> None:
+        """Initialize."""
+        self.address = address
+        self.message = message
+        self.future = future
+        self.timeout = timeout
+        self.retries = retries
+        self.deadline = 0.0
+
+
+class BerClient(asyncio.DatagramProtocol):
+    """UDP endpoint of the fast path, shared by any number of printers.
+
+    All requests go out through one socket and responses are matched to
+    them by request id and source address.  A request is sent again after
+    ``timeout`` seconds, up to ``retries`` times, with the same request id.
+
+    Requests issued during one turn of the event loop are written to the
+    socket together at the end of it, and their timeouts are kept in one
+    timing wheel that a single timer advances, instead of a timer for
+    every request.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._transport: asyncio.DatagramTransport | None = None
+        self._opening: asyncio.Future | None = None
+        self._pending: dict[int, _Request] = {}
+        self._request_id = random.randrange(MIN_REQUEST_ID, MAX_REQUEST_ID)
+        # datagrams to write at the end of the current turn of the loop
+        self._outbox: list[tuple[bytes, tuple[str, int]]] = []
+        # request ids by the slot of their deadline, the next tick to handle
+        # and the timer that handles it
+        self._wheel: list[list[int]] = [[] for _ in range(WHEEL_SLOTS)]
+        self._waiting = 0
+        self._tick = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        self._transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Resolve the request a response belongs to."""
+        try:
+            response = decode_message(data)
+        except ValueError as err:
+            _LOGGER.debug("Malformed response from %s: %s", addr, err)
+            return
+        request = self._pending.get(response.request_id)
+        if request is None or request.address != addr[:2]:
+            return
+        del self._pending[response.request_id]
+        if not request.future.done():
+            request.future.set_result(response)
+
+    def error_received(self, exc: Exception) -> None:
+        """Ignore ICMP errors, the request times out instead."""
+        _LOGGER.debug("Socket error: %s", exc)
+
+    async def _async_transport(self) -> asyncio.DatagramTransport:
+        """Open the socket on first use."""
+        if self._transport is None:
+            if self._opening is None:
+                self._opening = asyncio.ensure_future(
+                    asyncio.get_running_loop().create_datagram_endpoint(
+                        lambda: self, local_addr=("0.0.0.0", 0)
+                    )
+                )
+            await self._opening
+        assert self._transport is not None
+        return self._transport
+
+    def _next_request_id(self) -> int:
+        """Return the next request id, wrapping within four octets."""
+        self._request_id += 1
+        if self._request_id >= MAX_REQUEST_ID:
+            self._request_id = MIN_REQUEST_ID
+        return self._request_id
+
+    def _send(self, message: bytes, address: tuple[str, int]) -> None:
+        """Queue a datagram, the queue is written at the end of this turn."""
+        if not self._outbox:
+            asyncio.get_running_loop().call_soon(self._flush)
+        self._outbox.append((message, address))
+
+    def _flush(self) -> None:
+        """Write the queued datagrams."""
+        outbox, self._outbox = self._outbox, []
+        if (transport := self._transport) is None:
+            return
+        sendto = transport.sendto
+        for message, address in outbox:
+            sendto(message, address)
+
+    def _schedule(self, request_id: int, request: _Request, now: float) -> None:
+        """Put a request into the slot of the wheel of its deadline."""
+        request.deadline = now + request.timeout
+        tick = max(int(request.deadline / WHEEL_RESOLUTION) + 1, self._tick)
+        self._wheel[tick % WHEEL_SLOTS].append(request_id)
+        self._waiting += 1
+        if self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._tick = int(now / WHEEL_RESOLUTION) + 1
+            self._timer = loop.call_at(self._tick * WHEEL_RESOLUTION, self._advance)
+
+    def _advance(self) -> None:
+        """Handle the slots of the wheel up to now, retry or expire requests."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        last = min(int(now / WHEEL_RESOLUTION), self._tick + WHEEL_SLOTS - 1)
+        while self._tick <= last:
+            slot = self._wheel[self._tick % WHEEL_SLOTS]
+            self._tick += 1
+            if not slot:
+                continue
+            later = []
+            for request_id in slot:
+                if (request := self._pending.get(request_id)) is None:
+                    self._waiting -= 1
+                elif request.deadline > now:
+                    # due in a later turn of the wheel
+                    later.append(request_id)
+                elif request.retries:
+                    request.retries -= 1
+                    self._waiting -= 1
+                    self._send(request.message, request.address)
+                    self._schedule(request_id, request, now)
+                else:
+                    self._waiting -= 1
+                    del self._pending[request_id]
+                    if not request.future.done():
+                        request.future.set_result(None)
+            slot[:] = later
+        if self._waiting:
+            self._timer = loop.call_at(self._tick * WHEEL_RESOLUTION, self._advance)
+        else:
+            self._timer = None
+
+    async def async_request(
+        self, address: tuple[str, int], template: Template, timeout: float, retries: int
+    ) -> Response | None:
+        """Send a request, return the response or None if it timed out."""
+        await self._async_transport()
+        loop = asyncio.get_running_loop()
+        request_id = self._next_request_id()
+        message = encode_request(template, request_id)
+        request = _Request(address, message, loop.create_future(), timeout, retries)
+        self._pending[request_id] = request
+        self._send(message, address)
+        self._schedule(request_id, request, loop.time())
+        try:
+            return cast(Optional[Response], await request.future)
+        finally:
+            self._pending.pop(request_id, None)
+
+    def close(self) -> None:
+        """Close the socket, pending requests time out at once."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        self._opening = None
+        pending, self._pending = self._pending, {}
+        for request in pending.values():
+            if not request.future.done():
+                request.future.set_result(None)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for slot in self._wheel:
+            slot.clear()
+        self._waiting = 0
+        self._outbox = []
@@ -0,0 +1,106 @@
+"""Circuit breaker for printers that stopped answering."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from .const import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    DEFAULT_BACKOFF,
+    DEFAULT_BACKOFF_MULTIPLIER,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_MAX_BACKOFF,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Track failed polls of one printer and decide when to try again.
+
+    The circuit is closed while polls succeed.  After ``failure_threshold``
+    consecutive failures it opens, and polls fail immediately for
+    ``backoff`` seconds.  Then it is half-open: a single probe decides
+    whether the circuit closes again or stays open for ``multiplier`` times
+    as long, up to ``max_backoff``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        backoff: float = DEFAULT_BACKOFF,
+        multiplier: float = DEFAULT_BACKOFF_MULTIPLIER,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+    ) -> None:
+        """Initialize."""
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+
+        self._failure_threshold = failure_threshold
+        self._initial_backoff = backoff
+        self._multiplier = multiplier
+        self._max_backoff = max_backoff
+        self._backoff = backoff
+        self._failures = 0
+        self._state = CIRCUIT_CLOSED
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        """Return the state of the circuit."""
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        """Return the number of consecutive failures."""
+        return self._failures
+
+    @property
+    def retry_in(self) -> float:
+        """Return seconds until the next probe is allowed."""
+        if self._state != CIRCUIT_OPEN:
+            return 0.0
+        return max(self._opened_at + self._backoff - time.monotonic(), 0.0)
+
+    def allow_probe(self) -> bool:
+        """Return True if an open circuit may be probed now.
+
+        Only one probe at a time is allowed, the circuit is half-open until
+        the probe is recorded as success or failure.
+        """
+        if self._state != CIRCUIT_OPEN or self.retry_in > 0:
+            return False
+        self._state = CIRCUIT_HALF_OPEN
+        return True
+
+    def cancel_probe(self) -> None:
+        """Reopen a half-open circuit whose probe did not finish.
+
+        A cancelled probe says nothing about the printer, so the backoff
+        stays as it was and the next poll may probe right away.
+        """
+        if self._state == CIRCUIT_HALF_OPEN:
+            self._state = CIRCUIT_OPEN
+
+    def record_success(self) -> None:
+        """Record a successful poll or probe."""
+        if self._state != CIRCUIT_CLOSED:
+            _LOGGER.debug("Circuit closed after %d failures", self._failures)
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._backoff = self._initial_backoff
+
+    def record_failure(self) -> None:
+        """Record a failed poll or probe."""
+        self._failures += 1
+        if self._state == CIRCUIT_HALF_OPEN:
+            self._backoff = min(self._backoff * self._multiplier, self._max_backoff)
+        elif self._failures < self._failure_threshold:
+            return
+        if self._state != CIRCUIT_OPEN:
+            _LOGGER.debug("Circuit open for %s seconds", self._backoff)
+        self._state = CIRCUIT_OPEN
+        self._opened_at = time.monotonic()
@@ -11,6 +11,7 @@ ATTR_DEVICE_STATUS: Final[str] = "device_status"
 ATTR_PRINTER_DETECTED_ERROR_STATE: Final[str] = "printer_detected_error_state"
 ATTR_PRINTER_STATUS_PAPER: Final[str] = "printer_status_paper"
 ATTR_PRINTER_STATUS_TONER: Final[str] = "printer_status_toner"
+ATTR_CONDITIONS: Final[str] = "conditions"
 ATTR_STATUS: Final[str] = "status"
 ATTR_UPTIME: Final[str] = "uptime"
 ATTR_NAME: Final[str] = "name"
@@ -25,6 +26,11 @@ ATTR_OUTPUT_TRAY: Final[str] = "output_tray"
 ATTR_TYPE: Final[str] = "type"
 ATTR_MEDIA: Final[str] = "media"
 ATTR_PAGE_DELIVERY: Final[str] = "page_delivery"
+ATTR_SEVERITY: Final[str] = "severity"
+ATTR_ALERT_GROUP: Final[str] = "alert_group"
+ATTR_INDEX: Final[str] = "index"
+ATTR_LOCATION: Final[str] = "location"
+ATTR_CODE: Final[str] = "code"
 
 VAL_STATUS_UNKNOWN: Final[str] = "unknown"
 VAL_STATUS_STANDBY: Final[str] = "standby"
@@ -66,6 +72,113 @@ VAL_CONT_FAN_FOLD: Final[str] = "continous fan-fold"
 VAL_FACE_UP: Final[str] = "face up"
 VAL_FACE_DOWN: Final[str] = "face down"
 
+# seconds a resolved printer address is reused before asking the resolver again
+ADDRESS_CACHE_TTL: Final[int] = 300
+
+# bounds of the retransmission timeout derived from measured round-trip times,
+# the pysnmp dispatcher checks timeouts every half second
+INITIAL_TIMEOUT: Final[float] = 1.0
+MIN_TIMEOUT: Final[float] = 0.5
+MAX_TIMEOUT: Final[float] = 8.0
+TIMER_RESOLUTION: Final[float] = 0.5
+# seconds one request may take with all its retries, and the most retries
+REQUEST_BUDGET: Final[float] = 4.0
+MAX_RETRIES: Final[int] = 3
+
+# circuit breaker: consecutive failed polls that open the circuit, seconds
+# until the first recovery probe, growth of that delay per failed probe and
+# its upper bound
+DEFAULT_FAILURE_THRESHOLD: Final[int] = 3
+DEFAULT_BACKOFF: Final[float] = 30.0
+DEFAULT_BACKOFF_MULTIPLIER: Final[float] = 2.0
+DEFAULT_MAX_BACKOFF: Final[float] = 900.0
+
+CIRCUIT_CLOSED: Final[str] = "closed"
+CIRCUIT_OPEN: Final[str] = "open"
+CIRCUIT_HALF_OPEN: Final[str] = "half_open"
+
+# port on which printers send traps
+DEFAULT_TRAP_PORT: Final[int] = 162
+
+# discovery: GET requests sent per second, seconds to wait for each answer
+# and the name a Dell printer's sysDescr starts with
+DEFAULT_DISCOVERY_RATE: Final[float] = 1000.0
+DEFAULT_DISCOVERY_TIMEOUT: Final[float] = 1.0
+DELL_VENDOR: Final[str] = "Dell"
+# supply history: samples kept per supply, and the share of its capacity a
+# level must rise by to be a new supply rather than jitter of the reading
+DEFAULT_HISTORY_SIZE: Final[int] = 256
+HISTORY_RESET_RISE: Final[float] = 0.1
+# sharded fleets: results a worker process sends back at once, and seconds
+# a result may wait for others to fill its batch
+SHARD_BATCH_SIZE: Final[int] = 100
+SHARD_FLUSH_INTERVAL: Final[float] = 0.05
+
+# table rows fetched per GETBULK request, printer tables rarely have more
+DEFAULT_MAX_REPETITIONS: Final[int] = 10
+
+# largest SNMP message to ask for, fits an Ethernet frame without fragmentation
+DEFAULT_MAX_MESSAGE_SIZE: Final[int] = 1472
+# every SNMP agent must accept messages of this size
+MIN_MESSAGE_SIZE: Final[int] = 484
+# message, community and PDU headers of a GET response
+GET_MESSAGE_OVERHEAD: Final[int] = 48
+
+COMMUNITY: Final[str] = "public"
+
+# request ids of the fast path, always encoded in four octets
+MIN_REQUEST_ID: Final[int] = 0x800000
+MAX_REQUEST_ID: Final[int] = 0x7FFFFFFF
+# encoded request templates kept by the fast path
+TEMPLATE_CACHE_SIZE: Final[int] = 1024
+# timing wheel of the fast path: seconds per slot and number of slots, a
+# timeout longer than one turn of the wheel waits for further turns
+WHEEL_RESOLUTION: Final[float] = 0.01
+WHEEL_SLOTS: Final[int] = 512
+
+# groups of data that can be polled on their own
+GROUP_STATUS: Final[str] = "status"
+GROUP_SUPPLIES: Final[str] = "supplies"
+GROUP_COVERS: Final[str] = "covers"
+GROUP_TRAYS: Final[str] = "trays"
+POLL_GROUPS: Final[frozenset[str]] = frozenset(
+    (GROUP_STATUS, GROUP_SUPPLIES, GROUP_COVERS, GROUP_TRAYS)
+)
+# seconds between polls of each group by the scheduler, and the share of an
+# interval by which each one varies at random to spread the load
+DEFAULT_INTERVALS: Final[dict[str, float]] = {
+    GROUP_STATUS: 10.0,
+    GROUP_SUPPLIES: 300.0,
+    GROUP_COVERS: 3600.0,
+    GROUP_TRAYS: 3600.0,
+}
+DEFAULT_JITTER: Final[float] = 0.1
+# percentages of capacity at which a watch reports a supply level
+DEFAULT_LEVEL_THRESHOLDS: Final[tuple[int, ...]] = (50, 25, 10, 5, 0)
+# poll group of each table, by table and by data key, which share their names
+TABLE_GROUPS: Final[dict[str, str]] = {
+    ATTR_SUPPLIES: GROUP_SUPPLIES,
+    ATTR_COVER: GROUP_COVERS,
+    ATTR_INPUT_TRAY: GROUP_TRAYS,
+    ATTR_OUTPUT_TRAY: GROUP_TRAYS,
+}
+
+# phases of a poll that metrics time, table walks are "walk_" plus the table
+PHASE_RESOLVE: Final[str] = "resolve"
+PHASE_PROBE: Final[str] = "probe"
+PHASE_SCALARS: Final[str] = "scalars"
+PHASE_WALK: Final[str] = "walk_"
+PHASE_VOLATILE: Final[str] = "volatile"
+PHASE_DECODE: Final[str] = "decode"
+
+# prefix of exported metric names, and the port of the metrics exporter
+METRICS_NAMESPACE: Final[str] = "dell_printer"
+DEFAULT_METRICS_PORT: Final[int] = 9877
+# prefix length of the IPv4 network, and of the IPv6 one, that makes up the
+# segment label of a printer's metrics
+DEFAULT_SEGMENT_PREFIX: Final[int] = 24
+DEFAULT_SEGMENT_PREFIX_V6: Final[int] = 64
+
 OIDS: Final[dict[str, str]] = {
     ATTR_MODEL: "1.3.6.1.2.1.1.1.0",
     ATTR_PAGE_COUNT: "1.3.6.1.2.1.43.10.2.1.4.1.1",
@@ -76,6 +189,20 @@ OIDS: Final[dict[str, str]] = {
     ATTR_UPTIME: "1.3.6.1.2.1.1.3.0",
 }
 
+# prtGeneralConfigChanges, counts configuration changes such as a new tray
+CONFIG_CHANGES_OID: Final[str] = "1.3.6.1.2.1.43.5.1.1.1.1"
+
+# printerV2Alert, and printerV1Alert as translated by RFC 3584
+PRINTER_ALERT_OID: Final[str] = "1.3.6.1.2.1.43.18.2.0.1"
+# prtAlertTable columns that printer alerts carry, indexed by the alert
+ALERT_OIDS: Final[dict[str, str]] = {
+    ATTR_SEVERITY: "1.3.6.1.2.1.43.18.1.1.2",
+    ATTR_ALERT_GROUP: "1.3.6.1.2.1.43.18.1.1.4",
+    ATTR_INDEX: "1.3.6.1.2.1.43.18.1.1.5",
+    ATTR_LOCATION: "1.3.6.1.2.1.43.18.1.1.6",
+    ATTR_CODE: "1.3.6.1.2.1.43.18.1.1.7",
+}
+
 SUPPLIES_OIDS: Final[dict[str, str]] = {
     ATTR_NAME: "1.3.6.1.2.1.43.11.1.1.6.1",
     ATTR_COLOR: "1.3.6.1.2.1.43.12.1.1.4",
@@ -104,6 +231,27 @@ OUTPUT_TRAYS_OIDS: Final[dict[str, str]] = {
     ATTR_PAGE_DELIVERY: "1.3.6.1.2.1.43.9.2.1.20",
 }
 
+# values that only change with the hardware or configuration, kept in the
+# device profile instead of being polled every time
+STATIC_OIDS: Final[tuple[str, ...]] = (
+    OIDS[ATTR_MODEL],
+    OIDS[ATTR_SERIAL],
+)
+
+STATIC_TABLE_OIDS: Final[tuple[str, ...]] = (
+    SUPPLIES_OIDS[ATTR_NAME],
+    SUPPLIES_OIDS[ATTR_COLOR],
+    SUPPLIES_OIDS[ATTR_CAPACITY],
+    COVERS_OIDS[ATTR_NAME],
+    INPUT_TRAYS_OIDS[ATTR_NAME],
+    INPUT_TRAYS_OIDS[ATTR_TYPE],
+    INPUT_TRAYS_OIDS[ATTR_CAPACITY],
+    OUTPUT_TRAYS_OIDS[ATTR_NAME],
+    OUTPUT_TRAYS_OIDS[ATTR_TYPE],
+    OUTPUT_TRAYS_OIDS[ATTR_CAPACITY],
+    OUTPUT_TRAYS_OIDS[ATTR_PAGE_DELIVERY],
+)
+
 STATUS_MAP: Final[dict[str, dict[str, str]]] = {
     "2": {
         "1": VAL_STATUS_STANDBY,
@@ -176,14 +324,34 @@ PAGE_DELIVERY_MAP: Final[dict[str, str]] = {
     "4": VAL_FACE_DOWN,
 }
 
+# hrPrinterDetectedErrorState bits in RFC 3805 order, starting with the most
+# significant bit of the first octet
+PRINTER_ERROR_STATE_BITS: Final[tuple[str, ...]] = (
+    "low_paper",
+    "no_paper",
+    "low_toner",
+    "no_toner",
+    "door_open",
+    "jammed",
+    "offline",
+    "service_requested",
+    "input_tray_missing",
+    "output_tray_missing",
+    "marker_supply_missing",
+    "output_near_full",
+    "output_full",
+    "input_tray_empty",
+    "overdue_prevent_maint",
+)
+
+# bits of the first octet of hrPrinterDetectedErrorState, from the least to
+# the most severe, the most severe bit that is set wins
 PRINTER_STATUS_PAPER_MAP: Final[dict[int, str]] = {
-    0b00000000: VAL_PRINTER_STATUS_PAPER_OK,
     0b10000000: VAL_PRINTER_STATUS_PAPER_LOW,
     0b01000000: VAL_PRINTER_STATUS_PAPER_EMPTY,
 }
 
 PRINTER_STATUS_TONER_MAP: Final[dict[int, str]] = {
-    0b00000000: VAL_PRINTER_STATUS_TONER_OK,
     0b00100000: VAL_PRINTER_STATUS_TONER_LOW,
     0b00010000: VAL_PRINTER_STATUS_TONER_EMPTY,
 }
@@ -192,3 +360,51 @@ PRINTER_STATUS_CRITICAL_MAP: Final[dict[int, str]] = {
     0b00001000: VAL_PRINTER_STATUS_OPENDOOR,
     0b00000100: VAL_PRINTER_STATUS_JAMMED,
 }
+
+ALERT_SEVERITY_MAP: Final[dict[str, str]] = {
+    "1": VAL_OTHER,
+    "3": VAL_STATUS_CRITICAL,
+    "4": VAL_STATUS_WARNING,
+    "5": VAL_STATUS_WARNING,
+}
+
+# poll groups whose data an alert of a prtAlertGroup may have changed, the
+# status group holds the error state that reflects jams, doors, paper and toner
+ALERT_GROUP_MAP: Final[dict[str, tuple[str, ...]]] = {
+    "5": (GROUP_STATUS,),
+    "6": (GROUP_COVERS, GROUP_STATUS),
+    "8": (GROUP_TRAYS, GROUP_STATUS),
+    "9": (GROUP_TRAYS, GROUP_STATUS),
+    "10": (GROUP_STATUS,),
+    "11": (GROUP_SUPPLIES, GROUP_STATUS),
+    "12": (GROUP_SUPPLIES, GROUP_STATUS),
+    "13": (GROUP_STATUS,),
+}
+
+ALERT_CODE_MAP: Final[dict[str, str]] = {
+    "3": VAL_PRINTER_STATUS_OPENDOOR,
+    "4": VAL_CLOSED,
+    "5": VAL_PRINTER_STATUS_OPENDOOR,
+    "6": VAL_CLOSED,
+    "8": VAL_PRINTER_STATUS_JAMMED,
+    "23": VAL_STATUS_STANDBY,
+    "24": VAL_STATUS_WARMUP,
+    "501": VAL_PRINTER_STATUS_OPENDOOR,
+    "502": VAL_CLOSED,
+    "503": VAL_STATUS_WARMUP,
+    "507": VAL_STATUS_IDLE,
+    "807": VAL_PRINTER_STATUS_PAPER_LOW,
+    "808": VAL_PRINTER_STATUS_PAPER_EMPTY,
+    "1101": VAL_PRINTER_STATUS_TONER_EMPTY,
+    "1102": VAL_PRINTER_STATUS_TONER_EMPTY,
+    "1104": VAL_PRINTER_STATUS_TONER_LOW,
+    "1105": VAL_PRINTER_STATUS_TONER_LOW,
+}
+
+# codes of any subunit, subunitAlmostEmpty and subunitEmpty, by the
+# prtAlertGroup of the subunit that runs low; other groups have no status
+ALERT_SUBUNIT_CODE_MAP: Final[dict[str, dict[str, str]]] = {
+    "8": {"12": VAL_PRINTER_STATUS_PAPER_LOW, "13": VAL_PRINTER_STATUS_PAPER_EMPTY},
+    "11": {"12": VAL_PRINTER_STATUS_TONER_LOW, "13": VAL_PRINTER_STATUS_TONER_EMPTY},
+    "12": {"12": VAL_PRINTER_STATUS_TONER_LOW, "13": VAL_PRINTER_STATUS_TONER_EMPTY},
+}
@@ -0,0 +1,203 @@
+"""Decode printer table cells and error states through precomputed tables."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import Any, Final, NamedTuple, Tuple, Union
+
+from .const import (
+    ATTR_COVER,
+    ATTR_CAPACITY,
+    ATTR_INPUT_TRAY,
+    ATTR_LEVEL,
+    ATTR_OUTPUT_TRAY,
+    ATTR_PAGE_DELIVERY,
+    ATTR_STATUS,
+    ATTR_SUPPLIES,
+    ATTR_TYPE,
+    COVER_MAP,
+    COVERS_OIDS,
+    INPUT_TRAYS_OIDS,
+    INPUT_TYPE_MAP,
+    OUTPUT_TRAYS_OIDS,
+    OUTPUT_TYPE_MAP,
+    PAGE_DELIVERY_MAP,
+    PRINTER_ERROR_STATE_BITS,
+    PRINTER_STATUS_CRITICAL_MAP,
+    PRINTER_STATUS_PAPER_MAP,
+    PRINTER_STATUS_TONER_MAP,
+    SUBUNIT_STATUS_MAP,
+    SUPPLIES_OIDS,
+    VAL_PRINTER_STATUS_PAPER_OK,
+    VAL_PRINTER_STATUS_TONER_OK,
+)
+from .model import Cover, InputTray, OutputTray, Supply, _Record
+
+Column = Tuple[str, str, Callable[[Any], Any]]
+# hrPrinterDetectedErrorState as octets or as ISO 8859-1 text of them
+RawErrorState = Union[bytes, str]
+
+
+def _subunit_status(value: Any) -> str:
+    """Decode a prtSubUnitStatus bit field."""
+    value = str(value)
+    if value not in SUBUNIT_STATUS_MAP:
+        # go to the next smallest power of 2
+        value = str(1 << (int(value) - 1).bit_length())
+    return SUBUNIT_STATUS_MAP[value]
+
+
+def _mapped(mapping: dict[str, str]) -> Callable[[Any], str]:
+    """Return a decoder that looks the value up in mapping."""
+    return lambda value: mapping[str(value)]
+
+
+def _text(value: Any) -> str:
+    """Decode a display string, interned as names repeat across printers."""
+    return sys.intern(str(value))
+
+
+_DECODERS: Final[dict[str, dict[str, Callable[[Any], Any]]]] = {
+    ATTR_SUPPLIES: {ATTR_CAPACITY: int, ATTR_LEVEL: int},
+    ATTR_COVER: {ATTR_STATUS: _mapped(COVER_MAP)},
+    ATTR_INPUT_TRAY: {
+        ATTR_TYPE: _mapped(INPUT_TYPE_MAP),
+        ATTR_CAPACITY: int,
+        ATTR_STATUS: _subunit_status,
+    },
+    ATTR_OUTPUT_TRAY: {
+        ATTR_TYPE: _mapped(OUTPUT_TYPE_MAP),
+        ATTR_CAPACITY: int,
+        ATTR_STATUS: _subunit_status,
+        ATTR_PAGE_DELIVERY: _mapped(PAGE_DELIVERY_MAP),
+    },
+}
+
+# tables in the order of the decoded data, input trays have always been
+# reported as output trays and vice versa
+TABLES: Final[dict[str, tuple[str, dict[str, str], type[_Record]]]] = {
+    ATTR_SUPPLIES: (ATTR_SUPPLIES, SUPPLIES_OIDS, Supply),
+    ATTR_COVER: (ATTR_COVER, COVERS_OIDS, Cover),
+    ATTR_OUTPUT_TRAY: (ATTR_INPUT_TRAY, INPUT_TRAYS_OIDS, InputTray),
+    ATTR_INPUT_TRAY: (ATTR_OUTPUT_TRAY, OUTPUT_TRAYS_OIDS, OutputTray),
+}
+
+# numeric column OID -> (data key, attribute, decoder)
+COLUMN_INDEX: Final[dict[tuple[int, ...], Column]] = {
+    tuple(int(sub_id) for sub_id in oid.split(".")): (
+        key,
+        attr,
+        _DECODERS[group].get(attr, _text),
+    )
+    for key, (group, oids, _) in TABLES.items()
+    for attr, oid in oids.items()
+}
+
+_PREFIX_LENGTHS: Final[tuple[int, ...]] = tuple(
+    sorted({len(column) for column in COLUMN_INDEX}, reverse=True)
+)
+
+
+def lookup_column(oid: Iterable[int]) -> Column | None:
+    """Return data key, attribute and decoder of a table cell's OID."""
+    oid = tuple(oid)
+    for length in _PREFIX_LENGTHS:
+        if (column := COLUMN_INDEX.get(oid[:length])) is not None:
+            return column
+    return None
+
+
+def decode_tables(
+    table_rows: dict[str, list[list[tuple[Any, str, Callable[[Any], Any]]]]],
+    values: dict[Any, Any],
+) -> dict[str, tuple[_Record, ...]]:
+    """Decode table cells that were resolved with lookup_column into records.
+
+    Each row is a list of (key, attribute, decoder) cells, the key is looked
+    up in values.  A cell without key is a column that ended before the
+    others, its attribute is left unset.
+    """
+    return {
+        key: tuple(
+            TABLES[key][2](
+                **{
+                    attr: decode(values[cell])
+                    for cell, attr, decode in row
+                    if cell is not None
+                }
+            )
+            for row in rows
+        )
+        for key, rows in table_rows.items()
+    }
+
+
+class ErrorState(NamedTuple):
+    """Decoded hrPrinterDetectedErrorState.
+
+    ``conditions`` holds the names of all bits that are set, see
+    ``PRINTER_ERROR_STATE_BITS``.  ``critical`` is the more specific status
+    of a printer in critical state, if any, ``paper`` and ``toner`` the
+    most severe paper and toner conditions.
+    """
+
+    conditions: frozenset[str]
+    critical: str | None
+    paper: str
+    toner: str
+
+
+def _most_severe(octet: int, mapping: dict[int, str], default: Any) -> Any:
+    """Return the value of the last bit of mapping set in octet."""
+    for bit, value in mapping.items():
+        if octet & bit:
+            default = value
+    return default
+
+
+def _octet_conditions(octet: int, bits: tuple[str, ...]) -> frozenset[str]:
+    """Return the names of the bits set in octet, ``bits`` from the highest."""
+    return frozenset(name for shift, name in enumerate(bits) if octet & 0x80 >> shift)
+
+
+# error states of every first octet, conditions of every second octet
+_ERROR_STATES: Final[tuple[ErrorState, ...]] = tuple(
+    ErrorState(
+        _octet_conditions(octet, PRINTER_ERROR_STATE_BITS[:8]),
+        _most_severe(octet, PRINTER_STATUS_CRITICAL_MAP, None),
+        _most_severe(octet, PRINTER_STATUS_PAPER_MAP, VAL_PRINTER_STATUS_PAPER_OK),
+        _most_severe(octet, PRINTER_STATUS_TONER_MAP, VAL_PRINTER_STATUS_TONER_OK),
+    )
+    for octet in range(256)
+)
+_SECOND_OCTET_CONDITIONS: Final[tuple[frozenset[str], ...]] = tuple(
+    _octet_conditions(octet, PRINTER_ERROR_STATE_BITS[8:]) for octet in range(256)
+)
+
+
+def decode_error_state(raw: RawErrorState) -> ErrorState:
+    """Decode the bit string of hrPrinterDetectedErrorState.
+
+    Printers send one or two octets; missing octets count as zero and
+    further octets are ignored.
+    """
+    octets = raw.encode("iso-8859-1") if isinstance(raw, str) else raw
+    if not octets:
+        return _ERROR_STATES[0]
+    if len(octets) > 1 and octets[1]:
+        return _two_octet_error_state(octets[0], octets[1])
+    return _ERROR_STATES[octets[0]]
+
+
+@lru_cache(maxsize=1024)
+def _two_octet_error_state(first: int, second: int) -> ErrorState:
+    """Return the error state of a second octet that is not zero."""
+    state = _ERROR_STATES[first]
+    return ErrorState(state.conditions | _SECOND_OCTET_CONDITIONS[second], *state[1:])
+
+
+def decode_error_states(raws: Iterable[RawErrorState]) -> list[ErrorState]:
+    """Decode the hrPrinterDetectedErrorState of many printers."""
+    return list(map(decode_error_state, raws))
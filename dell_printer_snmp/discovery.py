@@ -0,0 +1,176 @@
+"""Find Dell printers in IPv4 networks.
+
+Every address gets a single GET of ``sysDescr`` and
+``prtGeneralSerialNumber``.  All requests go out through one socket at a
+fixed rate, so a /16 takes about a minute at the default rate without
+flooding the network::
+
+    python -m dell_printer_snmp.discovery 192.168.0.0/24 --rate 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import ipaddress
+import logging
+from collections.abc import AsyncGenerator, Iterable, Iterator
+from typing import NamedTuple
+
+from . import ber
+from .ber import BerClient, Octets
+from .const import (
+    ATTR_MODEL,
+    ATTR_SERIAL,
+    DEFAULT_DISCOVERY_RATE,
+    DEFAULT_DISCOVERY_TIMEOUT,
+    DELL_VENDOR,
+    OIDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# SNMPv1, which every printer answers
+_TEMPLATE = ber.request_template(
+    0, ber.GET, (ber.parse_oid(OIDS[ATTR_MODEL]), ber.parse_oid(OIDS[ATTR_SERIAL]))
+)
+
+
+class DiscoveredPrinter(NamedTuple):
+    """Printer that answered a discovery request."""
+
+    host: str
+    port: int
+    model: str
+    serial: str
+
+
+def _parse_networks(networks: Iterable[str]) -> list[ipaddress.IPv4Network]:
+    """Return networks in CIDR notation or addresses, raising on a bad one."""
+    parsed = []
+    for network in networks:
+        try:
+            parsed.append(ipaddress.IPv4Network(network, strict=False))
+        except ValueError as err:
+            raise ValueError(f"Bad network: {network}: {err}") from err
+    return parsed
+
+
+def iterate_hosts(networks: Iterable[str]) -> Iterator[str]:
+    """Iterate the host addresses of networks in CIDR notation or addresses.
+
+    All networks are checked before the first host, a bad one raises
+    ValueError right away.
+    """
+    parsed = _parse_networks(networks)
+    return (str(host) for network in parsed for host in network.hosts())
+
+
+def identify(response: ber.Response) -> tuple[str, str] | None:
+    """Return model and serial number of a Dell printer, or None."""
+    if response.error_status or len(response.var_binds) != 2:
+        return None
+    (_, model), (_, serial) = response.var_binds
+    if not isinstance(model, Octets) or not isinstance(serial, Octets):
+        return None
+    model, serial = str(model).strip(), str(serial).strip()
+    if not model.startswith(DELL_VENDOR):
+        return None
+    return model, serial
+
+
+async def async_discover(
+    networks: Iterable[str],
+    port: int = 161,
+    rate: float = DEFAULT_DISCOVERY_RATE,
+    timeout: float = DEFAULT_DISCOVERY_TIMEOUT,
+    client: BerClient | None = None,
+) -> AsyncGenerator[DiscoveredPrinter, None]:
+    """Send one GET to every host of networks, yield the Dell printers.
+
+    Requests are sent at ``rate`` per second over the socket of ``client``,
+    and answers are yielded as they arrive.  Hosts that do not answer within
+    ``timeout`` seconds are not asked again.  Bad networks raise ValueError
+    before any request is sent.
+    """
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    hosts = iterate_hosts(networks)
+    own_client = client is None
+    client = client or BerClient()
+    loop = asyncio.get_running_loop()
+    found: asyncio.Queue[DiscoveredPrinter | None] = asyncio.Queue()
+    requests: set[asyncio.Future] = set()
+
+    async def request(host: str) -> None:
+        assert client is not None
+        response = await client.async_request((host, port), _TEMPLATE, timeout, 0)
+        if response is None:
+            return
+        if (printer := identify(response)) is None:
+            _LOGGER.debug("%s is no Dell printer: %s", host, response.var_binds)
+            return
+        found.put_nowait(DiscoveredPrinter(host, port, *printer))
+
+    async def send() -> None:
+        start = loop.time()
+        try:
+            for sent, host in enumerate(hosts):
+                # sleep only when ahead of the rate, sending in bursts otherwise
+                if (delay := start + sent / rate - loop.time()) > 0:
+                    await asyncio.sleep(delay)
+                future = asyncio.ensure_future(request(host))
+                requests.add(future)
+                future.add_done_callback(requests.discard)
+            if requests:
+                await asyncio.wait(set(requests))
+        finally:
+            # wakes the generator, which raises what went wrong from here
+            found.put_nowait(None)
+
+    sender = asyncio.ensure_future(send())
+    try:
+        while (printer := await found.get()) is not None:
+            yield printer
+        await sender
+    finally:
+        sender.cancel()
+        for future in requests:
+            future.cancel()
+        await asyncio.gather(sender, *requests, return_exceptions=True)
+        if own_client:
+            client.close()
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Print the printers found in the networks."""
+    async for printer in async_discover(
+        args.networks, args.port, args.rate, args.timeout
+    ):
+        print(f"{printer.host}\t{printer.model}\t{printer.serial}")
+
+
+def main() -> None:
+    """Parse arguments and run a discovery."""
+    parser = argparse.ArgumentParser(description="Find Dell printers in networks.")
+    parser.add_argument("networks", nargs="+", help="such as 192.168.0.0/24")
+    parser.add_argument("--port", type=int, default=161)
+    parser.add_argument(
+        "--rate", type=float, default=DEFAULT_DISCOVERY_RATE, help="requests per second"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_DISCOVERY_TIMEOUT, help="seconds"
+    )
+    args = parser.parse_args()
+    try:
+        _parse_networks(args.networks)
+    except ValueError as err:
+        parser.error(str(err))
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
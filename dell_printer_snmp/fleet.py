@@ -0,0 +1,131 @@
+"""Concurrent polling of many Dell printers over one SNMP engine."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Iterable
+from typing import Any, NamedTuple
+
+import pysnmp.hlapi.asyncio as hlapi
+
+from . import DellPrinterSnmp, PrinterState
+from .ber import BerClient
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+class FleetResult(NamedTuple):
+    """Outcome of polling one printer of a fleet."""
+
+    host: str
+    data: PrinterState | None
+    error: Exception | None
+
+    def outcome(self) -> PrinterState | Exception:
+        """Return the data, or the error if the poll failed."""
+        if self.error is not None:
+            return self.error
+        assert self.data is not None
+        return self.data
+
+
+class DellPrinterFleet:
+    """Poll a list of printers concurrently with bounded concurrency.
+
+    All printers share one SNMP engine, and with it one UDP socket and one
+    dispatcher.  At most ``max_concurrency`` polls are in flight at any time,
+    so a sweep takes roughly as long as the slowest printers rather than the
+    sum of all of them, while sockets, tasks and pending requests stay bounded
+    regardless of the number of hosts.  A deadline in seconds keeps a slow
+    printer from holding a polling slot for longer than that.
+    """
+
+    def __init__(
+        self,
+        hosts: Iterable[str],
+        port: int = 161,
+        snmp_engine: hlapi.SnmpEngine = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        deadline: float | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize."""
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self._own_snmp_engine = snmp_engine is None
+        self._snmp_engine = snmp_engine or hlapi.SnmpEngine()
+        self._max_concurrency = max_concurrency
+        self._deadline = deadline
+        # printers on the fast path share one socket, too
+        self._ber_client = None
+        if kwargs.get("fast_path") is True:
+            kwargs["fast_path"] = self._ber_client = BerClient()
+        self._printers = {
+            host: DellPrinterSnmp(
+                host, port, snmp_engine=self._snmp_engine, **kwargs
+            )
+            for host in dict.fromkeys(hosts)
+        }
+
+        _LOGGER.debug("Fleet of %d printers", len(self._printers))
+
+    @property
+    def printers(self) -> dict[str, DellPrinterSnmp]:
+        """Return printers of the fleet by host."""
+        return self._printers
+
+    async def async_poll(
+        self, groups: Iterable[str] | None = None
+    ) -> AsyncGenerator[FleetResult, None]:
+        """Poll all printers, yielding each result as soon as it completes.
+
+        With groups only their data is polled, see ``DellPrinterSnmp``.
+        """
+        results: asyncio.Queue[FleetResult] = asyncio.Queue()
+        hosts = iter(self._printers)
+
+        async def worker() -> None:
+            # workers share one iterator, so each host is polled exactly once
+            for host in hosts:
+                try:
+                    data = await self._printers[host].async_update(
+                        deadline=self._deadline, groups=groups
+                    )
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.debug("Polling %s failed: %s", host, err)
+                    results.put_nowait(FleetResult(host, None, err))
+                else:
+                    results.put_nowait(FleetResult(host, data, None))
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(self._max_concurrency, len(self._printers)))
+        ]
+        try:
+            for _ in range(len(self._printers)):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def async_update(
+        self, groups: Iterable[str] | None = None
+    ) -> dict[str, PrinterState | Exception]:
+        """Poll all printers and return data or the error by host."""
+        return {
+            result.host: result.outcome() async for result in self.async_poll(groups)
+        }
+
+    def shutdown(self) -> None:
+        """Unconfigure the shared SNMP engine."""
+        for printer in self._printers.values():
+            printer.shutdown()
+        if self._ber_client:
+            self._ber_client.close()
+        if self._own_snmp_engine and self._snmp_engine.transportDispatcher:
+            self._snmp_engine.transportDispatcher.closeDispatcher()
@@ -0,0 +1,214 @@
+"""Keep a rolling history of supply levels and forecast when supplies run out.
+
+A ``HistoryStore`` keeps the last levels of every supply of every printer it
+is given states of, in ``array`` columns of timestamps and levels.  Each
+supply also keeps the sums of a least squares fit of its levels over time,
+updated as samples come and go, so a forecast for a whole fleet takes one
+pass over its supplies, however long their histories are::
+
+    history = HistoryStore()
+    async for result in fleet.async_poll(["supplies"]):
+        if result.data is not None:
+            history.record(result.host, result.data)
+    for forecast in history.forecast():
+        print(forecast.host, forecast.supply_index, forecast.empty_at)
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from datetime import datetime, timezone
+from math import fsum
+from operator import mul
+from typing import NamedTuple
+
+from .const import DEFAULT_HISTORY_SIZE, HISTORY_RESET_RISE
+from .model import PrinterState
+
+SECONDS_PER_DAY = 86400
+
+
+class SupplyForecast(NamedTuple):
+    """Consumption of one supply of a printer.
+
+    ``supply_index`` is the position of the supply in the supplies of the
+    printer's state, as ``HistoryStore.history`` takes it.  ``rate`` is the
+    level used per day and ``empty_at`` the time the level reaches zero,
+    both None without two samples at different times.  A supply whose level
+    does not fall, or falls too slowly for a date to tell, has no
+    ``empty_at``.
+    """
+
+    host: str
+    supply_index: int
+    name: str | None
+    level: float
+    capacity: int | None
+    rate: float | None
+    empty_at: datetime | None
+
+
+class _Series:
+    """Ring buffer of the levels of one supply and the sums of their fit."""
+
+    __slots__ = (
+        "name",
+        "capacity",
+        "times",
+        "levels",
+        "start",
+        "origin",
+        "sum_t",
+        "sum_l",
+        "sum_tt",
+        "sum_tl",
+    )
+
+    def __init__(self, name: str | None) -> None:
+        """Initialize."""
+        self.name = name
+        self.capacity: int | None = None
+        self.times = array("d")
+        # levels are whole numbers, exact in single precision up to 2**24
+        self.levels = array("f")
+        # index of the oldest sample once the buffer is full
+        self.start = 0
+        # times in the sums count from here, to keep their precision
+        self.origin = 0.0
+        self.sum_t = self.sum_l = self.sum_tt = self.sum_tl = 0.0
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        del self.times[:]
+        del self.levels[:]
+        self.start = 0
+        self.sum_t = self.sum_l = self.sum_tt = self.sum_tl = 0.0
+
+    def append(self, when: float, level: float, size: int) -> None:
+        """Add a sample, replacing the oldest one if the buffer is full."""
+        if not self.times:
+            self.origin = when
+        elif level - self.levels[self.start - 1] > HISTORY_RESET_RISE * (
+            self.capacity if self.capacity and self.capacity > 0 else level
+        ):
+            # a level that rises by more than jitter belongs to a new cartridge,
+            # without a known capacity by a share of the new level
+            self.clear()
+            self.origin = when
+        if len(self.times) < size:
+            self.times.append(when)
+            self.levels.append(level)
+        else:
+            self._add(self.times[self.start], self.levels[self.start], -1.0)
+            self.times[self.start] = when
+            self.levels[self.start] = level
+            self.start = (self.start + 1) % size
+        self._add(when, level, 1.0)
+        if self.start == 0 and len(self.times) == size:
+            self._rebase()
+
+    def samples(self) -> list[tuple[float, float]]:
+        """Return the samples, oldest first."""
+        order = list(range(self.start, len(self.times))) + list(range(self.start))
+        return [(self.times[index], self.levels[index]) for index in order]
+
+    def forecast(self) -> tuple[float | None, datetime | None]:
+        """Return the level used per day and the time the level reaches zero."""
+        count = len(self.times)
+        denominator = count * self.sum_tt - self.sum_t * self.sum_t
+        if count < 2 or denominator <= 0:
+            return None, None
+        slope = (count * self.sum_tl - self.sum_t * self.sum_l) / denominator
+        if slope >= 0:
+            return 0.0, None
+        intercept = (self.sum_l - slope * self.sum_t) / count
+        empty = self.origin - intercept / slope
+        try:
+            empty_at = datetime.fromtimestamp(empty, timezone.utc)
+        except (OverflowError, ValueError, OSError):
+            # a level that hardly falls runs out past the dates there are
+            empty_at = None
+        return -slope * SECONDS_PER_DAY, empty_at
+
+    def _add(self, when: float, level: float, sign: float) -> None:
+        """Add a sample to the sums, or remove it with a negative sign."""
+        offset = when - self.origin
+        self.sum_t += sign * offset
+        self.sum_l += sign * level
+        self.sum_tt += sign * offset * offset
+        self.sum_tl += sign * offset * level
+
+    def _rebase(self) -> None:
+        """Count times from the oldest sample and sum them up afresh."""
+        self.origin = self.times[self.start]
+        offsets = [when - self.origin for when in self.times]
+        self.sum_t = fsum(offsets)
+        self.sum_l = fsum(self.levels)
+        self.sum_tt = fsum(map(mul, offsets, offsets))
+        self.sum_tl = fsum(map(mul, offsets, self.levels))
+
+
+class HistoryStore:
+    """Last ``size`` levels of every supply of a fleet of printers."""
+
+    def __init__(self, size: int = DEFAULT_HISTORY_SIZE) -> None:
+        """Initialize."""
+        if size < 2:
+            raise ValueError("size must be at least 2")
+        self._size = size
+        # series by host and index of the supply
+        self._series: dict[str, list[_Series]] = {}
+
+    def record(
+        self, host: str, state: PrinterState, timestamp: float | None = None
+    ) -> None:
+        """Add the supply levels of a state of a printer.
+
+        ``timestamp`` is in seconds since the epoch, by default now.
+        Unknown levels are skipped.
+        """
+        if not state.supplies:
+            return
+        when = time.time() if timestamp is None else timestamp
+        series = self._series.setdefault(host, [])
+        for index, supply in enumerate(state.supplies):
+            if index == len(series):
+                series.append(_Series(supply.name))
+            elif series[index].name != supply.name:
+                series[index] = _Series(supply.name)
+            # negative levels are "unknown" or "some remaining"
+            if supply.level is None or supply.level < 0:
+                continue
+            series[index].capacity = supply.capacity
+            series[index].append(when, supply.level, self._size)
+
+    def history(self, host: str, index: int) -> list[tuple[float, float]]:
+        """Return timestamps and levels of a supply, oldest first."""
+        try:
+            return self._series[host][index].samples()
+        except (KeyError, IndexError):
+            return []
+
+    def forget(self, host: str) -> None:
+        """Drop the history of a printer."""
+        self._series.pop(host, None)
+
+    def forecast(self) -> list[SupplyForecast]:
+        """Return the consumption of every supply that has a level."""
+        forecasts = []
+        for host, series in self._series.items():
+            for index, supply in enumerate(series):
+                if not supply.times:
+                    continue
+                forecasts.append(
+                    SupplyForecast(
+                        host,
+                        index,
+                        supply.name,
+                        supply.levels[supply.start - 1],
+                        supply.capacity,
+                        *supply.forecast(),
+                    )
+                )
+        return forecasts
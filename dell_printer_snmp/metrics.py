@@ -0,0 +1,287 @@
+"""Per-poll measurements of printers and their export as Prometheus metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Final
+
+from .const import (
+    DEFAULT_METRICS_PORT,
+    DEFAULT_SEGMENT_PREFIX,
+    DEFAULT_SEGMENT_PREFIX_V6,
+    METRICS_NAMESPACE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE: Final = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE: Final = (
+    "application/openmetrics-text; version=1.0.0; charset=utf-8"
+)
+
+# counted PollMetrics attributes: metric name and help text
+_COUNTERS: Final[dict[str, tuple[str, str]]] = {
+    "round_trips": ("round_trips", "Requests sent, not counting retransmissions"),
+    "retries": ("retries", "Requests sent again after a timeout"),
+    "timeouts": ("timeouts", "Requests that got no response"),
+    "bytes_sent": ("sent_bytes", "Octets of requests sent"),
+    "bytes_received": ("received_bytes", "Octets of responses received"),
+    "var_binds": ("var_binds", "Variable bindings received"),
+}
+
+
+class PollMetrics:
+    """Measurements of one poll of a printer.
+
+    Phases are wall times in seconds and may nest: resolving the address
+    happens within the phase that sends the request.  Retries are inferred
+    from the round-trip time.  The fast path counts received octets
+    exactly, on the pysnmp path they are estimated from the variable
+    bindings.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize."""
+        self.host = host
+        self.port = port
+        self.address: str | None = None
+        self.started = time.time()
+        self.duration = 0.0
+        self.phases: dict[str, float] = {}
+        self.round_trips = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.var_binds = 0
+        self.error: str | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (
+                self.phases.get(name, 0.0) + time.perf_counter() - start
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the measurements as a dict."""
+        return dict(vars(self), phases=dict(self.phases))
+
+    def __repr__(self) -> str:
+        """Return host, duration and phases."""
+        phases = ", ".join(f"{name}={value:.4f}" for name, value in self.phases.items())
+        return f"PollMetrics({self.host}, {self.duration:.4f}s, {phases})"
+
+
+class _PrinterTotals:
+    """Sums of the measurements of one printer."""
+
+    def __init__(self, segment: str) -> None:
+        """Initialize."""
+        self.segment = segment
+        self.polls = 0
+        self.failures = 0
+        self.duration = 0.0
+        self.last_duration = 0.0
+        self.last_poll = 0.0
+        self.phases: dict[str, float] = {}
+        self.counters = dict.fromkeys(_COUNTERS, 0)
+
+
+class MetricsCollector:
+    """Aggregate PollMetrics of any number of printers.
+
+    Pass a collector as ``metrics`` callback to every printer, or to a
+    fleet.  ``render()`` returns the totals in the Prometheus text format or
+    in OpenMetrics, labelled by host and by network segment, the /24
+    network (/64 for IPv6) of the printer's address.
+    """
+
+    def __init__(
+        self,
+        segment_prefix: int = DEFAULT_SEGMENT_PREFIX,
+        segment_prefix_v6: int = DEFAULT_SEGMENT_PREFIX_V6,
+    ) -> None:
+        """Initialize."""
+        self._segment_prefix = segment_prefix
+        self._segment_prefix_v6 = segment_prefix_v6
+        self._printers: dict[str, _PrinterTotals] = {}
+
+    def __call__(self, metrics: PollMetrics) -> None:
+        """Add the measurements of a poll."""
+        segment = self.segment(metrics.address or metrics.host)
+        if (totals := self._printers.get(metrics.host)) is None:
+            totals = self._printers[metrics.host] = _PrinterTotals(segment)
+        totals.segment = segment
+        totals.polls += 1
+        if metrics.error is not None:
+            totals.failures += 1
+        totals.duration += metrics.duration
+        totals.last_duration = metrics.duration
+        totals.last_poll = metrics.started
+        for name, elapsed in metrics.phases.items():
+            totals.phases[name] = totals.phases.get(name, 0.0) + elapsed
+        for attr in _COUNTERS:
+            totals.counters[attr] += getattr(metrics, attr)
+
+    def segment(self, address: str) -> str:
+        """Return the network segment of an address, empty for host names."""
+        try:
+            ip_address = ipaddress.ip_address(address)
+        except ValueError:
+            return ""
+        prefix = (
+            self._segment_prefix if ip_address.version == 4 else self._segment_prefix_v6
+        )
+        return str(ipaddress.ip_network(f"{ip_address}/{prefix}", strict=False))
+
+    def clear(self) -> None:
+        """Forget all measurements."""
+        self._printers.clear()
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Return the totals in the Prometheus text format or in OpenMetrics."""
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: Iterator) -> None:
+            name = f"{METRICS_NAMESPACE}_{name}"
+            # OpenMetrics names the counter family without the _total suffix
+            suffix = "_total" if kind == "counter" else ""
+            family_name = name if openmetrics else name + suffix
+            lines.append(f"# HELP {family_name} {help_text}")
+            lines.append(f"# TYPE {family_name} {kind}")
+            for sample_suffix, labels, value in samples:
+                lines.append(
+                    f"{name}{sample_suffix or suffix}{{{_labels(labels)}}} {_number(value)}"
+                )
+
+        printers = sorted(self._printers.items())
+
+        def per_printer(attr: str) -> Iterator:
+            for host, totals in printers:
+                yield None, {"host": host, "segment": totals.segment}, getattr(
+                    totals, attr
+                )
+
+        family("polls", "counter", "Polls of the printer", per_printer("polls"))
+        family(
+            "poll_failures",
+            "counter",
+            "Polls that ended in an error",
+            per_printer("failures"),
+        )
+        family(
+            "poll_duration_seconds",
+            "summary",
+            "Wall time of polls",
+            (
+                (suffix, {"host": host, "segment": totals.segment}, value)
+                for host, totals in printers
+                for suffix, value in (
+                    ("_sum", totals.duration),
+                    ("_count", totals.polls),
+                )
+            ),
+        )
+        family(
+            "last_poll_duration_seconds",
+            "gauge",
+            "Wall time of the last poll",
+            per_printer("last_duration"),
+        )
+        family(
+            "last_poll_timestamp_seconds",
+            "gauge",
+            "Start of the last poll",
+            per_printer("last_poll"),
+        )
+        family(
+            "phase_seconds",
+            "counter",
+            "Wall time of the phases of polls",
+            (
+                (None, {"host": host, "segment": totals.segment, "phase": phase}, value)
+                for host, totals in printers
+                for phase, value in sorted(totals.phases.items())
+            ),
+        )
+        for attr, (name, help_text) in _COUNTERS.items():
+            family(
+                name,
+                "counter",
+                help_text,
+                (
+                    (None, {"host": host, "segment": totals.segment}, totals.counters[attr])
+                    for host, totals in printers
+                ),
+            )
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    async def async_serve(
+        self, host: str = "0.0.0.0", port: int = DEFAULT_METRICS_PORT
+    ) -> asyncio.AbstractServer:
+        """Serve the metrics over HTTP at /metrics, return the server.
+
+        Clients that accept OpenMetrics get OpenMetrics, others the
+        Prometheus text format.
+        """
+        return await asyncio.start_server(self._async_handle, host, port)
+
+    async def _async_handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer one HTTP request."""
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError) as err:
+            _LOGGER.debug("Invalid metrics request: %s", err)
+            writer.close()
+            return
+
+        request_line, _, headers = request.decode("latin-1").partition("\r\n")
+        method, _, target = request_line.partition(" ")
+        if method != "GET" or target.split(" ")[0].split("?")[0] != "/metrics":
+            status, content_type, body = "404 Not Found", "text/plain", b"Not found\n"
+        else:
+            openmetrics = "application/openmetrics-text" in headers.lower()
+            status = "200 OK"
+            content_type = (
+                OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+            )
+            body = self.render(openmetrics).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+def _labels(labels: dict[str, str]) -> str:
+    """Format labels, escaping their values."""
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in labels.items()
+    )
+
+
+def _number(value: float) -> str:
+    """Format a sample value."""
+    return str(value) if isinstance(value, int) else repr(float(value))
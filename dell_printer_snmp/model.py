@@ -0,0 +1,303 @@
+"""Compact, read-only records of printer data."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import datetime
+from itertools import zip_longest
+from typing import Any, Tuple, cast
+
+from .const import ATTR_CAPACITY, ATTR_LEVEL, ATTR_NAME
+
+
+class _Record(Mapping):
+    """Slotted, read-only record that also reads like a dict.
+
+    Fields that the printer did not report are None and left out of the
+    mapping, so ``record["name"]``, ``record.get("name")`` and ``as_dict()``
+    behave like the dicts earlier versions returned.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    def __init__(self, *values: Any, **fields: Any) -> None:
+        """Initialize."""
+        if len(values) > len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes {len(self.__slots__)} values")
+        for name, value in zip(self.__slots__, values):
+            fields[name] = value
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"Unknown fields: {', '.join(fields)}")
+
+    @classmethod
+    def _make(cls, values: Iterable[Any]) -> Any:
+        """Return a record of all field values in slot order, unchecked."""
+        record = object.__new__(cls)
+        for name, value in zip(cls.__slots__, values):
+            object.__setattr__(record, name, value)
+        return record
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse to change a field."""
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse to delete a field."""
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, name: str) -> Any:
+        """Return a reported field."""
+        if name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None:
+                return value
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate reported fields."""
+        return (name for name in self.__slots__ if getattr(self, name) is not None)
+
+    def __len__(self) -> int:
+        """Return the number of reported fields."""
+        return sum(1 for _ in self)
+
+    def __hash__(self) -> int:
+        """Hash all fields."""
+        return hash(self._values())
+
+    def __reduce__(self) -> tuple:
+        """Pickle as class and field values."""
+        return type(self), self._values()
+
+    def __repr__(self) -> str:
+        """Return the reported fields."""
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+    def _values(self) -> tuple:
+        """Return all field values in slot order."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the reported fields as a dict, tables as lists of dicts."""
+        return {
+            name: [row.as_dict() for row in value] if isinstance(value, tuple) else value
+            for name, value in self.items()
+        }
+
+
+class Supply(_Record):
+    """Marker supply, such as a toner cartridge."""
+
+    __slots__ = ("name", "color", "capacity", "level")
+
+    name: str | None
+    color: str | None
+    capacity: int | None
+    level: int | None
+
+
+class Cover(_Record):
+    """Cover or door."""
+
+    __slots__ = ("name", "status")
+
+    name: str | None
+    status: str | None
+
+
+class InputTray(_Record):
+    """Paper input tray."""
+
+    __slots__ = ("name", "type", "capacity", "status", "media")
+
+    name: str | None
+    type: str | None
+    capacity: int | None
+    status: str | None
+    media: str | None
+
+
+class OutputTray(_Record):
+    """Paper output tray."""
+
+    __slots__ = ("name", "type", "capacity", "status", "page_delivery")
+
+    name: str | None
+    type: str | None
+    capacity: int | None
+    status: str | None
+    page_delivery: str | None
+
+
+class PrinterState(_Record):
+    """Data of one poll of a printer.
+
+    ``conditions`` names every bit of hrPrinterDetectedErrorState that is
+    set.  Input trays have always been reported as ``output_tray`` and
+    output trays as ``input_tray``.
+    """
+
+    __slots__ = (
+        "model",
+        "serial",
+        "printer_status",
+        "device_status",
+        "status",
+        "printer_status_paper",
+        "printer_status_toner",
+        "conditions",
+        "uptime",
+        "page_counter",
+        "supplies",
+        "cover",
+        "output_tray",
+        "input_tray",
+    )
+
+    model: str | None
+    serial: str | None
+    printer_status: str | None
+    device_status: str | None
+    status: str | None
+    printer_status_paper: str | None
+    printer_status_toner: str | None
+    conditions: frozenset[str] | None
+    uptime: datetime | None
+    page_counter: int | None
+    supplies: tuple[Supply, ...] | None
+    cover: tuple[Cover, ...] | None
+    output_tray: tuple[InputTray, ...] | None
+    input_tray: tuple[OutputTray, ...] | None
+
+    def to_tuple(self) -> tuple:
+        """Return the field values as plain tuples, rows of tables included."""
+        return tuple(
+            tuple(row._values() for row in value) if isinstance(value, tuple) else value
+            for value in self._values()
+        )
+
+    @classmethod
+    def from_tuple(cls, values: tuple) -> PrinterState:
+        """Return the state of values from ``to_tuple``."""
+        return cast(
+            PrinterState,
+            cls._make(
+                tuple(map(row_type._make, value))
+                if (row_type := _ROW_TYPES.get(name)) and value is not None
+                else value
+                for name, value in zip(cls.__slots__, values)
+            ),
+        )
+
+
+# record type of the rows of each table of PrinterState
+_ROW_TYPES: dict[str, type[_Record]] = {
+    "supplies": Supply,
+    "cover": Cover,
+    "output_tray": InputTray,
+    "input_tray": OutputTray,
+}
+
+
+class Alert(_Record):
+    """Printer alert received as a trap.
+
+    ``alert_group`` and ``index`` are the prtAlertGroup and the row of its
+    table, ``code`` the prtAlertCode; ``status`` maps the code onto the
+    values of ``PrinterState`` and ``groups`` names the poll groups that
+    the alert may have changed.
+    """
+
+    __slots__ = (
+        "host",
+        "severity",
+        "alert_group",
+        "index",
+        "location",
+        "code",
+        "status",
+        "groups",
+    )
+
+    host: str | None
+    severity: str | None
+    alert_group: int | None
+    index: int | None
+    location: int | None
+    code: int | None
+    status: str | None
+    groups: frozenset[str] | None
+
+
+class Change(_Record):
+    """One difference between two states of a printer.
+
+    ``field`` names the changed field of ``PrinterState``.  For a cell of a
+    table, ``index`` and ``name`` identify the row and ``key`` the cell; a
+    row that appeared or disappeared has no key and the whole row as old
+    or new value.
+    """
+
+    __slots__ = ("field", "index", "name", "key", "old", "new")
+
+    field: str | None
+    index: int | None
+    name: str | None
+    key: str | None
+    old: Any
+    new: Any
+
+
+def _level_band(supply: _Record, thresholds: tuple[int, ...]) -> int | None:
+    """Return how many thresholds a supply's level is at or below."""
+    level, capacity = supply.get(ATTR_LEVEL), supply.get(ATTR_CAPACITY)
+    # negative levels and capacities are "unknown" or "some remaining"
+    if level is None or capacity is None or level < 0 or capacity <= 0:
+        return None
+    percent = level * 100 / capacity
+    return sum(1 for threshold in thresholds if percent <= threshold)
+
+
+def diff_states(
+    old: PrinterState,
+    new: PrinterState,
+    thresholds: Iterable[int] | None = None,
+) -> list[Change]:
+    """Return the changes from one printer state to the next.
+
+    With thresholds, percentages of capacity, a supply level only counts as
+    changed when it crosses one of them, or when its percentage is unknown.
+    """
+    if thresholds is not None:
+        thresholds = tuple(thresholds)
+    changes = []
+    for field in PrinterState.__slots__:
+        before, after = getattr(old, field), getattr(new, field)
+        if before == after:
+            continue
+        if not isinstance(before, tuple) or not isinstance(after, tuple):
+            changes.append(Change(field, old=before, new=after))
+            continue
+        for index, (row, new_row) in enumerate(zip_longest(before, after)):
+            if row == new_row:
+                continue
+            name = (new_row or row).get(ATTR_NAME)
+            if row is None or new_row is None:
+                changes.append(Change(field, index, name, old=row, new=new_row))
+                continue
+            for key in row.__slots__:
+                value, new_value = getattr(row, key), getattr(new_row, key)
+                if value == new_value:
+                    continue
+                if (
+                    key == ATTR_LEVEL
+                    and thresholds is not None
+                    and (band := _level_band(new_row, thresholds)) is not None
+                    and band == _level_band(row, thresholds)
+                ):
+                    continue
+                changes.append(Change(field, index, name, key, value, new_value))
+    return changes
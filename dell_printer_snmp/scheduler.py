@@ -0,0 +1,153 @@
+"""Poll groups of printer data, each on an interval of its own."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import random
+from collections.abc import AsyncGenerator, Iterable
+from typing import Any, NamedTuple
+
+from . import DellPrinterSnmp, PrinterState
+from .const import DEFAULT_INTERVALS, DEFAULT_JITTER, POLL_GROUPS
+from .fleet import DEFAULT_MAX_CONCURRENCY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ScheduledPoll(NamedTuple):
+    """Outcome of one scheduled poll of a printer."""
+
+    host: str
+    groups: frozenset[str]
+    data: PrinterState | None
+    error: Exception | None
+
+
+class PollScheduler:
+    """Poll each group of data of many printers on its own interval.
+
+    ``intervals`` maps groups, see ``DellPrinterSnmp.async_update``, to the
+    seconds between their polls; groups without interval are only fetched
+    by the first, full poll.  Every interval varies at random by the share
+    ``jitter`` and first polls are spread over the shortest interval, so
+    thousands of printers do not fire on the same tick.  A poll also takes
+    the printer's groups that fall due within their jitter or half the
+    shortest interval, so slow groups ride along with fast ones and share
+    their GET requests.  At most ``max_concurrency`` polls are in flight at
+    any time.
+    """
+
+    def __init__(
+        self,
+        printers: Iterable[DellPrinterSnmp],
+        intervals: dict[str, float] | None = None,
+        jitter: float = DEFAULT_JITTER,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        deadline: float | None = None,
+        seed: Any = None,
+    ) -> None:
+        """Initialize."""
+        intervals = dict(DEFAULT_INTERVALS if intervals is None else intervals)
+        if not intervals:
+            raise ValueError("intervals must name at least one group")
+        if unknown := set(intervals) - POLL_GROUPS:
+            raise ValueError(f"Unknown groups: {', '.join(sorted(unknown))}")
+        if min(intervals.values()) <= 0:
+            raise ValueError("intervals must be positive")
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be at least 0 and less than 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self._printers = list(printers)
+        self._intervals = intervals
+        self._jitter = jitter
+        self._max_concurrency = max_concurrency
+        self._deadline = deadline
+        self._random = random.Random(seed)
+        # seconds by which each group may be pulled forward into a poll
+        window = min(intervals.values()) / 2
+        self._lead = {
+            group: max(window, interval * jitter)
+            for group, interval in intervals.items()
+        }
+
+    def _next_due(self, now: float, group: str) -> float:
+        """Return when a group polled now is due again."""
+        jitter = self._random.uniform(-self._jitter, self._jitter)
+        return now + self._intervals[group] * (1 + jitter)
+
+    async def async_run(self) -> AsyncGenerator[ScheduledPoll, None]:
+        """Poll printers until the generator is closed, yielding each result."""
+        loop = asyncio.get_running_loop()
+        results: asyncio.Queue[ScheduledPoll] = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        woken = asyncio.Event()
+        tasks: set[asyncio.Future] = set()
+
+        # due time of each group by printer, and a heap of (earliest due
+        # time, printer) with one entry for every printer not being polled
+        now = loop.time()
+        spread = min(self._intervals.values())
+        due: list[dict[str, float]] = []
+        heap: list[tuple[float, int]] = []
+        for index in range(len(self._printers)):
+            start = now + self._random.uniform(0, spread)
+            due.append(dict.fromkeys(self._intervals, start))
+            heap.append((start, index))
+        heapq.heapify(heap)
+
+        async def poll(index: int, groups: frozenset[str]) -> None:
+            printer = self._printers[index]
+            try:
+                async with semaphore:
+                    data = await printer.async_update(
+                        deadline=self._deadline, groups=groups
+                    )
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Polling %s failed: %s", printer.host, err)
+                result = ScheduledPoll(printer.host, groups, None, err)
+            else:
+                result = ScheduledPoll(printer.host, groups, data, None)
+            finished = loop.time()
+            for group in groups:
+                due[index][group] = self._next_due(finished, group)
+            heapq.heappush(heap, (min(due[index].values()), index))
+            woken.set()
+            results.put_nowait(result)
+
+        async def dispatch() -> None:
+            while True:
+                woken.clear()
+                if not heap or heap[0][0] > loop.time():
+                    # sleep until the next printer is due, or until a
+                    # finished poll schedules a printer earlier
+                    timer = loop.call_at(heap[0][0], woken.set) if heap else None
+                    try:
+                        await woken.wait()
+                    finally:
+                        if timer is not None:
+                            timer.cancel()
+                    continue
+                _, index = heapq.heappop(heap)
+                now = loop.time()
+                groups = frozenset(
+                    group
+                    for group, when in due[index].items()
+                    if when <= now + self._lead[group]
+                )
+                task = asyncio.ensure_future(poll(index, groups))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        dispatcher = asyncio.ensure_future(dispatch())
+        try:
+            while True:
+                yield await results.get()
+        finally:
+            dispatcher.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(dispatcher, *tasks, return_exceptions=True)
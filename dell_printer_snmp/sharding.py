@@ -0,0 +1,337 @@
+"""Poll a fleet of printers from several processes.
+
+Decoding responses takes CPU time, so a single process can only poll so
+many printers per second.  A ``ShardedFleet`` splits its hosts across
+worker processes, each of which polls its shard with a ``DellPrinterFleet``
+on an event loop of its own.  Workers send results back in batches of
+plain tuples, which the parent turns into ``PrinterState`` records again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections.abc import AsyncGenerator, Iterable
+from contextlib import suppress
+from functools import partial
+from multiprocessing.connection import Connection
+from typing import Any, Optional, Tuple
+
+from . import PrinterState, SnmpError, UnsupportedModel
+from .const import SHARD_BATCH_SIZE, SHARD_FLUSH_INTERVAL
+from .fleet import DellPrinterFleet, FleetResult
+
+_LOGGER = logging.getLogger(__name__)
+
+# commands to workers, besides None which stops them
+_POLL = "poll"
+_CANCEL = "cancel"
+
+# result as a worker sends it: host, values of the state and error
+_Packed = Tuple[str, Optional[tuple], Optional[Exception]]
+
+
+def _pack(result: FleetResult) -> _Packed:
+    """Return a result of a worker in the form it is sent in."""
+    error = result.error
+    if error is not None and not isinstance(error, (SnmpError, UnsupportedModel)):
+        # other exceptions might not survive pickling
+        error = SnmpError(f"{type(error).__name__}: {error}")
+    data = None if result.data is None else result.data.to_tuple()
+    return result.host, data, error
+
+
+async def _async_sweep(
+    connection: Connection,
+    fleet: DellPrinterFleet,
+    sweep: int,
+    groups: list[str] | None,
+) -> None:
+    """Poll the fleet of a worker, send results in batches and None when done."""
+    loop = asyncio.get_running_loop()
+    batch: list[_Packed] = []
+    timer: asyncio.TimerHandle | None = None
+
+    def flush() -> None:
+        nonlocal batch, timer
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        if batch:
+            connection.send((sweep, batch))
+            batch = []
+
+    try:
+        async for result in fleet.async_poll(groups):
+            batch.append(_pack(result))
+            if len(batch) >= SHARD_BATCH_SIZE:
+                flush()
+            elif timer is None:
+                # a result waits for others only so long
+                timer = loop.call_later(SHARD_FLUSH_INTERVAL, flush)
+        flush()
+        connection.send((sweep, None))
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+
+async def _async_serve(
+    connection: Connection, hosts: list[str], port: int, kwargs: dict[str, Any]
+) -> None:
+    """Poll the hosts of a worker on command until told to stop."""
+    loop = asyncio.get_running_loop()
+    commands: asyncio.Queue[tuple | None] = asyncio.Queue()
+
+    def receive() -> None:
+        try:
+            commands.put_nowait(connection.recv())
+        except (EOFError, OSError):
+            # the parent is gone
+            loop.remove_reader(connection.fileno())
+            commands.put_nowait(None)
+
+    loop.add_reader(connection.fileno(), receive)
+    fleet = DellPrinterFleet(hosts, port, **kwargs)
+    sweep: asyncio.Future | None = None
+    try:
+        while (command := await commands.get()) is not None:
+            # a new command ends the sweep before it
+            if sweep is not None:
+                sweep.cancel()
+                await asyncio.gather(sweep, return_exceptions=True)
+                sweep = None
+            if command[0] == _POLL:
+                sweep = asyncio.ensure_future(
+                    _async_sweep(connection, fleet, *command[1:])
+                )
+    finally:
+        loop.remove_reader(connection.fileno())
+        if sweep is not None:
+            sweep.cancel()
+            await asyncio.gather(sweep, return_exceptions=True)
+        fleet.shutdown()
+
+
+def _reap(process: multiprocessing.process.BaseProcess) -> int | None:
+    """Wait for a worker process to exit, stopping it if it does not."""
+    process.join(1)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    return process.exitcode
+
+
+def _serve(
+    connection: Connection, hosts: list[str], port: int, kwargs: dict[str, Any]
+) -> None:
+    """Run a worker process."""
+    try:
+        asyncio.run(_async_serve(connection, hosts, port, kwargs))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        connection.close()
+
+
+class _Shard:
+    """Hosts of one worker process and the state of its sweep."""
+
+    __slots__ = ("hosts", "process", "connection", "pending", "running")
+
+    def __init__(self, hosts: list[str]) -> None:
+        """Initialize."""
+        self.hosts = hosts
+        self.process: multiprocessing.process.BaseProcess | None = None
+        self.connection: Connection | None = None
+        # hosts of the running sweep that have no result yet
+        self.pending: set[str] = set()
+        self.running = False
+
+
+class ShardedFleet:
+    """Poll a list of printers from several worker processes.
+
+    Hosts are split into ``processes`` shards, by default one per CPU.  Each
+    worker polls its shard with a ``DellPrinterFleet`` of the given port and
+    further arguments, which therefore must be picklable; ``max_concurrency``
+    applies to each worker.  Workers start with the first sweep and keep
+    their printers, and what they learned about them, until ``shutdown``.  A
+    worker that exits fails the polls of its shard and is started again for
+    the next sweep.
+
+    The parent's event loop must support ``add_reader``, as the default
+    loops of Linux and macOS do.
+    """
+
+    def __init__(
+        self,
+        hosts: Iterable[str],
+        port: int = 161,
+        processes: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize."""
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes < 1:
+            raise ValueError("processes must be at least 1")
+
+        hosts = list(dict.fromkeys(hosts))
+        # every n-th host, so dead ranges of addresses spread over all shards
+        self._shards = [
+            _Shard(shard)
+            for index in range(processes)
+            if (shard := hosts[index::processes])
+        ]
+        self._port = port
+        self._kwargs = kwargs
+        self._context = multiprocessing.get_context("spawn")
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._sweep = 0
+        self._results: asyncio.Queue[list[FleetResult] | None] | None = None
+
+        _LOGGER.debug(
+            "Fleet of %d printers in %d shards", len(hosts), len(self._shards)
+        )
+
+    @property
+    def shards(self) -> list[list[str]]:
+        """Return the hosts of each worker process."""
+        return [shard.hosts for shard in self._shards]
+
+    async def async_poll(
+        self, groups: Iterable[str] | None = None
+    ) -> AsyncGenerator[FleetResult, None]:
+        """Poll all printers, yielding results as workers send them.
+
+        With groups only their data is polled, see ``DellPrinterSnmp``.  One
+        sweep runs at a time.
+        """
+        if self._results is not None:
+            raise RuntimeError("A sweep of this fleet is running")
+        self._loop = asyncio.get_running_loop()
+        self._sweep += 1
+        results = self._results = asyncio.Queue()
+        command = (_POLL, self._sweep, None if groups is None else list(groups))
+        for shard in self._shards:
+            if shard.process is not None and not shard.process.is_alive():
+                self._lost(shard)
+            if shard.connection is None:
+                self._start(shard)
+            assert shard.connection is not None
+            shard.pending = set(shard.hosts)
+            shard.running = True
+            try:
+                shard.connection.send(command)
+            except OSError:
+                self._lost(shard)
+
+        try:
+            running = len(self._shards)
+            while running:
+                if (batch := await results.get()) is None:
+                    running -= 1
+                    continue
+                for result in batch:
+                    yield result
+        finally:
+            self._results = None
+            for shard in self._shards:
+                if shard.running and shard.connection is not None:
+                    shard.running = False
+                    with suppress(OSError):
+                        shard.connection.send((_CANCEL,))
+
+    async def async_update(
+        self, groups: Iterable[str] | None = None
+    ) -> dict[str, PrinterState | Exception]:
+        """Poll all printers and return data or the error by host."""
+        return {
+            result.host: result.outcome() async for result in self.async_poll(groups)
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        for shard in self._shards:
+            if shard.connection is not None:
+                with suppress(OSError):
+                    shard.connection.send(None)
+                self._close(shard)
+        for shard in self._shards:
+            if shard.process is not None:
+                _reap(shard.process)
+                shard.process = None
+
+    def _start(self, shard: _Shard) -> None:
+        """Start the worker process of a shard."""
+        assert self._loop is not None
+        connection, child = self._context.Pipe()
+        shard.process = self._context.Process(
+            target=_serve,
+            args=(child, shard.hosts, self._port, self._kwargs),
+            name=f"{__name__}-{self._shards.index(shard)}",
+            daemon=True,
+        )
+        shard.process.start()
+        child.close()
+        shard.connection = connection
+        self._loop.add_reader(connection.fileno(), self._receive, shard)
+
+    def _close(self, shard: _Shard) -> None:
+        """Stop reading from the worker of a shard."""
+        assert shard.connection is not None
+        if self._loop is not None:
+            self._loop.remove_reader(shard.connection.fileno())
+        shard.connection.close()
+        shard.connection = None
+
+    def _receive(self, shard: _Shard) -> None:
+        """Pass results of a worker on to the running sweep."""
+        assert shard.connection is not None
+        try:
+            sweep, batch = shard.connection.recv()
+        except (EOFError, OSError):
+            self._lost(shard)
+            return
+        if sweep != self._sweep or not shard.running or self._results is None:
+            # left over from a sweep that was given up
+            return
+        if batch is None:
+            shard.running = False
+            self._results.put_nowait(None)
+            return
+        results = [
+            FleetResult(
+                host, None if data is None else PrinterState.from_tuple(data), error
+            )
+            for host, data, error in batch
+        ]
+        shard.pending.difference_update(result.host for result in results)
+        self._results.put_nowait(results)
+
+    @staticmethod
+    def _log_exit(printers: int, reaped: asyncio.Future) -> None:
+        """Log the exit code of a lost worker once it is reaped."""
+        if not reaped.cancelled():
+            _LOGGER.warning(
+                "Worker of %d printers exited with code %s", printers, reaped.result()
+            )
+
+    def _lost(self, shard: _Shard) -> None:
+        """Fail the pending polls of a worker that exited."""
+        assert shard.process is not None and self._loop is not None
+        self._close(shard)
+        # joining blocks, so the worker is reaped off the event loop
+        reaped = self._loop.run_in_executor(None, _reap, shard.process)
+        reaped.add_done_callback(partial(self._log_exit, len(shard.hosts)))
+        shard.process = None
+        if shard.running and self._results is not None:
+            shard.running = False
+            error = SnmpError("The worker process polling the printer exited")
+            self._results.put_nowait(
+                [FleetResult(host, None, error) for host in shard.pending]
+            )
+            self._results.put_nowait(None)
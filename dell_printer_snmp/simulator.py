@@ -0,0 +1,411 @@
+"""SNMP agents that answer like printers from recorded walks.
+
+A ``PrinterSimulator`` serves one walk on one UDP port, with configurable
+latency, packet loss, maximum message size and SNMP version.  A
+``SimulatorFarm`` runs any number of them on localhost ports, sharing the
+walk, so fleets of thousands of printers can be polled without a network::
+
+    python -m dell_printer_snmp.simulator --model dell-c1760nw --count 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import logging
+import os
+import random
+from typing import Any
+
+from . import ber
+from .ber import Oid
+from .const import (
+    ALERT_OIDS,
+    ATTR_ALERT_GROUP,
+    ATTR_CODE,
+    ATTR_INDEX,
+    ATTR_LOCATION,
+    ATTR_SERIAL,
+    ATTR_SEVERITY,
+    ATTR_UPTIME,
+    OIDS,
+    PRINTER_ALERT_OID,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+WALKS_DIR = os.path.join(os.path.dirname(__file__), "walks")
+
+# SNMPv1 and SNMPv2c error status values
+_TOO_BIG = 1
+_NO_SUCH_NAME = 2
+_NULL = ber.encode_value(ber.NULL, None)
+_END_OF_MIB_VIEW = ber.encode_value(ber.END_OF_MIB_VIEW, None)
+_NO_SUCH_INSTANCE = ber.encode_value(ber.NO_SUCH_INSTANCE, None)
+_SERIAL_OID = ber.parse_oid(OIDS[ATTR_SERIAL])
+_UPTIME_OID = ber.parse_oid(OIDS[ATTR_UPTIME])
+
+
+def available_walks() -> list[str]:
+    """Return the models with a bundled walk."""
+    return sorted(
+        name[: -len(".snmprec")]
+        for name in os.listdir(WALKS_DIR)
+        if name.endswith(".snmprec")
+    )
+
+
+def walk_path(model: str) -> str:
+    """Return the path of a bundled walk."""
+    path = os.path.join(WALKS_DIR, f"{model}.snmprec")
+    if not os.path.exists(path):
+        raise ValueError(f"No walk for {model}, choose from {available_walks()}")
+    return path
+
+
+class Walk:
+    """Variables of a recorded walk, encoded once and sorted for GETNEXT."""
+
+    def __init__(self, values: dict[Oid, bytes]) -> None:
+        """Initialize."""
+        self.values = values
+        self.names = sorted(values)
+
+    @classmethod
+    def from_snmprec(cls, path: str) -> Walk:
+        """Load a walk in snmprec format, ``oid|tag|value`` per line.
+
+        A tag with an ``x`` suffix has a hex encoded value, lines starting
+        with ``#`` are comments.
+        """
+        values = {}
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if not (line := line.rstrip("\n")) or line.startswith("#"):
+                    continue
+                oid, tag, value = line.split("|", 2)
+                if tag.endswith("x"):
+                    encoded = ber.encode_value(int(tag[:-1]), bytes.fromhex(value))
+                else:
+                    encoded = ber.encode_value(int(tag), value)
+                values[ber.parse_oid(oid)] = encoded
+        return cls(values)
+
+    @classmethod
+    def from_model(cls, model: str) -> Walk:
+        """Load the bundled walk of a model."""
+        return cls.from_snmprec(walk_path(model))
+
+    def next(self, name: Oid) -> Oid | None:
+        """Return the name after name, None at the end of the walk."""
+        index = bisect.bisect_right(self.names, name)
+        return self.names[index] if index < len(self.names) else None
+
+
+class PrinterSimulator(asyncio.DatagramProtocol):
+    """Answer GET, GETNEXT and GETBULK requests from a walk.
+
+    Responses are sent ``latency`` seconds after the request, a share
+    ``loss`` of requests is dropped, and responses larger than
+    ``max_size`` octets turn into tooBig errors, or fewer rows for GETBULK;
+    with ``split_rows`` GETBULK responses are cut after any variable, even
+    in the middle of a row, as RFC 3416 allows.  A ``v1_only`` agent
+    ignores SNMPv2c requests.  ``overrides`` replace encoded values of the
+    walk for this printer only.
+    """
+
+    def __init__(
+        self,
+        walk: Walk,
+        latency: float = 0.0,
+        loss: float = 0.0,
+        max_size: int | None = None,
+        split_rows: bool = False,
+        v1_only: bool = False,
+        overrides: dict[Oid, bytes] | None = None,
+        seed: Any = None,
+    ) -> None:
+        """Initialize."""
+        self._walk = walk
+        self._latency = latency
+        self._loss = loss
+        self._max_size = max_size
+        self._split_rows = split_rows
+        self._v1_only = v1_only
+        self._overrides = overrides or {}
+        self._random = random.Random(seed)
+        self._transport: asyncio.DatagramTransport | None = None
+        self._alerts = 0
+        self.requests = 0
+
+    @classmethod
+    def from_model(cls, model: str, **kwargs: Any) -> PrinterSimulator:
+        """Create a simulator that serves the bundled walk of a model."""
+        return cls(Walk.from_model(model), **kwargs)
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Listen on host and port, return the port."""
+        await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: self, local_addr=(host, port)
+        )
+        assert self._transport is not None
+        return int(self._transport.get_extra_info("sockname")[1])
+
+    def close(self) -> None:
+        """Stop listening."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        self._transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Answer a request."""
+        try:
+            request = ber.decode_message(data)
+        except ValueError as err:
+            _LOGGER.debug("Malformed request from %s: %s", addr, err)
+            return
+        self.requests += 1
+        if self._loss and self._random.random() < self._loss:
+            return
+        if (response := self.respond(request)) is None or not self._transport:
+            return
+        if self._latency:
+            asyncio.get_running_loop().call_later(
+                self._latency, self._send, response, addr
+            )
+        else:
+            self._transport.sendto(response, addr)
+
+    def set_value(self, oid: str, tag: int, value: Any) -> None:
+        """Replace a value of the walk for this printer, such as a cover status."""
+        self._overrides[ber.parse_oid(oid)] = ber.encode_value(tag, value)
+
+    def send_alert(
+        self,
+        addr: tuple[str, int],
+        alert_group: int,
+        code: int,
+        index: int = 1,
+        severity: int = 3,
+        location: int = 0,
+        version: int = 1,
+    ) -> None:
+        """Send a printerV2Alert, or a printerV1Alert with version 0, to addr."""
+        assert self._transport is not None
+        values = {
+            ATTR_SEVERITY: severity,
+            ATTR_ALERT_GROUP: alert_group,
+            ATTR_INDEX: index,
+            ATTR_LOCATION: location,
+            ATTR_CODE: code,
+        }
+        # one alert table entry of device 1, at a new row each time
+        self._alerts += 1
+        var_binds = [
+            (
+                (*ber.parse_oid(ALERT_OIDS[attr]), 1, self._alerts),
+                ber.encode_value(ber.INTEGER, value),
+            )
+            for attr, value in values.items()
+        ]
+        uptime = self._walk.values.get(_UPTIME_OID, b"\x43\x01\x00")
+        trap = ber.encode_trap(
+            version,
+            ber.parse_oid(PRINTER_ALERT_OID),
+            int.from_bytes(uptime[2:], "big"),
+            var_binds,
+            agent_address=self._transport.get_extra_info("sockname")[0],
+        )
+        self._transport.sendto(trap, addr)
+
+    def _send(self, response: bytes, addr: tuple[str, int]) -> None:
+        """Send a delayed response unless the simulator was closed."""
+        if self._transport is not None:
+            self._transport.sendto(response, addr)
+
+    def respond(self, request: ber.Response) -> bytes | None:
+        """Return the encoded response to a request, None to drop it."""
+        if request.version and self._v1_only:
+            return None
+        names = [name for name, _ in request.var_binds]
+        if request.pdu_type == ber.GET:
+            var_binds = [(name, self._value(name)) for name in names]
+        elif request.pdu_type == ber.GETNEXT:
+            var_binds = [self._next(name) for name in names]
+        elif request.pdu_type == ber.GETBULK and request.version:
+            return self._respond_bulk(request, names)
+        else:
+            return None
+
+        for index, (name, value) in enumerate(var_binds, 1):
+            if value is None:
+                if not request.version:
+                    return self._encode(
+                        request, [(name, _NULL) for name in names], _NO_SUCH_NAME, index
+                    )
+                if request.pdu_type == ber.GET:
+                    var_binds[index - 1] = (name, _NO_SUCH_INSTANCE)
+                else:
+                    var_binds[index - 1] = (name, _END_OF_MIB_VIEW)
+
+        response = self._encode(request, var_binds)
+        if self._max_size and len(response) > self._max_size:
+            return self._encode(request, [], _TOO_BIG)
+        return response
+
+    def _respond_bulk(self, request: ber.Response, names: list[Oid]) -> bytes:
+        """Return the response to a GETBULK request, cut to the maximum size."""
+        # non-repeaters and max-repetitions take the place of the error fields
+        non_repeaters, max_repetitions = request.error_status, request.error_index
+        var_binds = [
+            self._next(name, _END_OF_MIB_VIEW) for name in names[:non_repeaters]
+        ]
+        columns = names[non_repeaters:]
+        rows: list[list[tuple[Oid, bytes | None]]] = []
+        for _ in range(max_repetitions):
+            row = [self._next(name, _END_OF_MIB_VIEW) for name in columns]
+            rows.append(row)
+            columns = [name for name, _ in row]
+            if all(value is _END_OF_MIB_VIEW for _, value in row):
+                break
+
+        while True:
+            response = self._encode(
+                request, var_binds + [var_bind for row in rows for var_bind in row]
+            )
+            if not self._max_size or len(response) <= self._max_size or not rows:
+                return response
+            if self._split_rows and len(rows[-1]) > 1:
+                rows[-1] = rows[-1][:-1]
+            else:
+                rows.pop()
+
+    def _value(self, name: Oid) -> bytes | None:
+        """Return the encoded value of name."""
+        if (value := self._overrides.get(name)) is not None:
+            return value
+        return self._walk.values.get(name)
+
+    def _next(self, name: Oid, end: bytes | None = None) -> tuple[Oid, bytes | None]:
+        """Return the variable after name, or name and end at the end."""
+        if (following := self._walk.next(name)) is None:
+            return name, end
+        return following, self._value(following)
+
+    @staticmethod
+    def _encode(
+        request: ber.Response,
+        var_binds: list,
+        error_status: int = 0,
+        error_index: int = 0,
+    ) -> bytes:
+        """Encode a response to request."""
+        return ber.encode_message(
+            request.version,
+            ber.RESPONSE,
+            request.request_id,
+            error_status,
+            error_index,
+            var_binds,
+        )
+
+
+class SimulatorFarm:
+    """Run many simulated printers of one model on consecutive ports.
+
+    All printers share the walk; each gets a serial number of its own.  With
+    ``base_port`` 0 the ports are picked by the system.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        count: int,
+        host: str = "127.0.0.1",
+        base_port: int = 0,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize."""
+        walk = Walk.from_model(model)
+        self._host = host
+        self._base_port = base_port
+        self.simulators = [
+            PrinterSimulator(
+                walk,
+                overrides={
+                    _SERIAL_OID: ber.encode_value(ber.OCTET_STRING, f"SIM{index:08d}")
+                },
+                **kwargs,
+            )
+            for index in range(count)
+        ]
+        self.ports: list[int] = []
+
+    async def async_start(self) -> list[int]:
+        """Start all printers, return their ports."""
+        for index, simulator in enumerate(self.simulators):
+            port = self._base_port + index if self._base_port else 0
+            self.ports.append(await simulator.async_start(self._host, port))
+        return self.ports
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests received by all printers."""
+        return sum(simulator.requests for simulator in self.simulators)
+
+    def close(self) -> None:
+        """Stop all printers."""
+        for simulator in self.simulators:
+            simulator.close()
+        self.ports = []
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run a farm until cancelled."""
+    farm = SimulatorFarm(
+        args.model,
+        args.count,
+        args.host,
+        args.port,
+        latency=args.latency,
+        loss=args.loss,
+        max_size=args.max_size,
+        split_rows=args.split_rows,
+        v1_only=args.v1_only,
+    )
+    ports = await farm.async_start()
+    print(f"{len(ports)} x {args.model} on {args.host} ports {ports[0]}-{ports[-1]}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        farm.close()
+
+
+def main() -> None:
+    """Parse arguments and run the simulator."""
+    parser = argparse.ArgumentParser(description="Simulate Dell printers over SNMP.")
+    parser.add_argument("--model", default="dell-c1760nw", choices=available_walks())
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=16100, help="first port")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="share of requests")
+    parser.add_argument("--max-size", type=int, default=None, help="octets")
+    parser.add_argument(
+        "--split-rows", action="store_true", help="cut GETBULK responses mid-row"
+    )
+    parser.add_argument("--v1-only", action="store_true")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
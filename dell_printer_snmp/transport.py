@@ -0,0 +1,132 @@
+"""Shared SNMP request arguments with cached address resolution."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import math
+import socket
+import time
+
+import pysnmp.hlapi.asyncio as hlapi
+
+from .const import (
+    ADDRESS_CACHE_TTL,
+    COMMUNITY,
+    INITIAL_TIMEOUT,
+    MAX_RETRIES,
+    MAX_TIMEOUT,
+    MIN_TIMEOUT,
+    REQUEST_BUDGET,
+    TIMER_RESOLUTION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMUNITY_DATA = {
+    mp_model: hlapi.CommunityData(COMMUNITY, mpModel=mp_model) for mp_model in (0, 1)
+}
+CONTEXT_DATA = hlapi.ContextData()
+
+# (host, port) -> (address, expiry)
+_addresses: dict[tuple[str, int], tuple[str, float]] = {}
+# (address, port, timeout, retries) -> target
+_targets: dict[tuple[str, int, float, int], hlapi.UdpTransportTarget] = {}
+# (address, port) -> round-trip time estimator
+_estimators: dict[tuple[str, int], RttEstimator] = {}
+
+
+class RttEstimator:
+    """Round-trip time estimator of one printer, as TCP does it (RFC 6298).
+
+    The smoothed round-trip time and its variation give the retransmission
+    timeout, and the number of retries is whatever fits into REQUEST_BUDGET.
+    A timeout doubles the retransmission timeout until the next sample.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.rto = INITIAL_TIMEOUT
+
+    def sample(self, rtt: float) -> None:
+        """Add a measured round-trip time."""
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.rto = min(max(self.srtt + 4 * self.rttvar, MIN_TIMEOUT), MAX_TIMEOUT)
+
+    def backoff(self) -> None:
+        """Back off after a request timed out."""
+        self.rto = min(self.rto * 2, MAX_TIMEOUT)
+
+    @property
+    def timeout(self) -> float:
+        """Return the timeout, rounded up to the dispatcher's resolution.
+
+        Rounding keeps the number of distinct transport targets small.
+        """
+        return math.ceil(self.rto / TIMER_RESOLUTION) * TIMER_RESOLUTION
+
+    @property
+    def retries(self) -> int:
+        """Return the number of retries that fit into the request budget."""
+        return min(max(int(REQUEST_BUDGET / self.timeout) - 1, 0), MAX_RETRIES)
+
+
+async def async_resolve(host: str, port: int) -> str:
+    """Resolve host to an IPv4 address without blocking the event loop.
+
+    Addresses are cached for ADDRESS_CACHE_TTL seconds.
+    """
+    try:
+        return str(ipaddress.IPv4Address(host))
+    except ValueError:
+        pass
+
+    key = (host, port)
+    if (cached := _addresses.get(key)) and cached[1] > time.monotonic():
+        return cached[0]
+
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM
+        )
+    except OSError as err:
+        raise ConnectionError(f"Bad value for host: {host}: {err}") from err
+
+    address = str(infos[0][4][0])
+    _LOGGER.debug("Resolved %s to %s", host, address)
+    _addresses[key] = (address, time.monotonic() + ADDRESS_CACHE_TTL)
+    return address
+
+
+def get_target(
+    address: str, port: int, timeout: float, retries: int
+) -> hlapi.UdpTransportTarget:
+    """Return a transport target shared by all printers at this address."""
+    key = (address, port, timeout, retries)
+    if (target := _targets.get(key)) is None:
+        target = _targets[key] = hlapi.UdpTransportTarget(
+            (address, port), timeout=timeout, retries=retries
+        )
+    return target
+
+
+def get_estimator(address: str, port: int) -> RttEstimator:
+    """Return the round-trip time estimator shared by printers at this address."""
+    if (estimator := _estimators.get((address, port))) is None:
+        estimator = _estimators[(address, port)] = RttEstimator()
+    return estimator
+
+
+def clear_cache() -> None:
+    """Forget resolved addresses, transport targets and round-trip times."""
+    _addresses.clear()
+    _targets.clear()
+    _estimators.clear()
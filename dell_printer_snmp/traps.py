@@ -0,0 +1,162 @@
+"""Receive printer alerts as SNMP traps and refresh the printers they concern.
+
+Printers send a ``printerV1Alert`` or ``printerV2Alert`` trap when an entry
+is added to their alert table, such as a paper jam or an open cover.  A
+``TrapReceiver`` turns these into ``Alert`` records right away and polls
+only the groups of data the alert may have changed, so poll intervals can
+be long without delaying alerts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Iterable
+
+from . import DellPrinterSnmp
+from . import ber
+from .const import (
+    ALERT_CODE_MAP,
+    ALERT_GROUP_MAP,
+    ALERT_OIDS,
+    ALERT_SEVERITY_MAP,
+    ALERT_SUBUNIT_CODE_MAP,
+    ATTR_ALERT_GROUP,
+    ATTR_CODE,
+    ATTR_INDEX,
+    ATTR_LOCATION,
+    ATTR_SEVERITY,
+    COMMUNITY,
+    DEFAULT_TRAP_PORT,
+    GROUP_STATUS,
+    PRINTER_ALERT_OID,
+    VAL_UNKNOWN,
+)
+from .model import Alert
+from .transport import async_resolve
+
+_LOGGER = logging.getLogger(__name__)
+
+_PRINTER_ALERT = ber.parse_oid(PRINTER_ALERT_OID)
+_ALERT_COLUMNS: dict[tuple[int, ...], str] = {
+    ber.parse_oid(oid): attr for attr, oid in ALERT_OIDS.items()
+}
+
+
+def decode_alert(trap: ber.Trap, host: str) -> Alert | None:
+    """Return the alert of a printer alert trap, None for other traps."""
+    if trap.oid != _PRINTER_ALERT:
+        return None
+    fields: dict[str, int] = {}
+    for name, value in trap.var_binds:
+        # columns are indexed by hrDeviceIndex and prtAlertIndex
+        if (attr := _ALERT_COLUMNS.get(name[:-2])) is not None and isinstance(
+            value, int
+        ):
+            fields[attr] = value
+    alert_group = fields.get(ATTR_ALERT_GROUP)
+    code = fields.get(ATTR_CODE)
+    status = ALERT_SUBUNIT_CODE_MAP.get(str(alert_group), {}).get(
+        str(code), ALERT_CODE_MAP.get(str(code), VAL_UNKNOWN)
+    )
+    return Alert(
+        host=host,
+        severity=ALERT_SEVERITY_MAP.get(str(fields.get(ATTR_SEVERITY)), VAL_UNKNOWN),
+        alert_group=alert_group,
+        index=fields.get(ATTR_INDEX),
+        location=fields.get(ATTR_LOCATION),
+        code=code,
+        status=status,
+        groups=frozenset(ALERT_GROUP_MAP.get(str(alert_group), (GROUP_STATUS,))),
+    )
+
+
+class TrapReceiver(asyncio.DatagramProtocol):
+    """Listen for printer alert traps, SNMPv1 and SNMPv2c.
+
+    Every alert is passed to ``callback``.  If it came from one of
+    ``printers``, their groups that the alert concerns are polled at once;
+    alerts that arrive during such a poll share it.  Traps with another
+    community than ``community`` are dropped, with None none are.
+    """
+
+    def __init__(
+        self,
+        printers: Iterable[DellPrinterSnmp] = (),
+        callback: Callable[[Alert], None] | None = None,
+        community: str | None = COMMUNITY,
+        deadline: float | None = None,
+    ) -> None:
+        """Initialize."""
+        self._printers = list(printers)
+        self._callback = callback
+        self._community = None if community is None else community.encode()
+        self._deadline = deadline
+        # printers by their address, as traps come from there
+        self._addresses: dict[str, list[DellPrinterSnmp]] = {}
+        self._transport: asyncio.DatagramTransport | None = None
+        self._refreshes: set[asyncio.Future] = set()
+        self.alerts = 0
+
+    async def async_start(
+        self, host: str = "0.0.0.0", port: int = DEFAULT_TRAP_PORT
+    ) -> int:
+        """Resolve the printers, listen on host and port, return the port."""
+        for printer in self._printers:
+            try:
+                address = await async_resolve(printer.host, printer.port)
+            except ConnectionError as err:
+                _LOGGER.warning("Alerts of %s are not refreshed: %s", printer.host, err)
+                continue
+            self._addresses.setdefault(address, []).append(printer)
+
+        await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: self, local_addr=(host, port)
+        )
+        assert self._transport is not None
+        return int(self._transport.get_extra_info("sockname")[1])
+
+    def close(self) -> None:
+        """Stop listening and cancel running refreshes."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        for refresh in self._refreshes:
+            refresh.cancel()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        self._transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Handle a trap."""
+        try:
+            trap = ber.decode_trap(data)
+        except ValueError as err:
+            _LOGGER.debug("Malformed trap from %s: %s", addr, err)
+            return
+        if self._community is not None and trap.community != self._community:
+            _LOGGER.debug("Trap from %s with wrong community", addr)
+            return
+        if (alert := decode_alert(trap, addr[0])) is None:
+            _LOGGER.debug("Ignoring trap %s from %s", trap.oid, addr)
+            return
+        _LOGGER.debug("Alert from %s: %s", addr, alert)
+        self.alerts += 1
+
+        if self._callback is not None:
+            self._callback(alert)
+        printers = self._addresses.get(addr[0]) or self._addresses.get(
+            trap.agent_address or "", []
+        )
+        for printer in printers:
+            refresh = asyncio.ensure_future(self._async_refresh(printer, alert))
+            self._refreshes.add(refresh)
+            refresh.add_done_callback(self._refreshes.discard)
+
+    async def _async_refresh(self, printer: DellPrinterSnmp, alert: Alert) -> None:
+        """Poll the groups of a printer that an alert concerns."""
+        try:
+            await printer.async_update(deadline=self._deadline, groups=alert.groups)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Refreshing %s after an alert failed: %s", printer.host, err)
@@ -1 +1 @@
-"""Tests for brother package."""
+"""Tests for dell_printer_snmp package."""
@@ -0,0 +1,247 @@
+"""Tests for dell_printer_snmp BER fast path."""
+import asyncio
+import socket
+import time
+from contextlib import suppress
+
+import pytest
+from pyasn1.codec.ber import encoder
+from pysnmp.proto import api
+from pysnmp.proto.rfc1902 import Counter32, Integer, ObjectName, OctetString, TimeTicks
+from pysnmp.proto.rfc1905 import endOfMibView
+
+from dell_printer_snmp import DellPrinterSnmp, SnmpError, ber
+from dell_printer_snmp.simulator import PrinterSimulator
+
+HOST = "127.0.0.1"
+NAMES = ((1, 3, 6, 1, 2, 1, 1, 1, 0), (1, 3, 6, 1, 2, 1, 43, 11, 1, 1, 9, 1, 200))
+
+
+def pysnmp_message(version, pdu, request_id, var_binds):
+    """Encode a message with pysnmp."""
+    p_mod = api.protoModules[version]
+    p_mod.apiPDU.setRequestID(pdu, request_id)
+    p_mod.apiPDU.setVarBinds(pdu, var_binds)
+    message = p_mod.Message()
+    p_mod.apiMessage.setDefaults(message)
+    p_mod.apiMessage.setCommunity(message, "public")
+    p_mod.apiMessage.setPDU(message, pdu)
+    return encoder.encode(message)
+
+
+@pytest.mark.parametrize("version", [0, 1])
+def test_getnext_template_matches_pysnmp(version):
+    """Test that a GETNEXT request is encoded as pysnmp encodes it."""
+    p_mod = api.protoModules[version]
+    pdu = p_mod.GetNextRequestPDU()
+    p_mod.apiPDU.setDefaults(pdu)
+    expected = pysnmp_message(
+        version,
+        pdu,
+        0x12345678,
+        [(ObjectName(name), p_mod.Null("")) for name in NAMES],
+    )
+
+    template = ber.request_template(version, ber.GETNEXT, NAMES)
+
+    assert ber.encode_request(template, 0x12345678) == expected
+
+
+def test_bulk_template_matches_pysnmp():
+    """Test that a GETBULK request is encoded as pysnmp encodes it."""
+    p_mod = api.protoModules[1]
+    pdu = p_mod.GetBulkRequestPDU()
+    p_mod.apiBulkPDU.setDefaults(pdu)
+    p_mod.apiBulkPDU.setMaxRepetitions(pdu, 10)
+    expected = pysnmp_message(
+        1, pdu, 0x800000, [(ObjectName(name), p_mod.Null("")) for name in NAMES]
+    )
+
+    template = ber.request_template(1, ber.GETBULK, NAMES, 0, 10)
+
+    assert ber.encode_request(template, 0x800000) == expected
+
+
+def test_decode_response():
+    """Test that a pysnmp response decodes to native values."""
+    p_mod = api.protoModules[1]
+    pdu = p_mod.GetResponsePDU()
+    p_mod.apiPDU.setDefaults(pdu)
+    data = pysnmp_message(
+        1,
+        pdu,
+        0x12345678,
+        [
+            (ObjectName("1.3.6.1.2.1.1.1.0"), OctetString(b"Dell \x80")),
+            (ObjectName("1.3.6.1.2.1.1.3.0"), TimeTicks(4294967295)),
+            (ObjectName("1.3.6.1.2.1.43.10.2.1.4.1.1"), Counter32(12345)),
+            (ObjectName("1.3.6.1.2.1.43.11.1.1.9.1.1"), Integer(-3)),
+            (ObjectName("1.3.6.1.2.1.1.2.0"), ObjectName("1.3.6.1.4.1.674.10898.100")),
+            (ObjectName("1.3.6.1.2.1.1.4.0"), endOfMibView),
+        ],
+    )
+
+    response = ber.decode_message(data)
+
+    assert response.request_id == 0x12345678
+    assert (response.error_status, response.error_index) == (0, 0)
+    assert [str(name) for name, _ in response.var_binds][:2] == [
+        "1.3.6.1.2.1.1.1.0",
+        "1.3.6.1.2.1.1.3.0",
+    ]
+    values = [value for _, value in response.var_binds]
+    assert values[0] == b"Dell \x80"
+    assert str(values[0]) == str(OctetString(b"Dell \x80"))
+    assert values[1:4] == [4294967295, 12345, -3]
+    assert str(values[4]) == "1.3.6.1.4.1.674.10898.100"
+    assert values[5] is endOfMibView
+
+
+def test_decode_malformed():
+    """Test that truncated and foreign data raise ValueError."""
+    data = ber.encode_request(ber.request_template(0, ber.GET, NAMES), 0x800000)
+    with pytest.raises(ValueError):
+        ber.decode_message(data[:-3])
+    with pytest.raises(ValueError):
+        ber.decode_message(b"\x04\x00")
+
+
+def test_v1_trap_matches_pysnmp():
+    """Test that SNMPv1 traps are encoded and decoded as pysnmp does."""
+    p_mod = api.protoModules[api.protoVersion1]
+    pdu = p_mod.TrapPDU()
+    p_mod.apiTrapPDU.setDefaults(pdu)
+    p_mod.apiTrapPDU.setEnterprise(pdu, (1, 3, 6, 1, 2, 1, 43, 18, 2))
+    p_mod.apiTrapPDU.setAgentAddr(pdu, p_mod.IpAddress("192.0.2.1"))
+    p_mod.apiTrapPDU.setGenericTrap(pdu, "enterpriseSpecific")
+    p_mod.apiTrapPDU.setSpecificTrap(pdu, 1)
+    p_mod.apiTrapPDU.setTimeStamp(pdu, 8640000)
+    p_mod.apiTrapPDU.setVarBinds(pdu, [(ObjectName(NAMES[1]), Integer(3))])
+    message = p_mod.Message()
+    p_mod.apiMessage.setDefaults(message)
+    p_mod.apiMessage.setCommunity(message, "public")
+    p_mod.apiMessage.setPDU(message, pdu)
+    expected = encoder.encode(message)
+
+    oid = (1, 3, 6, 1, 2, 1, 43, 18, 2, 0, 1)
+    var_binds = [(NAMES[1], ber.encode_value(ber.INTEGER, 3))]
+    assert ber.encode_trap(0, oid, 8640000, var_binds, "192.0.2.1") == expected
+    trap = ber.decode_trap(expected)
+    assert trap == (0, b"public", oid, 8640000, "192.0.2.1", [(NAMES[1], 3)])
+
+    # SNMPv2 traps carry uptime and trap OID as their first variables
+    trap = ber.decode_trap(ber.encode_trap(1, oid, 100, var_binds, request_id=7))
+    assert trap == (1, b"public", oid, 100, None, [(NAMES[1], 3)])
+    with pytest.raises(ValueError):
+        ber.decode_trap(ber.encode_request(ber.request_template(1, ber.GET, NAMES), 1))
+
+
+@pytest.mark.asyncio
+async def test_fast_path_matches_pysnmp():
+    """Test that both paths decode the same data from an agent."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw")
+    port = await simulator.async_start()
+    printer = DellPrinterSnmp(HOST, port)
+    fast_printer = DellPrinterSnmp(HOST, port, fast_path=True)
+
+    expected = await printer.async_update()
+    assert await fast_printer.async_update() == expected
+    # the steady state poll goes through a cached template
+    assert await fast_printer.async_update() == expected
+    assert fast_printer._bulk_supported is True
+
+    printer.shutdown()
+    fast_printer.shutdown()
+    simulator.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_size", [300, 400, 500])
+async def test_fast_path_drops_partial_rows(max_size):
+    """Test that GETBULK responses cut mid-row decode as pysnmp decodes them."""
+    simulator = PrinterSimulator.from_model(
+        "dell-c1760nw", max_size=max_size, split_rows=True
+    )
+    port = await simulator.async_start()
+    printer = DellPrinterSnmp(HOST, port)
+    fast_printer = DellPrinterSnmp(HOST, port, fast_path=True)
+
+    expected = await printer.async_update()
+    data = await fast_printer.async_update()
+
+    printer.shutdown()
+    fast_printer.shutdown()
+    simulator.close()
+    assert fast_printer._bulk_supported is True
+    # uptime is derived from the clock at the time of each poll
+    assert {**data, "uptime": None} == {**expected, "uptime": None}
+
+
+@pytest.mark.asyncio
+async def test_fast_path_times_out():
+    """Test that an agent that does not answer raises SnmpError."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((HOST, 0))
+    printer = DellPrinterSnmp(
+        HOST, sock.getsockname()[1], timeout=0.1, retries=1, fast_path=True
+    )
+
+    start = time.monotonic()
+    with pytest.raises(SnmpError):
+        await printer.async_update()
+    elapsed = time.monotonic() - start
+
+    printer.shutdown()
+    sock.close()
+    assert elapsed < 1
+
+
+@pytest.mark.asyncio
+async def test_client_retries_on_timing_wheel():
+    """Test that requests are resent with their id and expire on time."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((HOST, 0))
+    sock.setblocking(False)
+    client = ber.BerClient()
+    template = ber.request_template(0, ber.GET, NAMES)
+    address = sock.getsockname()
+
+    start = time.monotonic()
+    results = await asyncio.gather(
+        client.async_request(address, template, 0.05, 2),
+        client.async_request(address, template, 0.2, 0),
+    )
+    elapsed = time.monotonic() - start
+    received = []
+    with suppress(BlockingIOError):
+        while True:
+            received.append(ber.decode_message(sock.recv(1500)).request_id)
+
+    client.close()
+    sock.close()
+    assert results == [None, None]
+    assert 0.15 <= elapsed < 0.5
+    first, second = sorted(set(received))
+    assert received.count(first) == 3 and received.count(second) == 1
+
+
+@pytest.mark.asyncio
+async def test_client_multiplexes_requests():
+    """Test that concurrent requests share one socket and get their responses."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw")
+    port = await simulator.async_start()
+    client = ber.BerClient()
+    template = ber.request_template(1, ber.GET, NAMES[:1])
+
+    responses = await asyncio.gather(
+        *(client.async_request((HOST, port), template, 1, 0) for _ in range(200))
+    )
+    pending = asyncio.ensure_future(client.async_request((HOST, 9), template, 10, 0))
+    await asyncio.sleep(0.01)
+    client.close()
+
+    simulator.close()
+    assert len({response.request_id for response in responses}) == 200
+    assert all(response.var_binds[0][1].startswith(b"Dell") for response in responses)
+    # closing the client ends pending requests
+    assert await pending is None
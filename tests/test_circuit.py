@@ -0,0 +1,128 @@
+"""Tests for dell_printer_snmp circuit breaker."""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from dell_printer_snmp import CircuitOpenError, DellPrinterSnmp, SnmpError
+from dell_printer_snmp.circuit import CircuitBreaker
+from dell_printer_snmp.const import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+
+
+def test_circuit_opens_and_backs_off():
+    """Test the transitions between closed, open and half-open."""
+    with patch("dell_printer_snmp.circuit.time") as mock_time:
+        mock_time.monotonic.return_value = 1000
+        breaker = CircuitBreaker(failure_threshold=2, backoff=10, max_backoff=25)
+
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_CLOSED
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+        assert breaker.retry_in == 10
+        assert not breaker.allow_probe()
+
+        mock_time.monotonic.return_value = 1010
+        assert breaker.allow_probe()
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        assert not breaker.allow_probe()
+
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+        assert breaker.retry_in == 20
+
+        mock_time.monotonic.return_value = 1030
+        assert breaker.allow_probe()
+        breaker.record_failure()
+        assert breaker.retry_in == 25
+
+        mock_time.monotonic.return_value = 1055
+        assert breaker.allow_probe()
+        breaker.record_success()
+        assert breaker.state == CIRCUIT_CLOSED
+        assert breaker.failures == 0
+
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.retry_in == 10
+
+
+def test_invalid_failure_threshold():
+    """Test that the failure threshold must be positive."""
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0)
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    """Test that polls of an unreachable printer stop until a probe succeeds."""
+    printer = DellPrinterSnmp(
+        "192.0.2.1", circuit_breaker=CircuitBreaker(failure_threshold=2, backoff=0)
+    )
+    assert printer.circuit_breaker.state == CIRCUIT_CLOSED
+
+    with patch.object(
+        printer, "_async_update", AsyncMock(side_effect=SnmpError("Request timed out"))
+    ) as update, patch.object(
+        printer, "_get_var_binds", AsyncMock(side_effect=SnmpError("Request timed out"))
+    ) as probe:
+        for _ in range(2):
+            with pytest.raises(SnmpError):
+                await printer.async_update()
+        assert printer.circuit_breaker.state == CIRCUIT_OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await printer.async_update()
+        assert update.call_count == 2
+        assert probe.call_count == 1
+        assert probe.call_args.kwargs == {"probe": True}
+
+        update.side_effect = None
+        update.return_value = {"model": "C1760nw"}
+        probe.side_effect = None
+        assert await printer.async_update() == {"model": "C1760nw"}
+    assert printer.circuit_breaker.state == CIRCUIT_CLOSED
+
+    printer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_reopens_circuit():
+    """Test that a poll cancelled during the probe lets the next one probe."""
+    breaker = CircuitBreaker(failure_threshold=1, backoff=0)
+    printer = DellPrinterSnmp("192.0.2.1", circuit_breaker=breaker)
+    breaker.record_failure()
+    probing = asyncio.Event()
+
+    async def hanging_probe(*args, **kwargs):
+        probing.set()
+        await asyncio.Event().wait()
+
+    with patch.object(
+        printer, "_async_update", AsyncMock(return_value={"model": "C1760nw"})
+    ), patch.object(printer, "_get_var_binds", hanging_probe):
+        poll = asyncio.ensure_future(printer.async_update())
+        await probing.wait()
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        poll.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await poll
+        assert breaker.state == CIRCUIT_OPEN
+        assert breaker.retry_in == 0
+
+        with patch.object(printer, "_get_var_binds", AsyncMock()):
+            assert await printer.async_update() == {"model": "C1760nw"}
+    assert breaker.state == CIRCUIT_CLOSED
+
+    printer.shutdown()
+
+
+def test_circuit_breaker_is_opt_in():
+    """Test that printers have no circuit breaker unless asked for."""
+    printer = DellPrinterSnmp("192.0.2.1")
+    assert printer.circuit_breaker is None
+    printer.shutdown()
+
+    printer = DellPrinterSnmp("192.0.2.1", circuit_breaker=True)
+    assert isinstance(printer.circuit_breaker, CircuitBreaker)
+    printer.shutdown()
@@ -0,0 +1,93 @@
+"""Tests for dell_printer_snmp table decoding."""
+from pysnmp.proto.rfc1902 import Integer, ObjectName, OctetString
+
+from dell_printer_snmp.const import (
+    ATTR_COVER,
+    ATTR_INPUT_TRAY,
+    ATTR_NAME,
+    ATTR_OUTPUT_TRAY,
+    ATTR_STATUS,
+    ATTR_SUPPLIES,
+    PRINTER_ERROR_STATE_BITS,
+    SUBUNIT_STATUS_MAP,
+)
+from dell_printer_snmp.decoder import (
+    COLUMN_INDEX,
+    decode_error_state,
+    decode_error_states,
+    decode_tables,
+    lookup_column,
+)
+from dell_printer_snmp.model import InputTray, Supply
+
+
+def test_lookup_column():
+    """Test that cells map to their data key and attribute."""
+    key, attr, _ = lookup_column(ObjectName("1.3.6.1.2.1.43.11.1.1.6.1.3"))
+    assert (key, attr) == (ATTR_SUPPLIES, ATTR_NAME)
+    key, attr, _ = lookup_column((1, 3, 6, 1, 2, 1, 43, 6, 1, 1, 3, 1, 2))
+    assert (key, attr) == (ATTR_COVER, ATTR_STATUS)
+    # input trays have always been reported as output trays and vice versa
+    assert lookup_column(ObjectName("1.3.6.1.2.1.43.8.2.1.13.1.1"))[0] == ATTR_OUTPUT_TRAY
+    assert lookup_column(ObjectName("1.3.6.1.2.1.43.9.2.1.7.1.1"))[0] == ATTR_INPUT_TRAY
+    assert lookup_column(ObjectName("1.3.6.1.2.1.43.11.1.1.6.2.1")) is None
+    assert lookup_column(ObjectName("1.3.6.1.2.1.1.1.0")) is None
+    assert len(COLUMN_INDEX) == 16
+
+
+def test_decode_tables():
+    """Test that precompiled cells decode values and ended columns."""
+    name = "1.3.6.1.2.1.43.8.2.1.13.1.1"
+    status = "1.3.6.1.2.1.43.8.2.1.11.1.1"
+    color = "1.3.6.1.2.1.43.12.1.1.4.1.1"
+    table_rows = {
+        ATTR_OUTPUT_TRAY: [
+            [(oid, *lookup_column(ObjectName(oid))[1:]) for oid in (name, status)]
+        ],
+        ATTR_SUPPLIES: [[(None, *lookup_column(ObjectName(color))[1:])]],
+    }
+    values = {name: OctetString("Tray1"), status: Integer(9)}
+
+    tables = decode_tables(table_rows, values)
+
+    # unknown status bits round up to the next power of two
+    assert tables == {
+        ATTR_OUTPUT_TRAY: (InputTray(name="Tray1", status=SUBUNIT_STATUS_MAP["16"]),),
+        ATTR_SUPPLIES: (Supply(),),
+    }
+
+
+def test_decode_error_state():
+    """Test that both octets decode into conditions and summaries."""
+    state = decode_error_state(b"")
+    assert state == (frozenset(), None, "ok", "ok")
+
+    # low and no paper, door open and jammed, output full and tray empty
+    state = decode_error_state(bytes([0b11001100, 0b00001100]))
+    assert state.conditions == {
+        "low_paper",
+        "no_paper",
+        "door_open",
+        "jammed",
+        "output_full",
+        "input_tray_empty",
+    }
+    # the most severe condition wins
+    assert (state.critical, state.paper, state.toner) == ("jammed", "empty", "ok")
+
+    # text is ISO 8859-1, as pysnmp turns octet strings into text
+    assert decode_error_state("\x21\x80") == decode_error_state(b"\x21\x80")
+    assert decode_error_state("\x21\x80").conditions == {
+        "low_toner",
+        "service_requested",
+        "input_tray_missing",
+    }
+    assert decode_error_state(b"\xff\xfe").conditions == set(PRINTER_ERROR_STATE_BITS)
+
+
+def test_decode_error_states():
+    """Test that error states of many printers decode at once."""
+    states = decode_error_states([b"\x00", "\x10", b"\x02\x10"])
+
+    assert [state.toner for state in states] == ["ok", "empty", "ok"]
+    assert states[2].conditions == {"offline", "output_near_full"}
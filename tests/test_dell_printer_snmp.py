@@ -0,0 +1,715 @@
+"""Tests for dell_printer_snmp package."""
+import asyncio
+import bisect
+import socket
+import time
+from unittest.mock import AsyncMock, patch
+
+import pysnmp.hlapi.asyncio as hlapi
+import pytest
+from pysnmp.proto.errind import RequestTimedOut
+from pysnmp.proto.rfc1902 import (
+    Counter32,
+    Integer,
+    ObjectName,
+    OctetString,
+    TimeTicks,
+)
+from pysnmp.proto.rfc1905 import endOfMibView
+
+from dell_printer_snmp import DellPrinterSnmp, SnmpError, ber, transport
+from dell_printer_snmp.simulator import PrinterSimulator, Walk, walk_path
+
+HOST = "127.0.0.1"
+
+
+def silent_agent() -> socket.socket:
+    """Bind a UDP socket that never answers."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((HOST, 0))
+    return sock
+
+
+@pytest.mark.asyncio
+async def test_slow_printer_does_not_block_loop():
+    """Test that the event loop keeps running while a printer does not answer."""
+    sock = silent_agent()
+    printer = DellPrinterSnmp(HOST, sock.getsockname()[1], timeout=0.5, retries=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.ensure_future(ticker())
+    start = time.monotonic()
+    with pytest.raises(SnmpError):
+        await printer.async_update()
+    elapsed = time.monotonic() - start
+    task.cancel()
+    printer.shutdown()
+    sock.close()
+
+    assert elapsed >= 1
+    # the ticker must have run for most of the time the poll was pending
+    assert ticks >= elapsed / 0.01 / 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_polls_overlap():
+    """Test that polls against many slow printers are in flight at once."""
+    socks = [silent_agent() for _ in range(20)]
+    snmp_engine = hlapi.SnmpEngine()
+    printers = [
+        DellPrinterSnmp(
+            HOST,
+            sock.getsockname()[1],
+            snmp_engine=snmp_engine,
+            timeout=0.5,
+            retries=0,
+        )
+        for sock in socks
+    ]
+
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(printer.async_update() for printer in printers), return_exceptions=True
+    )
+    elapsed = time.monotonic() - start
+    snmp_engine.transportDispatcher.closeDispatcher()
+    for sock in socks:
+        sock.close()
+
+    assert all(isinstance(result, SnmpError) for result in results)
+    # sequential polls would take at least 20 * 0.5 seconds
+    assert elapsed < 5
+
+
+COVER_COLUMNS = {
+    "1.3.6.1.2.1.43.6.1.1.2": [OctetString("Front Cover"), OctetString("Rear")],
+    "1.3.6.1.2.1.43.6.1.1.3": [Integer(4)],
+}
+
+COVER_TABLE = [
+    {
+        "1.3.6.1.2.1.43.6.1.1.2.1.1": OctetString("Front Cover"),
+        "1.3.6.1.2.1.43.6.1.1.3.1.1": Integer(4),
+    },
+    {
+        "1.3.6.1.2.1.43.6.1.1.2.1.2": OctetString("Rear"),
+        "1.3.6.1.2.1.43.6.1.1.3.1.1": endOfMibView,
+    },
+]
+
+
+def next_var_bind(name):
+    """Return the lexicographic successor of name in the cover columns."""
+    name = tuple(name)
+    column = next(
+        (oid for oid in COVER_COLUMNS if name[:11] == ObjectName(oid)), None
+    )
+    index = name[12] if len(name) > 12 else 0
+    if column and index < len(COVER_COLUMNS[column]):
+        return ObjectName(column + f".1.{index + 1}"), COVER_COLUMNS[column][index]
+    return ObjectName("1.3.6.1.2.1.43.7.1.1.1.1"), Integer(0)
+
+
+@pytest.mark.asyncio
+async def test_walk_ends_columns_independently():
+    """Test that a GETNEXT walk stops each column at the end of its subtree."""
+    requests = []
+
+    async def next_cmd(*args, **kwargs):
+        var_binds = args[4:]
+        requests.append(len(var_binds))
+        return None, 0, 0, [[next_var_bind(name) for name, _ in var_binds]]
+
+    printer = DellPrinterSnmp(HOST, max_repetitions=0)
+    with patch("dell_printer_snmp.hlapi.nextCmd", side_effect=next_cmd):
+        table = await printer._get_data_table(printer._cover_oids)
+
+    assert requests == [2, 2, 1]
+    assert table == COVER_TABLE
+
+
+@pytest.mark.asyncio
+async def test_bulk_walk_fetches_table_in_one_request():
+    """Test that GETBULK returns the same rows as GETNEXT in one round trip."""
+    requests = []
+
+    async def bulk_cmd(*args, **kwargs):
+        max_repetitions = args[5]
+        var_binds = [name for name, _ in args[6:]]
+        requests.append((args[1].mpModel, max_repetitions))
+        rows = []
+        for _ in range(max_repetitions):
+            row = [next_var_bind(name) for name in var_binds]
+            var_binds = [name for name, _ in row]
+            rows.append(row)
+        return None, 0, 0, rows
+
+    printer = DellPrinterSnmp(HOST, max_repetitions=5)
+    with patch("dell_printer_snmp.hlapi.bulkCmd", side_effect=bulk_cmd), patch(
+        "dell_printer_snmp.hlapi.nextCmd"
+    ) as next_cmd:
+        table = await printer._get_data_table(printer._cover_oids)
+
+    assert requests == [(1, 5)]
+    assert next_cmd.call_count == 0
+    assert table == COVER_TABLE
+    assert printer._bulk_supported is True
+
+
+@pytest.mark.asyncio
+async def test_bulk_walk_falls_back_to_getnext():
+    """Test that a v1-only printer is walked with GETNEXT and remembered."""
+
+    async def next_cmd(*args, **kwargs):
+        return None, 0, 0, [[next_var_bind(name) for name, _ in args[4:]]]
+
+    bulk_cmd = AsyncMock(return_value=(RequestTimedOut(), 0, 0, []))
+    printer = DellPrinterSnmp(HOST)
+    with patch("dell_printer_snmp.hlapi.bulkCmd", bulk_cmd), patch(
+        "dell_printer_snmp.hlapi.nextCmd", side_effect=next_cmd
+    ):
+        table = await printer._get_data_table(printer._cover_oids)
+        assert table == COVER_TABLE
+        assert printer._bulk_supported is False
+        # the GETBULK probe is sent without retries
+        assert bulk_cmd.call_args[0][2].retries == 0
+
+        table = await printer._get_data_table(printer._cover_oids)
+        assert table == COVER_TABLE
+
+    assert bulk_cmd.call_count == 1
+
+
+class FakeAgent:
+    """Serve a recorded walk through patched hlapi command functions."""
+
+    TYPES = {
+        "2": Integer,
+        "4": OctetString,
+        "6": ObjectName,
+        "65": Counter32,
+        "67": TimeTicks,
+    }
+
+    def __init__(self, fixture):
+        """Load a snmprec walk file."""
+        self.mib = {}
+        self.requests = []
+        with open(walk_path(fixture), encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("#"):
+                    continue
+                oid, tag, value = line.rstrip("\n").split("|", 2)
+                if tag.endswith("x"):
+                    value = OctetString(hexValue=value)
+                else:
+                    value = self.TYPES[tag](value)
+                self.mib[ObjectName(oid)] = value
+        self.names = sorted(self.mib)
+
+    def _next(self, name):
+        index = bisect.bisect_right(self.names, ObjectName(name))
+        if index == len(self.names):
+            return None
+        return self.names[index], self.mib[self.names[index]]
+
+    async def get_cmd(self, *args, **kwargs):
+        names = [ObjectName(str(var_bind[0])) for var_bind in args[4:]]
+        self.requests.append(("get", len(names)))
+        for index, name in enumerate(names, 1):
+            if name not in self.mib:
+                return None, Integer(2), Integer(index), []
+        return None, 0, 0, [(name, self.mib[name]) for name in names]
+
+    async def next_cmd(self, *args, **kwargs):
+        names = [var_bind[0] for var_bind in args[4:]]
+        self.requests.append(("next", len(names)))
+        row = [self._next(name) for name in names]
+        if None in row:
+            return None, Integer(2), Integer(row.index(None) + 1), []
+        return None, 0, 0, [row]
+
+    async def bulk_cmd(self, *args, **kwargs):
+        names = [var_bind[0] for var_bind in args[6:]]
+        self.requests.append(("bulk", len(names)))
+        rows = []
+        for _ in range(args[5]):
+            row = [self._next(name) or (name, endOfMibView) for name in names]
+            names = [name for name, _ in row]
+            rows.append(row)
+        return None, 0, 0, rows
+
+    def patch(self):
+        """Patch the hlapi command functions."""
+        return patch.multiple(
+            "dell_printer_snmp.hlapi",
+            getCmd=self.get_cmd,
+            nextCmd=self.next_cmd,
+            bulkCmd=self.bulk_cmd,
+        )
+
+
+@pytest.mark.asyncio
+async def test_dell_c1760nw():
+    """Test with valid data from Dell C1760nw printer."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        sensors = await printer.async_update()
+
+    assert printer.model == "Dell C1760nw Color Printer"
+    assert printer.serial == "CN0123456789"
+    assert sensors.status == "idle"
+    assert sensors.printer_status_paper == "ok"
+    assert sensors.printer_status_toner == "ok"
+    assert sensors.conditions == frozenset()
+    assert sensors.page_counter == 12345
+    assert sensors.supplies[3] == {
+        "name": "Black Toner Cartridge",
+        "color": "black",
+        "capacity": 100,
+        "level": 15,
+    }
+    assert list(sensors.cover) == [
+        {"name": "Front Cover", "status": "closed"},
+        {"name": "Rear Cover", "status": "closed"},
+    ]
+    assert sensors.output_tray[1] == {
+        "type": "manual sheet feeder",
+        "capacity": 1,
+        "status": "idle",
+        "name": "Manual Feeder",
+        "media": "Plain",
+    }
+    assert list(sensors.input_tray) == [
+        {
+            "type": "unremovable bin",
+            "capacity": 100,
+            "status": "idle",
+            "name": "Center Tray",
+            "page_delivery": "face down",
+        }
+    ]
+
+
+def walk_without(*prefixes):
+    """Return the C1760nw walk without the variables under prefixes."""
+    values = Walk.from_model("dell-c1760nw").values
+    prefixes = [ber.parse_oid(prefix) for prefix in prefixes]
+    return Walk(
+        {
+            name: value
+            for name, value in values.items()
+            if not any(name[: len(prefix)] == prefix for prefix in prefixes)
+        }
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fast_path", [False, True])
+async def test_missing_model(fast_path):
+    """Test that an agent without a model raises SnmpError."""
+    simulator = PrinterSimulator(walk_without("1.3.6.1.2.1.1.1.0"))
+    port = await simulator.async_start()
+    printer = DellPrinterSnmp(HOST, port, fast_path=fast_path)
+
+    with pytest.raises(SnmpError):
+        await printer.async_update()
+
+    printer.shutdown()
+    simulator.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fast_path", [False, True])
+async def test_incomplete_walk(fast_path):
+    """Test that a printer without a covers table raises SnmpError."""
+    simulator = PrinterSimulator(walk_without("1.3.6.1.2.1.43.6"))
+    port = await simulator.async_start()
+    printer = DellPrinterSnmp(HOST, port, fast_path=fast_path)
+
+    with pytest.raises(SnmpError, match="did not return data"):
+        await printer.async_update()
+
+    printer.shutdown()
+    simulator.close()
+
+
+@pytest.mark.asyncio
+async def test_steady_state_poll_is_one_get():
+    """Test that polls after the first fetch volatile values in one GET."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        first = await printer.async_update()
+        agent.requests.clear()
+        agent.mib[ObjectName("1.3.6.1.2.1.43.11.1.1.9.1.4")] = Integer(14)
+        second = await printer.async_update()
+
+    assert agent.requests == [("get", 17)]
+    assert second.supplies[3]["level"] == 14
+    assert second.supplies[:3] == first.supplies[:3]
+    assert second.cover == first.cover
+    assert second.uptime == first.uptime
+
+
+@pytest.mark.asyncio
+async def test_selective_polls_merge_into_state():
+    """Test that polling groups fetches only their values and keeps the rest."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        first = await printer.async_update_status()
+        assert printer.state is first
+        agent.requests.clear()
+        agent.mib[ObjectName("1.3.6.1.2.1.43.11.1.1.9.1.4")] = Integer(14)
+        agent.mib[ObjectName("1.3.6.1.2.1.25.3.5.1.1.1")] = Integer(4)
+        status = await printer.async_update_status()
+        supplies = await printer.async_update_supplies()
+        covers = await printer.async_update_covers()
+        trays = await printer.async_update_trays()
+        both = await printer.async_update(groups=["status", "supplies"])
+
+    assert agent.requests == [("get", 6), ("get", 6), ("get", 4), ("get", 7), ("get", 10)]
+    assert first.supplies[3]["level"] == 15
+    assert status.status == "printing"
+    assert status.supplies == first.supplies
+    assert supplies.supplies[3]["level"] == 14
+    assert supplies.status == "printing"
+    assert covers == trays == both == supplies
+    assert printer.state is both
+
+
+@pytest.mark.asyncio
+async def test_selective_poll_after_reboot_fetches_everything():
+    """Test that a poll of one group that finds a reboot updates all groups."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        await printer.async_update()
+        agent.mib[ObjectName("1.3.6.1.2.1.1.3.0")] = TimeTicks(100)
+        agent.mib[ObjectName("1.3.6.1.2.1.43.11.1.1.9.1.4")] = Integer(14)
+        sensors = await printer.async_update_status()
+
+    assert sensors.supplies[3]["level"] == 14
+    with pytest.raises(ValueError):
+        await printer.async_update(groups=["toner"])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_share_one_poll():
+    """Test that concurrent callers await the poll already in flight."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        await printer.async_update()
+        agent.requests.clear()
+        results = await asyncio.gather(
+            printer.async_update(),
+            printer.async_update(),
+            printer.async_update_status(),
+            printer.async_update_supplies(deadline=5),
+        )
+        assert agent.requests == [("get", 17)]
+        agent.requests.clear()
+        # a full poll does not wait for a poll of fewer groups
+        await asyncio.gather(printer.async_update_status(), printer.async_update())
+
+    assert all(result is results[0] for result in results)
+    assert agent.requests == [("get", 6), ("get", 17)]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_poll():
+    """Test that a shared poll only stops once no caller waits for it."""
+    agent = FakeAgent("dell-c1760nw")
+    get_cmd = agent.get_cmd
+
+    async def slow_get_cmd(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return await get_cmd(*args, **kwargs)
+
+    agent.get_cmd = slow_get_cmd
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        await printer.async_update()
+        first = asyncio.ensure_future(printer.async_update())
+        second = asyncio.ensure_future(printer.async_update())
+        await asyncio.sleep(0.01)
+        first.cancel()
+        sensors = await second
+
+        third = asyncio.ensure_future(printer.async_update())
+        await asyncio.sleep(0.01)
+        third.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await third
+        await asyncio.sleep(0.1)
+
+    assert sensors.model == "Dell C1760nw Color Printer"
+    assert not printer._polls and not printer._poll_waiters
+
+
+@pytest.mark.asyncio
+async def test_max_age_returns_fresh_state():
+    """Test that a recent enough state is returned without a poll."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        await printer.async_update()
+        await asyncio.sleep(0.1)
+        status = await printer.async_update_status()
+        agent.requests.clear()
+        cached = await printer.async_update(groups=["status"], max_age=0.05)
+        # the other groups are older than that
+        polled = await printer.async_update(max_age=0.05)
+        assert agent.requests == [("get", 17)]
+        agent.requests.clear()
+        assert await printer.async_update(max_age=60) is polled
+        await printer.async_update(max_age=0)
+
+    assert cached is status
+    assert agent.requests == [("get", 17)]
+
+
+@pytest.mark.asyncio
+async def test_watch_yields_changes():
+    """Test that a watch yields only what changed between polls."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+    # black toner at 14 percent crosses no threshold, at 9 it crosses 10
+    updates = [
+        ("1.3.6.1.2.1.43.11.1.1.9.1.4", Integer(14)),
+        ("1.3.6.1.2.1.43.11.1.1.9.1.4", Integer(9)),
+        ("1.3.6.1.2.1.43.6.1.1.3.1.1", Integer(3)),
+    ]
+    changes = []
+
+    async def collect():
+        async for change in printer.watch(0.01):
+            changes.append(change)
+
+    async def next_poll():
+        state = printer.state
+        while printer.state is state:
+            await asyncio.sleep(0.001)
+
+    with agent.patch():
+        task = asyncio.ensure_future(collect())
+        for name, value in updates:
+            await next_poll()
+            agent.mib[ObjectName(name)] = value
+        await next_poll()
+        await next_poll()
+        task.cancel()
+
+    assert [(change.field, change.name, change.old, change.new) for change in changes] == [
+        ("supplies", "Black Toner Cartridge", 14, 9),
+        ("cover", "Front Cover", "closed", "open"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_steady_state_poll_respects_message_size():
+    """Test that the combined poll is split to fit the agent's message size."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST, max_message_size=250)
+
+    with agent.patch():
+        first = await printer.async_update()
+        agent.requests.clear()
+        second = await printer.async_update()
+
+    assert len(agent.requests) > 1
+    assert sum(count for _, count in agent.requests) == 17
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_removed_table_row_is_walked_again():
+    """Test that a vanished table cell makes the next poll walk the tables."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        await printer.async_update()
+        for column in (2, 9, 11, 13, 21):
+            del agent.mib[ObjectName(f"1.3.6.1.2.1.43.8.2.1.{column}.1.2")]
+        agent.names = sorted(agent.mib)
+        agent.requests.clear()
+        sensors = await printer.async_update()
+
+    assert agent.requests[0] == ("get", 17)
+    assert ("bulk", 5) in agent.requests
+    assert len(sensors.output_tray) == 1
+
+
+@pytest.mark.asyncio
+async def test_too_big_response_splits_requests():
+    """Test that a tooBig error makes the combined poll use smaller requests."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+    get_cmd = agent.get_cmd
+
+    async def small_agent_get_cmd(*args, **kwargs):
+        if len(args) > 4 + 12:
+            agent.requests.append(("tooBig", len(args) - 4))
+            return None, Integer(1), Integer(0), []
+        return await get_cmd(*args, **kwargs)
+
+    agent.get_cmd = small_agent_get_cmd
+    with agent.patch():
+        first = await printer.async_update()
+        agent.requests.clear()
+        second = await printer.async_update()
+        third = await printer.async_update()
+
+    assert second == third == first
+    assert agent.requests[0] == ("tooBig", 17)
+    assert all(count <= 12 for kind, count in agent.requests if kind == "get")
+    assert printer._max_message_size < 1472
+
+
+@pytest.mark.asyncio
+async def test_reboot_learns_profile_again():
+    """Test that a reboot makes the next poll walk the tables again."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        await printer.async_update()
+        agent.mib[ObjectName("1.3.6.1.2.1.1.3.0")] = TimeTicks(100)
+        agent.mib[ObjectName("1.3.6.1.2.1.43.11.1.1.6.1.4")] = OctetString("Black")
+        agent.requests.clear()
+        sensors = await printer.async_update()
+
+    assert agent.requests[0] == ("get", 17)
+    assert ("bulk", 4) in agent.requests
+    assert sensors.supplies[3]["name"] == "Black"
+    assert printer.profile.uptime == 100
+
+
+@pytest.mark.asyncio
+async def test_update_profile():
+    """Test that the profile holds static values and can be refreshed."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        await printer.async_update()
+        agent.mib[ObjectName("1.3.6.1.2.1.43.6.1.1.2.1.2")] = OctetString("Door B")
+        agent.requests.clear()
+        sensors = await printer.async_update()
+        assert sensors.cover[1]["name"] == "Rear Cover"
+
+        profile = await printer.async_update_profile()
+        sensors = await printer.async_update()
+
+    assert profile is printer.profile
+    assert profile.model == "Dell C1760nw Color Printer"
+    assert profile.serial == "CN0123456789"
+    assert "1.3.6.1.2.1.43.11.1.1.9.1.4" in profile.volatile_oids
+    assert "1.3.6.1.2.1.43.11.1.1.6.1.4" in profile.static_values
+    assert sensors.cover[1]["name"] == "Door B"
+
+
+@pytest.mark.asyncio
+async def test_config_change_learns_profile_again():
+    """Test that prtGeneralConfigChanges triggers a new walk of the tables."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        await printer.async_update()
+        agent.requests.clear()
+        await printer.async_update()
+        assert agent.requests == [("get", 17)]
+
+        agent.mib[ObjectName("1.3.6.1.2.1.43.5.1.1.1.1")] = Counter32(4)
+        agent.requests.clear()
+        await printer.async_update()
+        assert ("bulk", 2) in agent.requests
+
+        agent.requests.clear()
+        await printer.async_update()
+        assert agent.requests == [("get", 17)]
+
+    assert printer.profile.config_changes == 4
+
+
+@pytest.mark.asyncio
+async def test_printer_without_config_changes():
+    """Test a printer that does not implement prtGeneralConfigChanges."""
+    agent = FakeAgent("dell-c1760nw")
+    del agent.mib[ObjectName("1.3.6.1.2.1.43.5.1.1.1.1")]
+    agent.names = sorted(agent.mib)
+    printer = DellPrinterSnmp(HOST)
+
+    with agent.patch():
+        first = await printer.async_update()
+        agent.requests.clear()
+        second = await printer.async_update()
+
+    assert agent.requests == [("get", 16)]
+    assert printer.profile.config_changes is None
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_round_trip_times_are_measured():
+    """Test that answered requests feed the printer's round-trip time."""
+    agent = FakeAgent("dell-c1760nw")
+    printer = DellPrinterSnmp(HOST, port=10161)
+
+    with agent.patch():
+        await printer.async_update()
+
+    estimator = transport.get_estimator(HOST, 10161)
+    assert estimator.srtt is not None
+    assert estimator.timeout == 0.5
+
+
+@pytest.mark.asyncio
+async def test_timeouts_back_off():
+    """Test that a printer that does not answer gets longer timeouts."""
+    sock = silent_agent()
+    port = sock.getsockname()[1]
+    printer = DellPrinterSnmp(HOST, port)
+    estimator = transport.get_estimator(HOST, port)
+    estimator.sample(0.001)
+
+    with pytest.raises(SnmpError):
+        await printer.async_update()
+    printer.shutdown()
+    sock.close()
+
+    assert estimator.timeout == 1.0
+
+
+@pytest.mark.asyncio
+async def test_poll_deadline():
+    """Test that a poll gives up at its deadline."""
+    sock = silent_agent()
+    printer = DellPrinterSnmp(HOST, sock.getsockname()[1], timeout=2, retries=10)
+
+    start = time.monotonic()
+    with pytest.raises(SnmpError):
+        await printer.async_update(deadline=0.2)
+    elapsed = time.monotonic() - start
+    printer.shutdown()
+    sock.close()
+
+    assert elapsed < 1
@@ -0,0 +1,79 @@
+"""Tests for dell_printer_snmp discovery."""
+import asyncio
+import time
+
+import pytest
+
+from dell_printer_snmp import ber
+from dell_printer_snmp.discovery import async_discover, iterate_hosts
+from dell_printer_snmp.simulator import PrinterSimulator, Walk
+
+NETWORK = "127.77.0.0/29"
+SYS_DESCR = ber.parse_oid("1.3.6.1.2.1.1.1.0")
+
+
+@pytest.mark.asyncio
+async def test_discover_simulated_printers():
+    """Test that Dell printers are found and other agents are not."""
+    walk = Walk.from_model("dell-c1760nw")
+    other = {SYS_DESCR: ber.encode_value(ber.OCTET_STRING, "HP LaserJet 4250")}
+    simulators = [
+        PrinterSimulator(walk),
+        PrinterSimulator(Walk.from_model("dell-b2360dn"), v1_only=True),
+        PrinterSimulator(walk, overrides=other),
+    ]
+    # all agents listen on one port of different loopback addresses
+    port = await simulators[0].async_start("127.77.0.1")
+    await simulators[1].async_start("127.77.0.4", port)
+    await simulators[2].async_start("127.77.0.6", port)
+
+    found = [printer async for printer in async_discover([NETWORK], port, timeout=0.2)]
+
+    for simulator in simulators:
+        simulator.close()
+    assert sorted((printer.host, printer.model) for printer in found) == [
+        ("127.77.0.1", "Dell C1760nw Color Printer"),
+        ("127.77.0.4", "Dell B2360dn Laser Printer"),
+    ]
+    assert found[0].serial and found[0].port == port
+    assert sum(simulator.requests for simulator in simulators) == 3
+
+
+@pytest.mark.asyncio
+async def test_discovery_rate():
+    """Test that requests are sent no faster than the rate."""
+    start = time.monotonic()
+    found = [
+        printer
+        async for printer in async_discover(["127.78.0.0/24"], 9, rate=1000, timeout=0.05)
+    ]
+
+    assert not found
+    assert time.monotonic() - start >= 0.25
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("network", ["10.0.0.0/33", "printer.local"])
+async def test_discover_bad_network(network):
+    """Test that a bad network raises before any request is sent."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw")
+    port = await simulator.async_start("127.77.0.1")
+
+    with pytest.raises(ValueError):
+        await asyncio.wait_for(
+            async_discover(["127.77.0.1", network], port).__anext__(), 1
+        )
+
+    simulator.close()
+    assert simulator.requests == 0
+
+
+def test_iterate_hosts():
+    """Test that networks and single addresses are expanded."""
+    assert list(iterate_hosts(["192.0.2.0/30", "192.0.2.9"])) == [
+        "192.0.2.1",
+        "192.0.2.2",
+        "192.0.2.9",
+    ]
+    with pytest.raises(ValueError):
+        list(iterate_hosts(["192.0.2.0/33"]))
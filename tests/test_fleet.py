@@ -0,0 +1,100 @@
+"""Tests for dell_printer_snmp fleet polling."""
+import asyncio
+import socket
+import time
+from unittest.mock import patch
+
+import pytest
+
+from dell_printer_snmp import PrinterState, SnmpError
+from dell_printer_snmp.ber import BerClient
+from dell_printer_snmp.fleet import DellPrinterFleet
+
+HOSTS = [f"192.0.2.{index}" for index in range(1, 51)]
+
+
+@pytest.mark.asyncio
+async def test_sweep_takes_time_of_slowest_printer():
+    """Test that a sweep runs polls concurrently and yields them as completed."""
+    delays = {host: 0.05 * (index % 5) for index, host in enumerate(HOSTS)}
+    delays[HOSTS[0]] = 0.3
+
+    async def async_update(self, deadline=None, groups=None):
+        await asyncio.sleep(delays[self._host])
+        return PrinterState(model=self._host)
+
+    fleet = DellPrinterFleet(HOSTS)
+    with patch("dell_printer_snmp.DellPrinterSnmp.async_update", async_update):
+        start = time.monotonic()
+        results = [result async for result in fleet.async_poll()]
+        elapsed = time.monotonic() - start
+    fleet.shutdown()
+
+    assert len(results) == len(HOSTS)
+    assert {result.host for result in results} == set(HOSTS)
+    assert all(result.data.model == result.host for result in results)
+    # the slowest printer comes last, while the sum of all delays is 5.3 seconds
+    assert results[-1].host == HOSTS[0]
+    assert elapsed < 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    """Test that no more than max_concurrency polls are in flight."""
+    in_flight = peak = 0
+
+    async def async_update(self, deadline=None, groups=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if self._host == HOSTS[3]:
+            raise SnmpError("Request timed out")
+        return PrinterState()
+
+    fleet = DellPrinterFleet(HOSTS, max_concurrency=7)
+    with patch("dell_printer_snmp.DellPrinterSnmp.async_update", async_update):
+        results = await fleet.async_update()
+    fleet.shutdown()
+
+    assert peak == 7
+    assert len(results) == len(HOSTS)
+    assert isinstance(results[HOSTS[3]], SnmpError)
+    assert results[HOSTS[4]] == {}
+
+
+@pytest.mark.asyncio
+async def test_printers_share_one_engine():
+    """Test that all printers of a fleet use the same SNMP engine and socket."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("", 0))
+    hosts = [f"127.0.0.{index}" for index in range(1, 6)]
+    fleet = DellPrinterFleet(hosts, sock.getsockname()[1], timeout=0.5, retries=0)
+
+    start = time.monotonic()
+    results = await fleet.async_update()
+    elapsed = time.monotonic() - start
+    engines = {id(printer._snmp_engine) for printer in fleet.printers.values()}
+    fleet.shutdown()
+    sock.close()
+
+    assert len(engines) == 1
+    assert elapsed < 3
+    assert all(isinstance(result, SnmpError) for result in results.values())
+
+
+def test_fast_path_shares_one_client():
+    """Test that printers of a fleet on the fast path share one socket."""
+    fleet = DellPrinterFleet(HOSTS, fast_path=True)
+    clients = {printer._ber_client for printer in fleet.printers.values()}
+    fleet.shutdown()
+
+    assert len(clients) == 1
+    assert isinstance(clients.pop(), BerClient)
+
+
+def test_invalid_concurrency():
+    """Test that the concurrency limit must be positive."""
+    with pytest.raises(ValueError):
+        DellPrinterFleet(HOSTS, max_concurrency=0)
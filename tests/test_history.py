@@ -0,0 +1,112 @@
+"""Tests for dell_printer_snmp supply history."""
+from datetime import datetime, timezone
+
+import pytest
+
+from dell_printer_snmp.history import HistoryStore
+from dell_printer_snmp.model import PrinterState, Supply
+
+HOST = "127.0.0.1"
+DAY = 86400
+START = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def state(*levels):
+    """Return a state with a black and a cyan toner of these levels."""
+    return PrinterState(
+        supplies=tuple(
+            Supply(name, level=level, capacity=100)
+            for name, level in zip(("Black", "Cyan"), levels)
+        )
+    )
+
+
+def test_forecast_of_linear_consumption():
+    """Test that rate and empty date follow the levels over time."""
+    history = HistoryStore()
+    for day in range(10):
+        history.record(HOST, state(80 - 5 * day, 50), START + day * DAY)
+    history.record("127.0.0.2", state(-3, 40), START)
+
+    black, cyan, other = history.forecast()
+
+    assert (black.host, black.supply_index, black.name) == (HOST, 0, "Black")
+    assert (black.level, black.capacity) == (35, 100)
+    assert black.rate == pytest.approx(5)
+    assert black.empty_at == datetime(2026, 1, 17, tzinfo=timezone.utc)
+    # a level that does not fall never runs out
+    assert (cyan.rate, cyan.empty_at) == (0, None)
+    # one sample gives no rate, unknown levels none at all
+    assert (other.name, other.rate, other.empty_at) == ("Cyan", None, None)
+
+
+def test_forecast_of_almost_flat_level():
+    """Test that a level that runs out past any date has no empty date."""
+    history = HistoryStore()
+    # a drum of 30000 pages used by one page in 256 hours
+    for hour in range(256):
+        level = 30000 if hour < 255 else 29999
+        drum = Supply("Drum", level=level, capacity=30000)
+        history.record(HOST, PrinterState(supplies=(drum,)), START + hour * 3600)
+    history.record("127.0.0.2", state(80), START)
+    history.record("127.0.0.2", state(70), START + DAY)
+
+    drum, black = history.forecast()
+
+    assert drum.rate == pytest.approx(0, abs=0.01)
+    assert drum.empty_at is None
+    assert black.empty_at == datetime(2026, 1, 9, tzinfo=timezone.utc)
+
+
+def test_ring_buffer_keeps_last_samples():
+    """Test that old samples make way and the fit follows the new ones."""
+    history = HistoryStore(size=4)
+    # first three per day, then one per day, wrapping the buffer twice
+    for day in range(15):
+        level = 100 - 3 * day if day < 4 else 92 - day
+        history.record(HOST, state(level), START + day * DAY)
+
+    samples = history.history(HOST, 0)
+
+    assert samples == [(START + day * DAY, 92 - day) for day in range(11, 15)]
+    (forecast,) = history.forecast()
+    assert forecast.rate == pytest.approx(1)
+    assert forecast.empty_at.timestamp() == pytest.approx(START + 92 * DAY)
+    assert history.history(HOST, 1) == history.history("127.0.0.9", 0) == []
+
+
+def test_new_cartridge_starts_over():
+    """Test that a rising level or another supply clears the history."""
+    history = HistoryStore()
+    history.record(HOST, state(20), START)
+    history.record(HOST, state(10), START + DAY)
+    history.record(HOST, state(100), START + 2 * DAY)
+
+    assert history.history(HOST, 0) == [(START + 2 * DAY, 100)]
+
+    history.record(HOST, PrinterState(supplies=(Supply("Toner", level=90),)), START)
+    assert history.history(HOST, 0) == [(START, 90)]
+    history.forget(HOST)
+    assert history.forecast() == []
+
+
+def test_jitter_keeps_history():
+    """Test that a level rising by less than a tenth of capacity is kept."""
+    history = HistoryStore()
+    levels = [80, 79, 80, 76, 77, 74, 72, 73, 70]
+    for day, level in enumerate(levels):
+        history.record(HOST, state(level), START + day * DAY)
+    # without a capacity, by less than a tenth of the new level
+    for day, level in enumerate([500, 498, 503, 40, 480]):
+        drum = Supply("Drum", level=level)
+        history.record("127.0.0.2", PrinterState(supplies=(drum,)), START + day * DAY)
+
+    assert [level for _, level in history.history(HOST, 0)] == levels
+    assert history.forecast()[0].rate == pytest.approx(1.2, abs=0.1)
+    assert history.history("127.0.0.2", 0) == [(START + 4 * DAY, 480)]
+
+
+def test_invalid_size():
+    """Test that a history holds at least two samples."""
+    with pytest.raises(ValueError):
+        HistoryStore(size=1)
@@ -0,0 +1,177 @@
+"""Tests for dell_printer_snmp poll metrics."""
+import asyncio
+
+import pytest
+
+from dell_printer_snmp import DellPrinterSnmp, SnmpError
+from dell_printer_snmp.metrics import MetricsCollector, PollMetrics
+from dell_printer_snmp.simulator import PrinterSimulator
+
+HOST = "127.0.0.1"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fast_path", [False, True])
+async def test_poll_metrics(fast_path):
+    """Test that each poll reports its phases, requests and octets."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw")
+    port = await simulator.async_start()
+    polls = []
+    printer = DellPrinterSnmp(HOST, port, fast_path=fast_path, metrics=polls.append)
+
+    await printer.async_update()
+    await printer.async_update()
+
+    printer.shutdown()
+    simulator.close()
+    first, steady = polls
+    assert set(first.phases) == {
+        "resolve",
+        "scalars",
+        "walk_supplies",
+        "walk_cover",
+        "walk_input_tray",
+        "walk_output_tray",
+        "decode",
+    }
+    assert set(steady.phases) == {"resolve", "volatile", "decode"}
+    assert first.round_trips == 6
+    assert steady.round_trips == 1
+    assert steady.var_binds == 17
+    assert (steady.retries, steady.timeouts, steady.error) == (0, 0, None)
+    assert steady.bytes_sent == 333
+    if fast_path:
+        assert steady.bytes_received == 362
+    assert first.address == HOST
+    assert first.duration >= sum(
+        elapsed for phase, elapsed in first.phases.items() if phase != "resolve"
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_poll_metrics():
+    """Test that polls running at the same time each count their own requests."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw", latency=0.05)
+    port = await simulator.async_start()
+    polls = []
+    printer = DellPrinterSnmp(HOST, port, fast_path=True, metrics=polls.append)
+    await printer.async_update()
+    del polls[:]
+
+    await asyncio.gather(
+        printer.async_update(groups=["status"]),
+        printer.async_update(groups=["supplies"]),
+    )
+
+    printer.shutdown()
+    simulator.close()
+    assert len(polls) == 2
+    for metrics in polls:
+        assert metrics.round_trips == 1
+        assert set(metrics.phases) == {"resolve", "volatile", "decode"}
+        assert metrics.var_binds == 6
+        assert metrics.duration >= metrics.phases["volatile"]
+
+
+@pytest.mark.asyncio
+async def test_poll_metrics_timeout():
+    """Test that a printer that does not answer reports retries and error."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw", loss=1.0)
+    port = await simulator.async_start()
+    polls = []
+    printer = DellPrinterSnmp(
+        HOST, port, timeout=0.05, retries=1, fast_path=True, metrics=polls.append
+    )
+
+    with pytest.raises(SnmpError):
+        await printer.async_update()
+
+    printer.shutdown()
+    simulator.close()
+    (metrics,) = polls
+    assert (metrics.round_trips, metrics.retries, metrics.timeouts) == (1, 1, 1)
+    assert metrics.error == "SnmpError"
+    assert metrics.bytes_received == 0
+    assert simulator.requests == 2
+
+
+def _metrics(host, address, duration, **counters):
+    """Return the measurements of a poll."""
+    metrics = PollMetrics(host, 161)
+    metrics.address = address
+    metrics.duration = duration
+    metrics.phases = {"decode": duration / 2}
+    for name, value in counters.items():
+        setattr(metrics, name, value)
+    return metrics
+
+
+def test_collector_render():
+    """Test the Prometheus text and OpenMetrics formats."""
+    collector = MetricsCollector()
+    collector(_metrics("printer.local", "192.0.2.10", 0.5, round_trips=2))
+    collector(_metrics("printer.local", "192.0.2.10", 1.5, error="SnmpError"))
+    collector(_metrics('odd"host', "2001:db8::1", 0.25))
+
+    text = collector.render()
+    assert "# TYPE dell_printer_polls_total counter" in text
+    assert (
+        'dell_printer_polls_total{host="printer.local",segment="192.0.2.0/24"} 2'
+        in text
+    )
+    assert (
+        'dell_printer_poll_failures_total{host="printer.local",segment="192.0.2.0/24"} 1'
+        in text
+    )
+    assert (
+        'dell_printer_poll_duration_seconds_sum{host="printer.local",segment="192.0.2.0/24"} 2.0'
+        in text
+    )
+    assert (
+        'dell_printer_phase_seconds_total{host="printer.local",segment="192.0.2.0/24",phase="decode"} 1.0'
+        in text
+    )
+    assert (
+        'dell_printer_round_trips_total{host="printer.local",segment="192.0.2.0/24"} 2'
+        in text
+    )
+    assert 'host="odd\\"host",segment="2001:db8::/64"' in text
+    assert not text.endswith("# EOF\n")
+
+    openmetrics = collector.render(openmetrics=True)
+    assert "# TYPE dell_printer_polls counter" in openmetrics
+    assert "# TYPE dell_printer_poll_duration_seconds summary" in openmetrics
+    assert openmetrics.endswith("# EOF\n")
+
+    assert collector.segment("printer.local") == ""
+    collector.clear()
+    assert "dell_printer_polls_total{" not in collector.render()
+
+
+@pytest.mark.asyncio
+async def test_collector_serves_metrics():
+    """Test that the exporter answers /metrics in the format asked for."""
+    collector = MetricsCollector()
+    collector(_metrics("printer.local", "192.0.2.10", 0.5))
+    server = await collector.async_serve(HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def get(path, accept="*/*"):
+        reader, writer = await asyncio.open_connection(HOST, port)
+        writer.write(f"GET {path} HTTP/1.1\r\nAccept: {accept}\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        return response.decode()
+
+    text = await get("/metrics")
+    openmetrics = await get("/metrics", "application/openmetrics-text; version=1.0.0")
+    missing = await get("/")
+
+    server.close()
+    await server.wait_closed()
+    assert text.startswith("HTTP/1.1 200 OK")
+    assert "Content-Type: text/plain; version=0.0.4" in text
+    assert text.endswith(collector.render())
+    assert "Content-Type: application/openmetrics-text" in openmetrics
+    assert openmetrics.endswith("# EOF\n")
+    assert missing.startswith("HTTP/1.1 404")
@@ -0,0 +1,109 @@
+"""Tests for dell_printer_snmp records."""
+import pickle
+
+import pytest
+
+from dell_printer_snmp.model import Change, Cover, PrinterState, Supply, diff_states
+
+
+def test_record_reads_like_dict():
+    """Test that records offer the dict interface of earlier versions."""
+    supply = Supply(name="Black Toner Cartridge", color="black", level=15)
+
+    assert supply.level == 15
+    assert supply["level"] == 15
+    assert supply.capacity is None
+    assert "capacity" not in supply
+    assert supply.get("capacity", 100) == 100
+    with pytest.raises(KeyError):
+        supply["capacity"]  # pylint: disable=pointless-statement
+    assert supply == {"name": "Black Toner Cartridge", "color": "black", "level": 15}
+    assert dict(supply) == supply.as_dict()
+
+
+def test_record_is_read_only():
+    """Test that fields cannot be changed."""
+    cover = Cover("Front Cover", "closed")
+
+    with pytest.raises(AttributeError):
+        cover.status = "open"
+    with pytest.raises(AttributeError):
+        cover.other = "open"
+    with pytest.raises(TypeError):
+        Cover(name="Front Cover", other="open")
+    assert not hasattr(cover, "__dict__")
+
+
+def test_printer_state_dict_view():
+    """Test that tables turn into lists of dicts."""
+    state = PrinterState(
+        model="Dell C1760nw Color Printer",
+        status="idle",
+        cover=(Cover("Front Cover", "closed"),),
+    )
+
+    assert state.as_dict() == {
+        "model": "Dell C1760nw Color Printer",
+        "status": "idle",
+        "cover": [{"name": "Front Cover", "status": "closed"}],
+    }
+
+
+def test_record_pickles_and_hashes():
+    """Test that records survive pickling and can be hashed."""
+    state = PrinterState(model="Dell C1760nw", supplies=(Supply("Black", level=15),))
+
+    copy = pickle.loads(pickle.dumps(state))
+
+    assert copy == state
+    assert hash(copy) == hash(state)
+    assert copy.supplies[0].level == 15
+
+
+def test_printer_state_tuple_form():
+    """Test that states turn into plain tuples and back."""
+    state = PrinterState(
+        model="Dell C1760nw",
+        supplies=(Supply("Black", level=15),),
+        cover=(),
+    )
+
+    values = state.to_tuple()
+
+    assert values[0] == "Dell C1760nw"
+    assert values[10] == (("Black", None, None, 15),)
+    assert PrinterState.from_tuple(values) == state
+    assert isinstance(PrinterState.from_tuple(values).supplies[0], Supply)
+
+
+def test_diff_states():
+    """Test that only changed fields and cells are reported."""
+    old = PrinterState(
+        status="idle",
+        page_counter=100,
+        supplies=(Supply("Black", capacity=100, level=30), Supply("Cyan", level=-3)),
+        cover=(Cover("Front Cover", "closed"),),
+    )
+    new = PrinterState(
+        status="printing",
+        page_counter=100,
+        supplies=(Supply("Black", capacity=100, level=20), Supply("Cyan", level=-2)),
+        cover=(Cover("Front Cover", "open"), Cover("Rear Cover", "closed")),
+    )
+
+    assert diff_states(old, old) == []
+    assert diff_states(old, new) == [
+        Change("status", old="idle", new="printing"),
+        Change("supplies", 0, "Black", "level", 30, 20),
+        Change("supplies", 1, "Cyan", "level", -3, -2),
+        Change("cover", 0, "Front Cover", "status", "closed", "open"),
+        Change("cover", 1, "Rear Cover", new=Cover("Rear Cover", "closed")),
+    ]
+    # 30 and 20 percent are both above the 10 percent threshold
+    changes = diff_states(old, new, thresholds=(10, 0))
+    assert [change.name for change in changes if change.key == "level"] == ["Cyan"]
+    changes = diff_states(old, new, thresholds=(25,))
+    assert [change.name for change in changes if change.key == "level"] == [
+        "Black",
+        "Cyan",
+    ]
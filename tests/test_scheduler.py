@@ -0,0 +1,147 @@
+"""Tests for dell_printer_snmp poll scheduler."""
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from dell_printer_snmp import DellPrinterSnmp, PrinterState, SnmpError
+from dell_printer_snmp.scheduler import PollScheduler
+from dell_printer_snmp.simulator import PrinterSimulator
+
+HOSTS = [f"192.0.2.{index}" for index in range(1, 4)]
+
+
+async def _collect(scheduler, seconds):
+    """Return the results of running a scheduler for some seconds."""
+    results = []
+    start = time.monotonic()
+    run = scheduler.async_run()
+    async for result in run:
+        results.append((time.monotonic() - start, result))
+        if time.monotonic() - start > seconds:
+            break
+    await run.aclose()
+    return results
+
+
+@pytest.mark.asyncio
+async def test_groups_are_polled_on_their_intervals():
+    """Test that slow groups are polled less often, together with fast ones."""
+
+    async def async_update(self, deadline=None, groups=None):
+        return PrinterState(model=self._host)
+
+    printers = [DellPrinterSnmp(host) for host in HOSTS]
+    scheduler = PollScheduler(
+        printers, {"status": 0.04, "supplies": 0.12}, jitter=0.1, seed=1
+    )
+    with patch("dell_printer_snmp.DellPrinterSnmp.async_update", async_update):
+        results = await _collect(scheduler, 0.5)
+
+    for host in HOSTS:
+        polls = [result.groups for _, result in results if result.host == host]
+        assert polls[0] == {"status", "supplies"}
+        assert all("status" in groups for groups in polls)
+        assert 8 <= len(polls) <= 14
+        assert 3 <= sum("supplies" in groups for groups in polls) <= 5
+    assert all(result.data.model == result.host for _, result in results)
+
+
+@pytest.mark.asyncio
+async def test_first_polls_are_spread():
+    """Test that the first polls of many printers do not fire at once."""
+    polled = []
+
+    async def async_update(self, deadline=None, groups=None):
+        polled.append(time.monotonic())
+        return PrinterState()
+
+    printers = [DellPrinterSnmp(f"192.0.2.{index}") for index in range(200)]
+    scheduler = PollScheduler(printers, {"status": 0.2}, jitter=0, seed=1)
+    with patch("dell_printer_snmp.DellPrinterSnmp.async_update", async_update):
+        results = []
+        run = scheduler.async_run()
+        async for result in run:
+            results.append(result)
+            if len(results) == 200:
+                break
+        await run.aclose()
+
+    start = min(polled)
+    buckets = {int((when - start) / 0.02) for when in polled}
+    assert max(polled) - start > 0.15
+    assert len(buckets) >= 8
+
+
+@pytest.mark.asyncio
+async def test_failed_polls_are_reported_and_retried():
+    """Test that a failing printer is reported and stays scheduled."""
+
+    async def async_update(self, deadline=None, groups=None):
+        if self._host == HOSTS[0]:
+            raise SnmpError("No SNMP response received before timeout")
+        return PrinterState()
+
+    printers = [DellPrinterSnmp(host) for host in HOSTS]
+    scheduler = PollScheduler(printers, {"status": 0.05})
+    with patch("dell_printer_snmp.DellPrinterSnmp.async_update", async_update):
+        results = await _collect(scheduler, 0.3)
+
+    failed = [result for _, result in results if result.host == HOSTS[0]]
+    assert len(failed) >= 4
+    assert all(isinstance(result.error, SnmpError) for result in failed)
+    assert all(result.error is None for _, result in results if result.host != HOSTS[0])
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    """Test that no more than max_concurrency polls are in flight."""
+    in_flight = []
+    running = 0
+
+    async def async_update(self, deadline=None, groups=None):
+        nonlocal running
+        running += 1
+        in_flight.append(running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return PrinterState()
+
+    printers = [DellPrinterSnmp(f"192.0.2.{index}") for index in range(20)]
+    scheduler = PollScheduler(printers, {"status": 0.01}, max_concurrency=3)
+    with patch("dell_printer_snmp.DellPrinterSnmp.async_update", async_update):
+        await _collect(scheduler, 0.2)
+
+    assert max(in_flight) == 3
+
+
+def test_invalid_intervals():
+    """Test that unknown groups and invalid settings are refused."""
+    with pytest.raises(ValueError):
+        PollScheduler([], {"toner": 10})
+    with pytest.raises(ValueError):
+        PollScheduler([], {"status": 0})
+    with pytest.raises(ValueError):
+        PollScheduler([], {})
+    with pytest.raises(ValueError):
+        PollScheduler([], jitter=1)
+
+
+@pytest.mark.asyncio
+async def test_scheduled_polls_of_simulated_printer():
+    """Test that scheduled group polls only fetch the groups that are due."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw")
+    port = await simulator.async_start()
+    polls = []
+    printer = DellPrinterSnmp("127.0.0.1", port, fast_path=True, metrics=polls.append)
+    scheduler = PollScheduler([printer], {"status": 0.03, "trays": 0.15})
+
+    results = await _collect(scheduler, 0.3)
+
+    printer.shutdown()
+    simulator.close()
+    assert all(result.error is None for _, result in results)
+    assert results[-1][1].data.output_tray[0]["name"] == "Tray1"
+    # status alone is six variables, with trays it is eleven
+    assert {metrics.var_binds for metrics in polls[1:]} == {6, 11}
@@ -0,0 +1,163 @@
+"""Tests for dell_printer_snmp sharded fleet polling."""
+import time
+
+import pytest
+
+from dell_printer_snmp import DellPrinterSnmp, SnmpError
+from dell_printer_snmp.sharding import ShardedFleet
+from dell_printer_snmp.simulator import PrinterSimulator, Walk
+
+HOSTS = [f"127.80.0.{index}" for index in range(1, 6)]
+SILENT_HOST = "127.80.0.9"
+
+
+async def start_simulators():
+    """Serve a simulated printer on every host, all on one port."""
+    walk = Walk.from_model("dell-c1760nw")
+    simulators = [PrinterSimulator(walk) for _ in HOSTS]
+    port = await simulators[0].async_start(HOSTS[0])
+    for simulator, host in zip(simulators[1:], HOSTS[1:]):
+        await simulator.async_start(host, port)
+    return simulators, port
+
+
+def without_uptime(state):
+    """Return the fields of a state but its uptime."""
+    return {key: value for key, value in state.items() if key != "uptime"}
+
+
+@pytest.mark.asyncio
+async def test_shards_poll_like_one_process():
+    """Test that workers return the states a printer of this process does."""
+    simulators, port = await start_simulators()
+    printer = DellPrinterSnmp(HOSTS[0], port, fast_path=True)
+    expected = await printer.async_update()
+    fleet = ShardedFleet(
+        HOSTS + [SILENT_HOST], port, processes=2, fast_path=True, timeout=0.2, retries=0
+    )
+
+    try:
+        results = [result async for result in fleet.async_poll()]
+        statuses = await fleet.async_update(groups=["status"])
+    finally:
+        fleet.shutdown()
+        printer.shutdown()
+        for simulator in simulators:
+            simulator.close()
+
+    assert fleet.shards == [HOSTS[0::2], HOSTS[1::2] + [SILENT_HOST]]
+    assert {result.host for result in results} == set(HOSTS + [SILENT_HOST])
+    for result in results:
+        if result.host == SILENT_HOST:
+            assert isinstance(result.error, SnmpError)
+        else:
+            # uptime is counted from the start of each simulator
+            assert without_uptime(result.data) == without_uptime(expected)
+    assert statuses[HOSTS[1]].status == expected.status
+    assert statuses[HOSTS[1]].supplies == expected.supplies
+
+
+@pytest.mark.asyncio
+async def test_lost_worker_fails_its_shard():
+    """Test that a worker that exits fails its polls and is started again."""
+    simulators, port = await start_simulators()
+    # the silent host keeps the second worker busy for seconds
+    fleet = ShardedFleet(
+        HOSTS + [SILENT_HOST], port, processes=2, fast_path=True, timeout=5, retries=0
+    )
+
+    try:
+        results = {}
+        start = time.monotonic()
+        async for result in fleet.async_poll():
+            results[result.host] = result
+            if len(results) == len(HOSTS):
+                fleet._shards[1].process.kill()
+        elapsed = time.monotonic() - start
+        again = {}
+        sweep = fleet.async_poll()
+        async for result in sweep:
+            again[result.host] = result
+            if len(again) == len(HOSTS):
+                break
+        await sweep.aclose()
+    finally:
+        fleet.shutdown()
+        for simulator in simulators:
+            simulator.close()
+
+    assert elapsed < 3
+    assert isinstance(results[SILENT_HOST].error, SnmpError)
+    assert all(results[host].data.model for host in HOSTS)
+    assert all(again[host].data.model for host in HOSTS)
+
+
+class SlowExit:
+    """Worker process that takes a second to join."""
+
+    def __init__(self, process):
+        """Initialize."""
+        self.process = process
+
+    def __getattr__(self, name):
+        """Return the attributes of the process."""
+        return getattr(self.process, name)
+
+    def join(self, timeout=None):
+        """Wait a second, then for the process."""
+        time.sleep(1)
+        self.process.join(timeout)
+
+
+@pytest.mark.asyncio
+async def test_lost_worker_does_not_block():
+    """Test that a lost worker is reaped off the event loop."""
+    simulators, port = await start_simulators()
+    fleet = ShardedFleet(
+        HOSTS + [SILENT_HOST], port, processes=2, fast_path=True, timeout=5, retries=0
+    )
+
+    try:
+        results = {}
+        async for result in fleet.async_poll():
+            results[result.host] = result
+            if len(results) == len(HOSTS):
+                shard = fleet._shards[1]
+                shard.process = SlowExit(shard.process)
+                shard.process.kill()
+                start = time.monotonic()
+        elapsed = time.monotonic() - start
+    finally:
+        fleet.shutdown()
+        for simulator in simulators:
+            simulator.close()
+
+    assert elapsed < 0.5
+    assert isinstance(results[SILENT_HOST].error, SnmpError)
+
+
+@pytest.mark.asyncio
+async def test_abandoned_sweep_is_cancelled():
+    """Test that a sweep given up early does not mix into the next one."""
+    simulators, port = await start_simulators()
+    fleet = ShardedFleet(HOSTS, port, processes=2, fast_path=True)
+
+    try:
+        sweep = fleet.async_poll()
+        await sweep.__anext__()
+        with pytest.raises(RuntimeError):
+            await fleet.async_poll().__anext__()
+        await sweep.aclose()
+        results = [result async for result in fleet.async_poll()]
+    finally:
+        fleet.shutdown()
+        for simulator in simulators:
+            simulator.close()
+
+    assert sorted(result.host for result in results) == HOSTS
+
+
+def test_invalid_processes():
+    """Test that at least one process is required."""
+    with pytest.raises(ValueError):
+        ShardedFleet(HOSTS, processes=0)
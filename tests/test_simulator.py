@@ -0,0 +1,144 @@
+"""Tests for dell_printer_snmp printer simulator."""
+import time
+
+import pytest
+
+from dell_printer_snmp import DellPrinterSnmp, SnmpError, ber
+from dell_printer_snmp.simulator import (
+    PrinterSimulator,
+    SimulatorFarm,
+    Walk,
+    available_walks,
+    walk_path,
+)
+
+HOST = "127.0.0.1"
+
+
+def test_bundled_walks():
+    """Test that every bundled walk loads."""
+    assert "dell-c1760nw" in available_walks()
+    for model in available_walks():
+        assert Walk.from_model(model).names
+    with pytest.raises(ValueError):
+        walk_path("dell-unknown")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model", ["dell-c1760nw", "dell-b2360dn"])
+@pytest.mark.parametrize("fast_path", [False, True])
+async def test_poll_bundled_walks(model, fast_path):
+    """Test that each bundled model can be polled over both paths."""
+    simulator = PrinterSimulator.from_model(model)
+    port = await simulator.async_start()
+    printer = DellPrinterSnmp(HOST, port, fast_path=fast_path)
+
+    data = await printer.async_update()
+    assert data == await printer.async_update()
+
+    printer.shutdown()
+    simulator.close()
+    assert data.model.startswith("Dell")
+    assert data.supplies and data.cover and data.output_tray and data.input_tray
+
+
+@pytest.mark.asyncio
+async def test_v1_only_agent():
+    """Test that a v1-only agent drops GETBULK and is walked with GETNEXT."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw", v1_only=True)
+    port = await simulator.async_start()
+    printer = DellPrinterSnmp(HOST, port, timeout=0.2, fast_path=True)
+
+    data = await printer.async_update()
+
+    printer.shutdown()
+    simulator.close()
+    assert printer._bulk_supported is False
+    assert len(data.supplies) == 4
+
+
+@pytest.mark.asyncio
+async def test_max_size():
+    """Test that an agent with a small maximum message size is polled."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw", max_size=300)
+    port = await simulator.async_start()
+    printer = DellPrinterSnmp(HOST, port, max_message_size=1472, fast_path=True)
+
+    data = await printer.async_update()
+    assert await printer.async_update() == data
+
+    printer.shutdown()
+    simulator.close()
+    assert printer._max_message_size < 1472
+
+
+def test_bulk_response_fits_max_size():
+    """Test that GETBULK responses drop rows to fit the maximum size."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw", max_size=300)
+    names = (ber.parse_oid("1.3.6.1.2.1.43.11.1.1.6"),) * 2
+    request = ber.decode_message(
+        ber.encode_request(ber.request_template(1, ber.GETBULK, names, 0, 10), 0x800000)
+    )
+
+    response = simulator.respond(request)
+
+    assert len(response) <= 300
+    assert len(ber.decode_message(response).var_binds) % 2 == 0
+
+    # split rows cut the response after any variable
+    simulator = PrinterSimulator.from_model("dell-c1760nw", max_size=320, split_rows=True)
+    names = (ber.parse_oid("1.3.6.1.2.1.43.11.1.1.6"),) * 3
+    request = ber.decode_message(
+        ber.encode_request(ber.request_template(1, ber.GETBULK, names, 0, 10), 0x800000)
+    )
+
+    response = simulator.respond(request)
+
+    assert len(response) <= 320
+    assert len(ber.decode_message(response).var_binds) == 7
+
+
+@pytest.mark.asyncio
+async def test_latency_and_loss():
+    """Test that responses are delayed and lost requests time out."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw", latency=0.1)
+    port = await simulator.async_start()
+    printer = DellPrinterSnmp(HOST, port, timeout=1, fast_path=True)
+    await printer.async_update()
+
+    start = time.monotonic()
+    await printer.async_update()
+    assert time.monotonic() - start >= 0.1
+    printer.shutdown()
+    simulator.close()
+
+    simulator = PrinterSimulator.from_model("dell-c1760nw", loss=1)
+    port = await simulator.async_start()
+    printer = DellPrinterSnmp(HOST, port, timeout=0.1, retries=1, fast_path=True)
+    with pytest.raises(SnmpError):
+        await printer.async_update()
+    printer.shutdown()
+    simulator.close()
+    assert simulator.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_farm():
+    """Test that a farm runs printers with serial numbers of their own."""
+    farm = SimulatorFarm("dell-c1760nw", 200)
+    ports = await farm.async_start()
+    printers = [
+        DellPrinterSnmp(HOST, port, fast_path=True) for port in ports
+    ]
+
+    results = [await printer.async_update() for printer in printers[:3]]
+
+    for printer in printers:
+        printer.shutdown()
+    farm.close()
+    assert len(set(ports)) == 200
+    assert [data.serial for data in results] == [
+        "SIM00000000",
+        "SIM00000001",
+        "SIM00000002",
+    ]
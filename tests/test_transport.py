@@ -0,0 +1,138 @@
+"""Tests for dell_printer_snmp transport helpers."""
+import socket
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from dell_printer_snmp import DellPrinterSnmp, transport
+
+ADDRINFO = [(socket.AF_INET, socket.SOCK_DGRAM, 17, "", ("192.0.2.10", 161))]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty caches."""
+    transport.clear_cache()
+    yield
+    transport.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_resolve_is_cached():
+    """Test that a host name is resolved once within the TTL."""
+    with patch(
+        "asyncio.base_events.BaseEventLoop.getaddrinfo",
+        AsyncMock(return_value=ADDRINFO),
+    ) as getaddrinfo:
+        assert await transport.async_resolve("printer.local", 161) == "192.0.2.10"
+        assert await transport.async_resolve("printer.local", 161) == "192.0.2.10"
+
+    assert getaddrinfo.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_expires():
+    """Test that a host name is resolved again after the TTL."""
+    with patch(
+        "asyncio.base_events.BaseEventLoop.getaddrinfo",
+        AsyncMock(return_value=ADDRINFO),
+    ) as getaddrinfo, patch("dell_printer_snmp.transport.time") as mock_time:
+        mock_time.monotonic.return_value = 1000
+        await transport.async_resolve("printer.local", 161)
+        mock_time.monotonic.return_value = 1000 + transport.ADDRESS_CACHE_TTL + 1
+        await transport.async_resolve("printer.local", 161)
+
+    assert getaddrinfo.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_address_literal():
+    """Test that IPv4 addresses do not go through the resolver."""
+    with patch("asyncio.base_events.BaseEventLoop.getaddrinfo") as getaddrinfo:
+        assert await transport.async_resolve("192.0.2.1", 161) == "192.0.2.1"
+
+    assert getaddrinfo.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_resolve_invalid_host():
+    """Test that an unknown host raises ConnectionError."""
+    with patch(
+        "asyncio.base_events.BaseEventLoop.getaddrinfo",
+        AsyncMock(side_effect=socket.gaierror("Name or service not known")),
+    ), pytest.raises(ConnectionError):
+        await transport.async_resolve("foo.local", 161)
+
+
+@pytest.mark.asyncio
+async def test_printers_share_request_args():
+    """Test that printers at the same address share their request arguments."""
+    first = DellPrinterSnmp("192.0.2.1")
+    second = DellPrinterSnmp("192.0.2.1", snmp_engine=first._snmp_engine)
+    other = DellPrinterSnmp("192.0.2.2")
+
+    first_args = await first._async_request_args()
+    assert await first._async_request_args() == first_args
+    second_args = await second._async_request_args()
+    other_args = await other._async_request_args()
+
+    assert second_args[2] is first_args[2]
+    assert other_args[2] is not first_args[2]
+    assert other_args[1] is first_args[1]
+    assert other_args[3] is first_args[3]
+    bulk_args = await first._async_request_args(mp_model=1, probe=True)
+    assert bulk_args[1].mpModel == 1
+    assert bulk_args[2].retries == 0
+
+    first.shutdown()
+    other.shutdown()
+
+
+def test_estimator_follows_round_trip_time():
+    """Test that timeout and retries follow the measured round-trip time."""
+    estimator = transport.RttEstimator()
+    assert estimator.timeout == 1.0
+    assert estimator.retries == 3
+
+    for _ in range(10):
+        estimator.sample(0.005)
+    assert estimator.timeout == 0.5
+    assert estimator.retries == 3
+
+    for _ in range(60):
+        estimator.sample(1.5)
+    assert estimator.srtt == pytest.approx(1.5, abs=0.2)
+    assert estimator.timeout == 2.0
+    assert estimator.retries == 1
+
+
+def test_estimator_backs_off():
+    """Test that timeouts double the timeout up to the maximum."""
+    estimator = transport.RttEstimator()
+    estimator.sample(0.005)
+    timeouts = []
+    for _ in range(6):
+        estimator.backoff()
+        timeouts.append((estimator.timeout, estimator.retries))
+
+    assert timeouts == [(1.0, 3), (2.0, 1), (4.0, 0), (8.0, 0), (8.0, 0), (8.0, 0)]
+
+    estimator.sample(0.005)
+    assert estimator.timeout == 0.5
+
+
+@pytest.mark.asyncio
+async def test_request_args_follow_estimator():
+    """Test that printers without fixed timeouts use the estimated ones."""
+    adaptive = DellPrinterSnmp("192.0.2.1")
+    fixed = DellPrinterSnmp(
+        "192.0.2.1", snmp_engine=adaptive._snmp_engine, timeout=2, retries=10
+    )
+    transport.get_estimator("192.0.2.1", 161).backoff()
+
+    target = (await adaptive._async_request_args())[2]
+    assert (target.timeout, target.retries) == (2.0, 1)
+    target = (await fixed._async_request_args())[2]
+    assert (target.timeout, target.retries) == (2, 10)
+
+    adaptive.shutdown()
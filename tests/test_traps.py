@@ -0,0 +1,116 @@
+"""Tests for dell_printer_snmp trap receiver."""
+import asyncio
+import socket
+
+import pytest
+
+from dell_printer_snmp import DellPrinterSnmp, ber
+from dell_printer_snmp.simulator import PrinterSimulator
+from dell_printer_snmp.traps import TrapReceiver, decode_alert
+
+HOST = "127.0.0.1"
+ALERT_OID = (1, 3, 6, 1, 2, 1, 43, 18, 2, 0, 1)
+FRONT_COVER_STATUS = "1.3.6.1.2.1.43.6.1.1.3.1.1"
+
+
+def alert_var_binds(severity, alert_group, code):
+    """Return the variables of a printer alert of alert table row 5."""
+    return [
+        ((1, 3, 6, 1, 2, 1, 43, 18, 1, 1, column, 1, 5), ber.encode_value(ber.INTEGER, value))
+        for column, value in ((2, severity), (4, alert_group), (5, 1), (6, 0), (7, code))
+    ]
+
+
+def test_decode_alert():
+    """Test that alerts are mapped onto the status values of polls."""
+    trap = ber.decode_trap(ber.encode_trap(1, ALERT_OID, 0, alert_var_binds(3, 13, 8)))
+    alert = decode_alert(trap, HOST)
+
+    assert alert.as_dict() == {
+        "host": HOST,
+        "severity": "critical",
+        "alert_group": 13,
+        "index": 1,
+        "location": 0,
+        "code": 8,
+        "status": "jammed",
+        "groups": frozenset({"status"}),
+    }
+
+    trap = ber.decode_trap(ber.encode_trap(0, ALERT_OID, 0, alert_var_binds(4, 8, 808)))
+    alert = decode_alert(trap, HOST)
+    assert (alert.severity, alert.status) == ("warning", "empty")
+    assert alert.groups == {"trays", "status"}
+
+    trap = ber.decode_trap(ber.encode_trap(1, (1, 3, 6, 1, 4, 1, 0, 1), 0, []))
+    assert decode_alert(trap, HOST) is None
+
+
+@pytest.mark.parametrize(
+    "alert_group, code, status",
+    [
+        (11, 12, "low"),
+        (11, 13, "empty"),
+        (8, 13, "empty"),
+        # a cover or an output bin running low or out says nothing of toner
+        (6, 12, "unknown"),
+        (9, 13, "unknown"),
+    ],
+)
+def test_decode_subunit_alert(alert_group, code, status):
+    """Test that the status of a subunit alert follows its group."""
+    trap = ber.decode_trap(
+        ber.encode_trap(1, ALERT_OID, 0, alert_var_binds(4, alert_group, code))
+    )
+
+    assert decode_alert(trap, HOST).status == status
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("version", [0, 1])
+async def test_alert_refreshes_affected_groups(version):
+    """Test that an alert of a simulated printer polls its covers at once."""
+    simulator = PrinterSimulator.from_model("dell-c1760nw")
+    port = await simulator.async_start()
+    polls = []
+    printer = DellPrinterSnmp(HOST, port, fast_path=True, metrics=polls.append)
+    alerts = []
+    receiver = TrapReceiver([printer], alerts.append)
+    trap_port = await receiver.async_start(HOST, 0)
+
+    await printer.async_update()
+    simulator.set_value(FRONT_COVER_STATUS, ber.INTEGER, 3)
+    simulator.send_alert((HOST, trap_port), alert_group=6, code=3, version=version)
+    while len(polls) < 2:
+        await asyncio.sleep(0.01)
+
+    receiver.close()
+    printer.shutdown()
+    simulator.close()
+    assert alerts[0].status == "open_door"
+    assert alerts[0].groups == {"covers", "status"}
+    assert printer.state.cover[0].status == "open"
+    # status and covers share uptime and configuration changes
+    assert polls[1].var_binds == 8
+
+
+@pytest.mark.asyncio
+async def test_foreign_traps_are_dropped():
+    """Test that traps of another community or malformed data are dropped."""
+    alerts = []
+    receiver = TrapReceiver(callback=alerts.append)
+    port = await receiver.async_start(HOST, 0)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    for data in (
+        ber.encode_trap(1, ALERT_OID, 0, alert_var_binds(3, 6, 3), community=b"private"),
+        b"\x30\x03\x02\x01",
+        ber.encode_trap(1, ALERT_OID, 0, alert_var_binds(3, 6, 3)),
+    ):
+        sock.sendto(data, (HOST, port))
+    while not alerts:
+        await asyncio.sleep(0.01)
+
+    sock.close()
+    receiver.close()
+    assert receiver.alerts == 1